@@ -1,4 +1,16 @@
 from .endoc_client import EndocClient
+from .async_endoc_client import AsyncEndocClient
+from .cache import (
+    CacheStats,
+    ImportCache,
+    ImportCheckpoint,
+    ImportProgress,
+    MemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+    SearchCache,
+)
+from .circuit_breaker import CircuitBreaker, CircuitStats
 from .decorators import register_service
 from .exceptions import (
     EndocError,
@@ -6,18 +18,39 @@ from .exceptions import (
     PermissionError,
     RateLimitError,
     APIError,
+    CircuitOpenError,
 )
-from .models.pdf_import import ImportResult, ImportedPaper, ImportedBookmark
+from .models.document_search import SearchStage
+from .models.pdf_import import ImportResult, ImportedPaper, ImportedBookmark, ImportFailure
+from .rate_limit import RateLimiter, TokenBucket
+from .retry import RetryPolicy
 
 __all__ = [
     "EndocClient",
+    "AsyncEndocClient",
     "register_service",
+    "ImportCache",
+    "CacheStats",
+    "ImportCheckpoint",
+    "ImportProgress",
+    "ResponseCache",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "SearchCache",
+    "RetryPolicy",
+    "RateLimiter",
+    "TokenBucket",
+    "CircuitBreaker",
+    "CircuitStats",
     "EndocError",
     "AuthenticationError",
     "PermissionError",
     "RateLimitError",
     "APIError",
+    "CircuitOpenError",
     "ImportResult",
     "ImportedPaper",
     "ImportedBookmark",
+    "ImportFailure",
+    "SearchStage",
 ]
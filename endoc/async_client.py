@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from gql import Client
+
+from .client import (
+    DEFAULT_TIMEOUT,
+    DEFAULT_VALIDATION_TTL,
+    VALIDATE_QUERY,
+    APIClient,
+    TransportQueryError,
+    TransportServerError,
+    _VALIDATION_CACHE,
+    _build_headers,
+    _check_validation_result,
+    _is_partial_result,
+    _map_graphql_error,
+    _map_http_transport_error,
+    _raise_for_result_blocks,
+    _resolve_api_key,
+    _resolve_graphql_url,
+)
+from . import json_codec
+from .circuit_breaker import CircuitBreaker
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, resolve_retry
+from .singleflight import AsyncSingleFlight, flight_key
+from .utils import operation_name, operation_type
+from .exceptions import (
+    AuthenticationError,
+    PermissionError,
+    RateLimitError,
+    APIError,
+)
+
+DEFAULT_MAX_CONNECTIONS = 100  # concurrent sockets held by the async session
+
+
+def _build_async_transport(url: str, headers: Dict[str, str], timeout: int, max_connections: int):
+    """
+    Build a gql async HTTP transport, preferring aiohttp and falling back to httpx.
+
+    Must be called from a running event loop: the aiohttp connector binds to it.
+    """
+    try:
+        import aiohttp
+        from gql.transport.aiohttp import AIOHTTPTransport
+    except ImportError:
+        aiohttp = None
+
+    if aiohttp is not None:
+        return AIOHTTPTransport(
+            url=url,
+            headers=headers,
+            timeout=timeout,
+            json_serialize=json_codec.dumps_str,
+            json_deserialize=json_codec.loads,
+            client_session_args={
+                "connector": aiohttp.TCPConnector(limit=max_connections),
+            },
+        )
+
+    try:
+        import httpx
+        from gql.transport.httpx import HTTPXAsyncTransport
+    except ImportError:
+        raise ImportError(
+            "AsyncEndocClient needs an async HTTP transport. "
+            "Install it with: pip install 'endoc[async]'"
+        ) from None
+
+    return HTTPXAsyncTransport(
+        url=url,
+        headers=headers,
+        timeout=timeout,
+        json_serialize=json_codec.dumps_str,
+        json_deserialize=json_codec.loads,
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+
+
+class AsyncAPIClient:
+    """Asyncio counterpart of APIClient.
+
+    All queries share one async HTTP session (aiohttp, or httpx as a fallback),
+    opened on first use and kept until ``close()``. Many queries can be in
+    flight on a single event loop; ``max_connections`` caps the open sockets.
+    API key validation follows the same modes and process-wide cache as
+    APIClient, except that ``validate_key=True`` runs on first use, since a
+    constructor cannot await.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        *,
+        timeout: int = DEFAULT_TIMEOUT,
+        user_agent: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        validate_key: Union[bool, str] = "lazy",
+        validation_ttl: float = DEFAULT_VALIDATION_TTL,
+        retry: Union[RetryPolicy, bool] = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = True,
+    ):
+        if validate_key not in (True, False, "lazy"):
+            raise ValueError("validate_key must be True, False or 'lazy'.")
+        if max_connections < 1:
+            raise ValueError("max_connections must be >= 1.")
+
+        self._api_key = _resolve_api_key(api_key)
+        self.url = _resolve_graphql_url()
+        self._headers = _build_headers(self._api_key, user_agent)
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._validation_ttl = validation_ttl
+        self._key_validated = validate_key is False
+        self.retry = resolve_retry(retry)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self._single_flight = AsyncSingleFlight() if coalesce else None
+
+        self.client: Optional[Client] = None
+        self._session = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def _get_session(self):
+        if self._session is not None:
+            return self._session
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._session is None:
+                transport = _build_async_transport(
+                    self.url, self._headers, self._timeout, self._max_connections
+                )
+                self.client = Client(transport=transport, fetch_schema_from_transport=False)
+                self._session = await self.client.connect_async()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared async session."""
+        if self.client is not None and self._session is not None:
+            await self.client.close_async()
+        self._session = None
+        self.client = None
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _validate_api_key(self) -> None:
+        # Concurrent callers, in this client or any other, share one check per key.
+        await _VALIDATION_CACHE.validate_async(
+            self._api_key, self.url, self._validation_ttl, self._check_api_key
+        )
+        self._key_validated = True
+
+    async def _check_api_key(self) -> None:
+        # Retried, paced and guarded like any other request ("Validate").
+        await self.retry.call_async(
+            lambda: self._guarded(VALIDATE_QUERY, self._check_api_key_once), idempotent=True
+        )
+
+    async def _check_api_key_once(self) -> None:
+        session = await self._get_session()
+        try:
+            data = await session.execute(VALIDATE_QUERY)
+            _check_validation_result(data)
+        except (AuthenticationError, PermissionError, RateLimitError, APIError):
+            raise
+        except TransportServerError as e:
+            _map_http_transport_error(e)
+        except TransportQueryError as e:
+            _map_graphql_error(e)
+        except Exception as e:
+            raise APIError(str(e)) from e
+
+    async def execute_query(self, query, variable_values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query, retrying transient failures according to ``self.retry``."""
+        return await self._run(query, variable_values, partial=False)
+
+    async def execute_query_partial(
+        self, query, variable_values: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Coroutine version of ``APIClient.execute_query_partial``."""
+        return await self._run(query, variable_values, partial=True)
+
+    async def _run(self, query, variable_values, partial: bool):
+        if not self._key_validated:
+            await self._validate_api_key()
+
+        def call():
+            return self.retry.call_async(
+                lambda: self._attempt(query, variable_values, partial),
+                idempotent=self.retry.is_idempotent(query),
+            )
+
+        if self._single_flight is None or operation_type(query) != "query":
+            return await call()
+        return await self._single_flight.do((flight_key(query, variable_values), partial), call)
+
+    async def _attempt(self, query, variable_values: Optional[Dict[str, Any]], partial: bool = False):
+        return await self._guarded(query, lambda: self._execute_once(query, variable_values, partial))
+
+    async def _guarded(self, query, send: Callable[[], Awaitable[Any]]):
+        limiter, breaker = self.rate_limiter, self.circuit_breaker
+        if limiter is None and breaker is None:
+            return await send()
+        name = operation_name(query)
+        if breaker is not None:
+            breaker.before_call()
+        started = time.monotonic()
+        try:
+            if limiter is not None:
+                await limiter.acquire_async(name)
+                started = time.monotonic()
+            result = await send()
+        except Exception as e:
+            if limiter is not None and isinstance(e, RateLimitError):
+                limiter.on_rate_limited(name, e.retry_after)
+            if breaker is not None:
+                breaker.record(time.monotonic() - started, e)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no outcome to record, but a half-open
+            # trial must be handed back or the circuit never closes again.
+            if breaker is not None:
+                breaker.release()
+            raise
+        if limiter is not None:
+            limiter.on_success(name)
+        if breaker is not None:
+            breaker.record(time.monotonic() - started)
+        return result
+
+    async def _execute_once(self, query, variable_values: Optional[Dict[str, Any]] = None, partial: bool = False):
+        session = await self._get_session()
+        try:
+            result = await session.execute(
+                query,
+                variable_values=variable_values or {},
+            )
+            if partial:
+                return result, []
+            _raise_for_result_blocks(result)
+            return result
+        except (AuthenticationError, PermissionError, RateLimitError, APIError):
+            raise
+        except TransportServerError as e:
+            _map_http_transport_error(e)
+        except TransportQueryError as e:
+            if partial and _is_partial_result(e):
+                return e.data, list(e.errors or [])
+            _map_graphql_error(e)
+        except Exception as e:
+            raise APIError(str(e)) from e
+
+
+# What services accept as ``client``: the sync client or the async one.
+AnyAPIClient = Union[APIClient, AsyncAPIClient]
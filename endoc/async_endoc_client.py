@@ -0,0 +1,350 @@
+import asyncio
+import functools
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Union
+
+from .async_client import AsyncAPIClient, DEFAULT_MAX_CONNECTIONS
+from .batching import DEFAULT_MAX_BATCH
+from .cache import ImportCache, ImportCheckpoint, ResponseCache, SearchCache, _key_namespace
+from .client import DEFAULT_TIMEOUT, DEFAULT_VALIDATION_TTL
+from .circuit_breaker import CircuitBreaker
+from .projection import Projection, single_paper_query
+from .rate_limit import RateLimiter
+from .search import DEFAULT_PAGE_SIZE, iter_pages_async
+from .retry import RetryPolicy
+from .import_pipeline import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PREFETCH_BATCHES,
+    AsyncImportPipeline,
+    build_import,
+)
+from .services.document_search import DocumentSearchService
+from .services.paginated_search import DEFAULT_SEARCH_CONCURRENCY, PaginatedSearchService
+from .services.summarization import SummarizationService
+from .services.single_paper_search import SinglePaperSearchService
+from .services.get_note_library import GetNoteLibraryService
+from .services.title_search import TitleSearchService
+from .services.pdf_import import PDFImportService
+from .models.document_search import SearchStage
+from .models.paginated_search import PaginatedSearchData, PaginatedSearchResponseBody
+from .models.pdf_import import ImportResult, ImportedPaper
+
+
+class AsyncEndocClient:
+    """Asyncio mirror of EndocClient.
+
+    Every method is a coroutine and all of them share one async HTTP session,
+    so hundreds of requests can be in flight on a single event loop::
+
+        async with AsyncEndocClient(api_key="...") as client:
+            papers = await asyncio.gather(*(client.single_paper(i) for i in ids))
+
+    Requires an async gql transport: ``pip install 'endoc[async]'``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: int = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        validate_key: Union[bool, str] = "lazy",
+        validation_ttl: float = DEFAULT_VALIDATION_TTL,
+        retry: Union[RetryPolicy, bool] = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = True,
+        import_cache: Optional[ImportCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        batch_window: Optional[float] = None,
+    ):
+        self._import_cache = import_cache
+        self._api_client = AsyncAPIClient(
+            api_key,
+            timeout=timeout,
+            max_connections=max_connections,
+            validate_key=validate_key,
+            validation_ttl=validation_ttl,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            coalesce=coalesce,
+        )
+        client = self._api_client
+        self._summarization_service = SummarizationService(api_key, client=client, cache=response_cache)
+        self._document_search_service = DocumentSearchService(
+            api_key, client=client, cache=response_cache, search_cache=search_cache
+        )
+        self._paginated_search_service = PaginatedSearchService(api_key, client=client, search_cache=search_cache)
+        self._single_paper_service = SinglePaperSearchService(
+            api_key, client=client, cache=response_cache, batch_window=batch_window
+        )
+        self._get_note_library_service = GetNoteLibraryService(api_key, client=client)
+        self._title_search_service = TitleSearchService(api_key, client=client, cache=response_cache)
+        self._pdf_import_service = PDFImportService(api_key, client=client)
+
+    async def close(self) -> None:
+        """Close the shared async HTTP session."""
+        await self._api_client.close()
+
+    async def __aenter__(self) -> "AsyncEndocClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # ── Query methods ───────────────────────────────────────────────────
+
+    async def summarize(self, id_value: str):
+        return await self._summarization_service.summarize_paper_async(id_value)
+
+    async def document_search(
+        self,
+        ranking_variable: Optional[str] = None,
+        keywords=None,
+        compact: bool = False,
+        *,
+        paper_list=None,
+        ranking_collection: Optional[str] = None,
+        ranking_id_field: Optional[str] = None,
+        ranking_id_value: Optional[str] = None,
+        ranking_id_type: Optional[str] = None,
+        stages: Optional[Sequence[Union[SearchStage, dict]]] = None,
+    ):
+        """Coroutine version of ``EndocClient.document_search``."""
+        return await self._document_search_service.search_documents_async(
+            ranking_variable,
+            keywords,
+            compact=compact,
+            paper_list=paper_list,
+            ranking_collection=ranking_collection,
+            ranking_id_field=ranking_id_field,
+            ranking_id_value=ranking_id_value,
+            ranking_id_type=ranking_id_type,
+            stages=stages,
+        )
+
+    async def paginated_search(
+        self,
+        paper_list,
+        keywords=None,
+        *,
+        chunk_size: Optional[int] = None,
+        max_concurrency: int = DEFAULT_SEARCH_CONCURRENCY,
+    ):
+        """Coroutine version of ``EndocClient.paginated_search``."""
+        return await self._paginated_search_service.paginated_search_async(
+            paper_list, keywords, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
+
+    async def single_paper(
+        self,
+        id_value: str,
+        collection: str = "S2AG",
+        id_field: str = "id_int",
+        id_type: str = "int",
+        projection: Optional[Projection] = None,
+    ):
+        """Fetch one paper.
+
+        ``projection`` limits the fields requested: "metadata" (title,
+        authors, venue, date, DOI), "abstract" (metadata plus the abstract),
+        "full" (default) or a set of field names such as
+        ``{"Title", "Content.Abstract"}``. Projected results are
+        PartialSinglePaperData with unselected fields left as None.
+        """
+        return await self._single_paper_service.get_single_paper_async(
+            id_value, collection=collection, id_field=id_field, id_type=id_type, projection=projection
+        )
+
+    async def single_papers(
+        self,
+        id_values: Iterable[str],
+        collection: str = "S2AG",
+        id_field: str = "id_int",
+        id_type: str = "int",
+        max_batch: int = DEFAULT_MAX_BATCH,
+        projection: Optional[Projection] = None,
+    ):
+        """Fetch many papers with one aliased request per ``max_batch`` ids.
+
+        Returns one SinglePaperData per id, in order. A paper that could not
+        be fetched has ``status="error"`` and the reason in ``message``.
+        """
+        return await self._single_paper_service.get_single_papers_async(
+            id_values, collection=collection, id_field=id_field, id_type=id_type,
+            max_batch=max_batch, projection=projection,
+        )
+
+    async def summarize_many(self, id_values: Iterable[str], max_batch: int = DEFAULT_MAX_BATCH):
+        """Summarize many papers in batched requests; failures as in ``single_papers``."""
+        return await self._summarization_service.summarize_papers_async(id_values, max_batch=max_batch)
+
+    async def get_note_library(self, doc_id: str):
+        return await self._get_note_library_service.get_note_library_async(doc_id)
+
+    async def title_search(self, titles):
+        return await self._title_search_service.title_search_async(titles)
+
+    # ── Search ──────────────────────────────────────────────────────────
+
+    async def search_iter(
+        self,
+        ranking_variable: str,
+        keywords=None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[PaginatedSearchResponseBody]:
+        """Async-iterator version of ``EndocClient.search_iter``."""
+        async for page in self.search_pages(
+            ranking_variable, keywords, page_size=page_size, limit=limit, prefetch=prefetch
+        ):
+            for paper in page.response:
+                yield paper
+
+    async def search_pages(
+        self,
+        ranking_variable: str,
+        keywords=None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[PaginatedSearchData]:
+        """Async-iterator version of ``EndocClient.search_pages``."""
+        search = await self.document_search(ranking_variable, keywords, compact=True)
+        if search.response is None:
+            return
+
+        async def fetch(page):
+            return await self.paginated_search(page.paper_list(), keywords)
+
+        async for page in iter_pages_async(
+            search.response.hits, fetch, page_size=page_size, limit=limit, prefetch=prefetch
+        ):
+            yield page
+
+    # ── PDF Import ──────────────────────────────────────────────────────
+
+    async def import_pdf(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        paths: Optional[List[Union[str, Path]]] = None,
+        folder: Optional[Union[str, Path]] = None,
+        base64_list: Optional[List[str]] = None,
+        *,
+        recursive: bool = False,
+        max_file_mb: int = 50,
+        batch_size: int = 10,
+        max_batch_mb: Optional[float] = None,
+        include_references: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+        encode_workers: int = 1,
+        encode_in_processes: bool = False,
+        checkpoint: Optional[Union[str, Path, ImportCheckpoint]] = None,
+        projection: Optional[Projection] = None,
+    ) -> ImportResult:
+        """Coroutine version of ``EndocClient.import_pdf``.
+
+        Files are read and encoded on a worker thread, one batch ahead of
+        the upload, so the event loop is never blocked. Each uploaded paper is
+        fetched as soon as its batch returns, at most ``max_concurrency``
+        requests at a time.
+        """
+        pipeline, batches = await self._build_import(
+            path, paths, folder, base64_list,
+            recursive=recursive,
+            max_file_mb=max_file_mb,
+            batch_size=batch_size,
+            max_batch_mb=max_batch_mb,
+            include_references=include_references,
+            max_concurrency=max_concurrency,
+            prefetch_batches=prefetch_batches,
+            encode_workers=encode_workers,
+            encode_in_processes=encode_in_processes,
+            checkpoint=checkpoint,
+            projection=projection,
+        )
+        papers = [paper async for paper in pipeline.run(batches, batch_size)]
+
+        return ImportResult(
+            status=pipeline.status,
+            message=pipeline.message,
+            papers=papers,
+            bookmarks=pipeline.bookmarks,
+            failures=pipeline.failures,
+        )
+
+    async def iter_import_pdf(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        paths: Optional[List[Union[str, Path]]] = None,
+        folder: Optional[Union[str, Path]] = None,
+        base64_list: Optional[List[str]] = None,
+        *,
+        recursive: bool = False,
+        max_file_mb: int = 50,
+        batch_size: int = 10,
+        max_batch_mb: Optional[float] = None,
+        include_references: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+        encode_workers: int = 1,
+        encode_in_processes: bool = False,
+        checkpoint: Optional[Union[str, Path, ImportCheckpoint]] = None,
+        projection: Optional[Projection] = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[ImportedPaper]:
+        """Async-iterator version of ``EndocClient.iter_import_pdf``::
+
+            async for paper in client.iter_import_pdf(folder="Papers/"):
+                ...
+        """
+        pipeline, batches = await self._build_import(
+            path, paths, folder, base64_list,
+            recursive=recursive,
+            max_file_mb=max_file_mb,
+            batch_size=batch_size,
+            max_batch_mb=max_batch_mb,
+            include_references=include_references,
+            max_concurrency=max_concurrency,
+            prefetch_batches=prefetch_batches,
+            encode_workers=encode_workers,
+            encode_in_processes=encode_in_processes,
+            checkpoint=checkpoint,
+            projection=projection,
+            collect_bookmarks=False,
+            skip_fetched=True,
+        )
+        async for paper in pipeline.run(batches, batch_size, ordered=ordered):
+            yield paper
+
+    async def _build_import(self, *sources, projection=None, **options):
+        single_paper_query(projection)  # reject a bad projection before uploading
+        # Listing a folder touches the disk, so the setup runs off the loop.
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                build_import,
+                AsyncImportPipeline,
+                *sources,
+                upload=self._pdf_import_service.import_pdf_with_api_key_async,
+                hydrate=functools.partial(self._fetch_bookmark, projection=projection),
+                cache=self._import_cache,
+                cache_namespace=_key_namespace(self._api_client._api_key),
+                **options,
+            ),
+        )
+
+    async def _fetch_bookmark(self, bk, projection=None):
+        return await self.single_paper(
+            id_value=bk.id_value,
+            collection=bk.id_collection,
+            id_field=bk.id_field,
+            id_type=bk.id_type,
+            projection=projection,
+        )
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from gql import gql
+from graphql import print_ast
+
+from .cache import ResponseCache, _key_namespace
+from .client import TransportQueryError, _map_graphql_error
+from .exceptions import APIError, EndocError
+from .utils import operation_name, raise_for_domain_errors
+
+DEFAULT_MAX_BATCH = 50  # operations per aliased request
+DEFAULT_BATCH_WINDOW = 0.005  # seconds the auto-batcher waits for more calls
+
+Outcome = Union[Dict[str, Any], EndocError]
+
+
+class BatchedOperation:
+    """
+    Turn a single-field query into aliased documents carrying N copies::
+
+        query singlePaperBatch2($paper_id_0: MetadataInput!, $paper_id_1: MetadataInput!) {
+            p0: singlePaper(paper_id: $paper_id_0) { ... }
+            p1: singlePaper(paper_id: $paper_id_1) { ... }
+        }
+
+    Documents are built once per batch size and reused.
+    """
+
+    def __init__(self, query):
+        document = getattr(query, "document", query)
+        operation = document.definitions[0]
+        field = operation.selection_set.selections[0]
+
+        self.query = query
+        self.field = field.name.value
+        # Items share response-cache entries with single calls of ``query``.
+        self.operation = operation_name(query)
+        self._variables = [
+            (definition.variable.name.value, print_ast(definition.type))
+            for definition in operation.variable_definitions
+        ]
+        self._field_text = print_ast(field)
+        self._variable_re = re.compile(
+            r"\$(" + "|".join(re.escape(name) for name, _ in self._variables) + r")\b"
+        )
+        self._documents: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def document(self, size: int):
+        with self._lock:
+            document = self._documents.get(size)
+            if document is None:
+                document = self._documents[size] = gql(self._source(size))
+            return document
+
+    def _source(self, size: int) -> str:
+        definitions = ", ".join(
+            f"${name}_{i}: {type_}" for i in range(size) for name, type_ in self._variables
+        )
+        fields = "\n".join(
+            f"p{i}: " + self._variable_re.sub(lambda m, i=i: f"${m.group(1)}_{i}", self._field_text)
+            for i in range(size)
+        )
+        return f"query {self.operation or self.field}Batch{size}({definitions}) {{\n{fields}\n}}"
+
+    def variables(self, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            f"{name}_{i}": item.get(name)
+            for i, item in enumerate(items)
+            for name, _ in self._variables
+        }
+
+    def split(self, data: Dict[str, Any], errors: List[Dict[str, Any]], size: int) -> List[Outcome]:
+        """Per item: the ``{field: block}`` result it would get alone, or its error."""
+        by_alias: Dict[str, Dict[str, Any]] = {}
+        for error in errors:
+            path = error.get("path") or []
+            if path:
+                by_alias.setdefault(path[0], error)
+
+        outcomes: List[Outcome] = []
+        for i in range(size):
+            alias = f"p{i}"
+            block = (data or {}).get(alias)
+            if alias in by_alias or block is None:
+                outcomes.append(_item_error(by_alias.get(alias) or (errors[0] if errors else None)))
+                continue
+            try:
+                raise_for_domain_errors(block)
+            except EndocError as e:
+                outcomes.append(e)
+                continue
+            outcomes.append({self.field: block})
+        return outcomes
+
+
+def _item_error(error: Optional[Dict[str, Any]]) -> EndocError:
+    if error is None:
+        return APIError("No data returned for this item.")
+    try:
+        _map_graphql_error(TransportQueryError(error.get("message"), errors=[error]))
+    except EndocError as e:
+        return e
+    return APIError(error.get("message") or "GraphQL error")
+
+
+def error_message(error: BaseException) -> str:
+    """Message stored in the status block of an item that failed in a batch."""
+    return f"{type(error).__name__}: {error}"
+
+
+def _chunks(items: Sequence[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _cache_lookup(client, cache, operation: BatchedOperation, items):
+    """Return (outcomes with cache hits filled in, namespace, indexes still to fetch)."""
+    outcomes: List[Optional[Outcome]] = [None] * len(items)
+    if cache is None:
+        return outcomes, "", list(range(len(items)))
+    namespace = _key_namespace(getattr(client, "_api_key", ""))
+    missing = []
+    for i, item in enumerate(items):
+        outcomes[i] = cache.get(operation.operation, item, namespace)
+        if outcomes[i] is None:
+            missing.append(i)
+    return outcomes, namespace, missing
+
+
+def _store(cache, operation, items, outcomes, indexes, namespace) -> None:
+    if cache is None:
+        return
+    for i in indexes:
+        if isinstance(outcomes[i], dict):
+            cache.set(operation.operation, items[i], outcomes[i], namespace)
+
+
+def execute_batched(
+    client,
+    operation: BatchedOperation,
+    items: Sequence[Dict[str, Any]],
+    *,
+    cache: Optional[ResponseCache] = None,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> List[Outcome]:
+    """
+    Run ``operation`` once per variables dict in ``items`` using aliased
+    requests of up to ``max_batch`` operations. Returns, in input order,
+    each item's raw result or the EndocError it failed with. Items found in
+    ``cache`` are not sent. Errors that concern the whole request (auth,
+    rate limit after retries) are raised.
+    """
+    outcomes, namespace, missing = _cache_lookup(client, cache, operation, items)
+    for chunk in _chunks(missing, max_batch):
+        document = operation.document(len(chunk))
+        data, errors = client.execute_query_partial(
+            document, operation.variables([items[i] for i in chunk])
+        )
+        for i, outcome in zip(chunk, operation.split(data, errors, len(chunk))):
+            outcomes[i] = outcome
+        _store(cache, operation, items, outcomes, chunk, namespace)
+    return outcomes
+
+
+async def execute_batched_async(
+    client,
+    operation: BatchedOperation,
+    items: Sequence[Dict[str, Any]],
+    *,
+    cache: Optional[ResponseCache] = None,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> List[Outcome]:
+    """Coroutine version of ``execute_batched``; chunks are sent concurrently."""
+    outcomes, namespace, missing = _cache_lookup(client, cache, operation, items)
+    chunks = list(_chunks(missing, max_batch))
+    responses = await asyncio.gather(*(
+        client.execute_query_partial(
+            operation.document(len(chunk)), operation.variables([items[i] for i in chunk])
+        )
+        for chunk in chunks
+    ))
+    for chunk, (data, errors) in zip(chunks, responses):
+        for i, outcome in zip(chunk, operation.split(data, errors, len(chunk))):
+            outcomes[i] = outcome
+        _store(cache, operation, items, outcomes, chunk, namespace)
+    return outcomes
+
+
+class AutoBatcher:
+    """
+    DataLoader-style batching for threaded callers.
+
+    ``load(variables)`` queues a call and blocks until its result is ready.
+    Calls arriving within ``window`` seconds of the first one (or until
+    ``max_batch`` are queued) are sent together by ``dispatch``, which takes
+    a list of variables and returns one outcome per entry. An outcome that
+    is an exception is raised in the caller that asked for it.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[Dict[str, Any]]], List[Outcome]],
+        *,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self._dispatch = dispatch
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def load(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        future: Future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((variables, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._run(batch)
+        outcome = future.result()
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    def _take(self) -> List[tuple]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+
+    def _run(self, batch: List[tuple]) -> None:
+        try:
+            outcomes = self._dispatch([variables for variables, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
+
+
+class AsyncAutoBatcher:
+    """AutoBatcher for coroutines; ``dispatch`` is a coroutine function."""
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[Dict[str, Any]]], Any],
+        *,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self._dispatch = dispatch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[tuple] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def load(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((variables, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self.window, self._flush)
+        outcome = await future
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        try:
+            outcomes = await self._dispatch([variables for variables, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
@@ -0,0 +1,627 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from . import json_codec
+from .models.pdf_import import ImportedBookmark
+from .utils import operation_name
+
+DEFAULT_IMPORT_CACHE_ENTRIES = 100_000
+DEFAULT_RESPONSE_TTL = 3600.0  # seconds a cached response stays fresh
+DEFAULT_SEARCH_TTL = 300.0  # seconds a cached search result stays fresh
+DEFAULT_RESPONSE_ENTRIES = 1024
+DEFAULT_RESPONSE_BYTES = 64 * 1024 * 1024
+
+
+def _key_namespace(api_key: str) -> str:
+    """Cache namespace for an API key; the key itself is never stored."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class CacheStats(BaseModel):
+    """Counters reported by the SDK caches."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0  # stored size, for caches with a byte limit
+
+
+class ImportCache:
+    """
+    Persistent map from PDF content (SHA-256 of the file bytes) to the
+    bookmark the server returned when that PDF was imported.
+
+    ``import_pdf`` consults the cache before uploading: a PDF seen before is
+    not uploaded or parsed again, its cached bookmark goes straight to the
+    fetch stage. Entries are scoped by a namespace (the client derives it
+    from the API key) so bookmarks never leak between accounts.
+
+    Backed by SQLite; pass ``path=None`` for an in-memory cache. When more
+    than ``max_entries`` are stored, the least recently used are evicted.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_IMPORT_CACHE_ENTRIES,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+
+        if path is None:
+            location = ":memory:"
+        else:
+            location = str(Path(path).expanduser())
+            os.makedirs(os.path.dirname(os.path.abspath(location)), exist_ok=True)
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(location, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS imports ("
+            " namespace TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " bookmark TEXT NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (namespace, digest))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS imports_last_used ON imports (last_used)"
+        )
+        self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, digest: str, namespace: str = "") -> Optional[ImportedBookmark]:
+        """Return the cached bookmark for a PDF digest, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bookmark FROM imports WHERE namespace = ? AND digest = ?",
+                (namespace, digest),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE imports SET last_used = ? WHERE namespace = ? AND digest = ?",
+                (time.time(), namespace, digest),
+            )
+            self._conn.commit()
+            self._hits += 1
+        return ImportedBookmark.model_validate_json(row[0])
+
+    def put(self, digest: str, bookmark: ImportedBookmark, namespace: str = "") -> None:
+        """Record the bookmark for a PDF digest, evicting old entries if full."""
+        payload = json.dumps(bookmark.model_dump(by_alias=True))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imports (namespace, digest, bookmark, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (namespace, digest, payload, time.time()),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM imports").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM imports WHERE rowid IN ("
+                    " SELECT rowid FROM imports ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._evictions += excess
+            self._conn.commit()
+
+    def invalidate(self, digest: str, namespace: str = "") -> None:
+        """Forget one PDF, so its next import uploads it again."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM imports WHERE namespace = ? AND digest = ?",
+                (namespace, digest),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM imports")
+            self._conn.commit()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM imports").fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=count,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self.stats().entries
+
+
+class ImportProgress(BaseModel):
+    """Per-file progress recorded by an ImportCheckpoint."""
+
+    uploaded: int = 0  # files whose bookmark is known
+    fetched: int = 0  # of those, files whose full paper data was fetched
+    failed: int = 0  # of those, files whose last fetch failed
+
+    @property
+    def pending(self) -> int:
+        return self.uploaded - self.fetched - self.failed
+
+
+class ImportCheckpoint(ImportCache):
+    """
+    Checkpoint file for a resumable bulk import.
+
+    Records, per PDF (SHA-256 of its bytes), the bookmark returned by the
+    upload and whether the paper was then fetched. Every batch is written as
+    soon as it uploads, so if ``import_pdf`` stops partway (a RateLimitError
+    on batch 37, a crash, Ctrl-C) rerunning it with the same checkpoint
+    uploads only the files that never made it; ``iter_import_pdf`` also
+    skips the papers it already yielded.
+
+    Unlike ImportCache, entries are never evicted by default.
+    """
+
+    _STATES = ("uploaded", "fetched", "failed")
+
+    def __init__(self, path: Union[str, Path], max_entries: int = sys.maxsize):
+        super().__init__(path, max_entries=max_entries)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS progress ("
+                " namespace TEXT NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " error TEXT,"
+                " PRIMARY KEY (namespace, digest))"
+            )
+            self._conn.commit()
+
+    def put(self, digest: str, bookmark: ImportedBookmark, namespace: str = "") -> None:
+        super().put(digest, bookmark, namespace)
+        self.mark(digest, "uploaded", namespace=namespace)
+
+    def mark(
+        self,
+        digest: str,
+        state: str,
+        error: Optional[str] = None,
+        namespace: str = "",
+    ) -> None:
+        """Record the state of one PDF: "uploaded", "fetched" or "failed"."""
+        if state not in self._STATES:
+            raise ValueError(f"state must be one of {self._STATES}.")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO progress (namespace, digest, state, error)"
+                " VALUES (?, ?, ?, ?)",
+                (namespace, digest, state, error),
+            )
+            self._conn.commit()
+
+    def state(self, digest: str, namespace: str = "") -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM progress WHERE namespace = ? AND digest = ?",
+                (namespace, digest),
+            ).fetchone()
+        return row[0] if row else None
+
+    def progress(self, namespace: Optional[str] = None) -> ImportProgress:
+        """Counts for the files of ``namespace``, or of every namespace if None."""
+        with self._lock:
+            if namespace is None:
+                rows = self._conn.execute(
+                    "SELECT state, COUNT(*) FROM progress GROUP BY state"
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT state, COUNT(*) FROM progress WHERE namespace = ? GROUP BY state",
+                    (namespace,),
+                ).fetchall()
+        counts = dict(rows)
+        return ImportProgress(
+            uploaded=sum(counts.values()),
+            fetched=counts.get("fetched", 0),
+            failed=counts.get("failed", 0),
+        )
+
+    def invalidate(self, digest: str, namespace: str = "") -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM progress WHERE namespace = ? AND digest = ?",
+                (namespace, digest),
+            )
+            self._conn.commit()
+        super().invalidate(digest, namespace)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM progress")
+            self._conn.commit()
+        super().clear()
+
+
+# ── Response caches ─────────────────────────────────────────────────────
+
+
+def _variables_digest(variables: Optional[Dict[str, Any]]) -> str:
+    canonical = json.dumps(variables or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _dump(raw: Dict[str, Any]) -> bytes:
+    return json_codec.dumps(raw)
+
+
+def _load(data: bytes) -> Dict[str, Any]:
+    return json_codec.loads(data)
+
+
+class ResponseCache(ABC):
+    """
+    Interface of the query response caches used by the services.
+
+    A response is stored under (namespace, operation name, digest of the
+    variables), where the namespace separates API keys. Values are the raw
+    GraphQL results, serialized, so callers always get a private copy.
+    Subclasses implement ``_get``, ``_set``, ``_delete`` and ``stats``.
+    """
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_RESPONSE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, operation: str, variables: Optional[Dict[str, Any]], namespace: str = "") -> Optional[Dict[str, Any]]:
+        data = self._get((namespace, operation, _variables_digest(variables)))
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return _load(data)
+
+    def set(self, operation: str, variables: Optional[Dict[str, Any]], raw: Dict[str, Any], namespace: str = "") -> None:
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self._set((namespace, operation, _variables_digest(variables)), _dump(raw), expires)
+
+    def invalidate(self, operation: Optional[str] = None, variables: Optional[Dict[str, Any]] = None) -> None:
+        """Drop one response, every response of an operation, or (no arguments) everything."""
+        digest = _variables_digest(variables) if variables is not None else None
+        self._delete(operation, digest)
+
+    def clear(self) -> None:
+        self._delete(None, None)
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        ...
+
+    @abstractmethod
+    def _get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: Tuple[str, str, str], data: bytes, expires: Optional[float]) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, operation: Optional[str], digest: Optional[str]) -> None:
+        ...
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU response cache bounded by entry count and total bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESPONSE_ENTRIES,
+        max_bytes: int = DEFAULT_RESPONSE_BYTES,
+        ttl: Optional[float] = DEFAULT_RESPONSE_TTL,
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be >= 1.")
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires = entry
+            if expires is not None and expires <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _set(self, key, data, expires):
+        if len(data) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (data, expires)
+            self._bytes += len(data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _pop(self, key) -> None:
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def _delete(self, operation, digest):
+        with self._lock:
+            for key in list(self._entries):
+                if (operation is None or key[1] == operation) and (digest is None or key[2] == digest):
+                    self._pop(key)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk response cache: zlib-compressed responses in a SQLite file.
+
+    Survives restarts and can be shared by several processes. Least recently
+    used entries are evicted once the compressed total exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: Optional[float] = DEFAULT_RESPONSE_TTL,
+        compress_level: int = 6,
+    ):
+        super().__init__(ttl)
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        location = str(Path(path).expanduser())
+        os.makedirs(os.path.dirname(os.path.abspath(location)), exist_ok=True)
+        self._conn = sqlite3.connect(location, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " namespace TEXT NOT NULL,"
+            " operation TEXT NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires REAL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (namespace, operation, digest))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._conn.commit()
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires FROM responses"
+                " WHERE namespace = ? AND operation = ? AND digest = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND operation = ? AND digest = ?",
+                    key,
+                )
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_used = ?"
+                " WHERE namespace = ? AND operation = ? AND digest = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+        return zlib.decompress(row[0])
+
+    def _set(self, key, data, expires):
+        blob = zlib.compress(data, self.compress_level)
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (namespace, operation, digest, data, size, expires, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, blob, len(blob), expires, time.time()),
+            )
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT rowid, size FROM responses ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                self._conn.execute("DELETE FROM responses WHERE rowid = ?", (row[0],))
+                total -= row[1]
+                self._evictions += 1
+            self._conn.commit()
+
+    def _delete(self, operation, digest):
+        clauses, params = [], []
+        if operation is not None:
+            clauses.append("operation = ?")
+            params.append(operation)
+        if digest is not None:
+            clauses.append("digest = ?")
+            params.append(digest)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM responses{where}", params)
+            self._conn.commit()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=count,
+                bytes=total,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cached_query(client, cache: Optional[ResponseCache], query, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """Run ``query`` through ``client``, answering from ``cache`` when possible."""
+    if cache is None:
+        return client.execute_query(query, variables)
+    operation = operation_name(query)
+    namespace = _key_namespace(getattr(client, "_api_key", ""))
+    raw = cache.get(operation, variables, namespace)
+    if raw is None:
+        raw = client.execute_query(query, variables)
+        cache.set(operation, variables, raw, namespace)
+    return raw
+
+
+async def cached_query_async(client, cache: Optional[ResponseCache], query, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """Coroutine version of ``cached_query`` for the async clients."""
+    if cache is None:
+        return await client.execute_query(query, variables)
+    operation = operation_name(query)
+    namespace = _key_namespace(getattr(client, "_api_key", ""))
+    raw = cache.get(operation, variables, namespace)
+    if raw is None:
+        raw = await client.execute_query(query, variables)
+        cache.set(operation, variables, raw, namespace)
+    return raw
+
+
+# ── Search cache ────────────────────────────────────────────────────────
+
+
+def _normalize_text(text: Any, ignore_case: bool) -> Any:
+    if not isinstance(text, str):
+        return text
+    text = " ".join(text.split())
+    return text.casefold() if ignore_case else text
+
+
+def _paper_key(paper: Dict[str, Any]) -> Dict[str, str]:
+    return {name: str(paper.get(name)) for name in ("collection", "id_field", "id_type", "id_value")}
+
+
+class SearchCache:
+    """
+    Cache for document_search results and the paginated_search data of
+    their hits, under normalized keys.
+
+    Search keys ignore surrounding and repeated whitespace, keyword order
+    and duplicate keywords, and (with ``ignore_case``, the default) case,
+    so "BERT " with ["nlp", "Transformers"] and "bert" with
+    ["transformers", "nlp"] share one entry. Paginated results are cached
+    per paper and keywords, so any page made of known papers is answered
+    locally and only the missing papers are requested.
+
+    Entries are kept in ``backend`` (a MemoryResponseCache with ``ttl`` by
+    default; pass a SQLiteResponseCache to keep them across restarts).
+    Requests still send the caller's original text.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = DEFAULT_SEARCH_TTL,
+        *,
+        backend: Optional[ResponseCache] = None,
+        ignore_case: bool = True,
+    ):
+        self.backend = backend if backend is not None else MemoryResponseCache(ttl=ttl)
+        self.ignore_case = ignore_case
+
+    def _keywords(self, keywords) -> list:
+        normalized = {_normalize_text(k, self.ignore_case) for k in keywords or []}
+        normalized.discard("")
+        return sorted(normalized, key=str)
+
+    def search_key(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized form of documentSearch variables."""
+        key = dict(variables)
+        key["ranking_variable"] = _normalize_text(variables.get("ranking_variable"), self.ignore_case)
+        key["keywords"] = self._keywords(variables.get("keywords"))
+        if key.get("paper_list"):
+            key["paper_list"] = sorted((_paper_key(p) for p in key["paper_list"]), key=lambda p: tuple(p.values()))
+        return key
+
+    def get_search(self, variables: Dict[str, Any], namespace: str = "") -> Optional[Dict[str, Any]]:
+        return self.backend.get("documentSearch", self.search_key(variables), namespace)
+
+    def set_search(self, variables: Dict[str, Any], raw: Dict[str, Any], namespace: str = "") -> None:
+        self.backend.set("documentSearch", self.search_key(variables), raw, namespace)
+
+    def _paper_variables(self, paper: Dict[str, Any], keywords) -> Dict[str, Any]:
+        return {"paper": _paper_key(paper), "keywords": self._keywords(keywords)}
+
+    def get_papers(self, paper_list, keywords, namespace: str = "") -> List[Optional[Dict[str, Any]]]:
+        """Cached paginatedSearch items for ``paper_list``; None where missing."""
+        return [
+            self.backend.get("paginatedSearch", self._paper_variables(paper, keywords), namespace)
+            for paper in paper_list
+        ]
+
+    def set_papers(self, paper_list, keywords, items, namespace: str = "") -> None:
+        """Store paginatedSearch items; ``items`` is aligned with ``paper_list``."""
+        for paper, item in zip(paper_list, items):
+            if item is not None:
+                self.backend.set("paginatedSearch", self._paper_variables(paper, keywords), item, namespace)
+
+    def stats(self) -> CacheStats:
+        return self.backend.stats()
+
+    def clear(self) -> None:
+        self.backend.clear()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .exceptions import APIError, CircuitOpenError
+from .retry import _network_error
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitStats(BaseModel):
+    """Snapshot of a CircuitBreaker, e.g. for a health check endpoint."""
+
+    state: str
+    calls: int  # calls in the sliding window
+    failure_rate: float
+    slow_call_rate: float
+    open_for: float = 0.0  # seconds until an open circuit lets a trial call through
+
+
+class CircuitBreaker:
+    """
+    Stop calling a backend that is failing or hanging.
+
+    The breaker watches the last ``window_size`` calls. Once at least
+    ``min_calls`` were seen and either the share of failures reaches
+    ``failure_rate_threshold`` or the share of calls slower than
+    ``slow_call_duration`` seconds reaches ``slow_call_rate_threshold``, the
+    circuit opens: for ``open_duration`` seconds every call fails at once
+    with CircuitOpenError instead of waiting for a timeout. Then the circuit
+    is half-open and lets ``half_open_calls`` trial calls through; if they
+    all succeed it closes, if one fails it opens again.
+
+    Failures are server-side problems only: 5xx responses, timeouts and
+    connection errors. Rate limits, auth and GraphQL errors show the backend
+    is answering and count as successes. Thread-safe; one breaker can be
+    shared by several clients talking to the same endpoint.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 1,
+    ):
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise ValueError("Rate thresholds must be in (0, 1].")
+        if window_size < 1 or not 1 <= min_calls <= window_size:
+            raise ValueError("Need window_size >= 1 and 1 <= min_calls <= window_size.")
+        if half_open_calls < 1:
+            raise ValueError("half_open_calls must be >= 1.")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_passed = 0
+
+    # ── State ───────────────────────────────────────────────────────────
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half_open"."""
+        with self._lock:
+            self._tick(time.monotonic())
+            return self._state
+
+    def stats(self) -> CircuitStats:
+        with self._lock:
+            now = time.monotonic()
+            self._tick(now)
+            failure_rate, slow_rate = self._rates()
+            open_for = self._opened_at + self.open_duration - now if self._state == OPEN else 0.0
+            return CircuitStats(
+                state=self._state,
+                calls=len(self._window),
+                failure_rate=failure_rate,
+                slow_call_rate=slow_rate,
+                open_for=max(0.0, open_for),
+            )
+
+    def reset(self) -> None:
+        """Close the circuit and forget all recorded calls."""
+        with self._lock:
+            self._close()
+
+    def _tick(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_duration:
+            self._state = HALF_OPEN
+            self._trials_started = self._trials_passed = 0
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        n = len(self._window)
+        return (
+            sum(failed for failed, _ in self._window) / n,
+            sum(slow for _, slow in self._window) / n,
+        )
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._window.clear()
+
+    # ── Call hooks ──────────────────────────────────────────────────────
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tick(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._trials_started < self.half_open_calls:
+                self._trials_started += 1
+                return
+            wait = max(0.0, self._opened_at + self.open_duration - now)
+            raise CircuitOpenError(
+                "Circuit open: the Endoc API is failing, not sending the request.",
+                retry_after=wait or None,
+            )
+
+    def record(self, duration: float, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of a call let through by ``before_call``."""
+        failed = self.is_failure(error)
+        slow = duration >= self.slow_call_duration
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._trials_passed += 1
+                    if self._trials_passed >= self.half_open_calls:
+                        self._close()
+                return
+            if self._state == OPEN:
+                return  # a call started before the circuit opened
+            self._window.append((failed, slow))
+            if len(self._window) >= self.min_calls:
+                failure_rate, slow_rate = self._rates()
+                if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                    self._open(now)
+
+    def release(self) -> None:
+        """
+        Give back a call let through by ``before_call`` that ended without an
+        outcome (cancelled or interrupted), so a half-open trial slot is not
+        lost for good.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials_started > self._trials_passed:
+                self._trials_started -= 1
+
+    @staticmethod
+    def is_failure(error: Optional[BaseException]) -> bool:
+        if error is None or isinstance(error, CircuitOpenError):
+            return False
+        if not isinstance(error, APIError):
+            return False
+        status = error.status_code
+        if status is not None:
+            return 500 <= status < 600
+        return _network_error(error)
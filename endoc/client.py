@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import requests
 from gql import Client, gql
-from gql.transport.requests import RequestsHTTPTransport
-from .utils import raise_for_domain_errors, is_auth_error_message
+from .transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    PooledRequestsHTTPTransport,
+    build_session,
+)
+from .circuit_breaker import CircuitBreaker
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after, resolve_retry, retry_after_from
+from .singleflight import SingleFlight, flight_key
+from .utils import raise_for_domain_errors, is_auth_error_message, operation_name, operation_type
 
 try:
     from gql.transport.exceptions import TransportQueryError, TransportServerError
@@ -26,6 +41,7 @@ except ImportError:
                 self.status_code = status_code
 
 from .exceptions import (
+    EndocError,
     AuthenticationError,
     PermissionError,
     RateLimitError,
@@ -34,6 +50,7 @@ from .exceptions import (
 from .utils import raise_for_domain_errors
 
 DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_VALIDATION_TTL = 600  # seconds a validation outcome is reused
 
 VALIDATE_QUERY = gql("""
 query Validate {
@@ -46,16 +63,23 @@ query Validate {
 
 def _map_http_transport_error(err: TransportServerError) -> None:
     """Map HTTP status codes to SDK exceptions."""
-    status = getattr(err, "status_code", None)
+    # gql stores the status as ``code``; older versions used ``status_code``.
+    status = getattr(err, "code", None) or getattr(err, "status_code", None)
     if status == 401:
         raise AuthenticationError("Invalid or missing API key (HTTP 401).") from err
     if status == 403:
         raise PermissionError("API key lacks permission (HTTP 403).") from err
     if status == 429:
-        raise RateLimitError("Rate limit exceeded (HTTP 429).") from err
+        raise RateLimitError(
+            "Rate limit exceeded (HTTP 429).", retry_after=retry_after_from(err)
+        ) from err
     if status and 500 <= status < 600:
-        raise APIError(f"Server error (HTTP {status}).") from err
-    raise APIError(str(err)) from err
+        raise APIError(
+            f"Server error (HTTP {status}).",
+            status_code=status,
+            retry_after=retry_after_from(err),
+        ) from err
+    raise APIError(str(err), status_code=status) from err
 
 def _map_graphql_error(err: TransportQueryError) -> None:
     """
@@ -72,11 +96,194 @@ def _map_graphql_error(err: TransportQueryError) -> None:
     if code in {"FORBIDDEN", "INSUFFICIENT_PERMISSIONS"}:
         raise PermissionError(message) from err
     if code == "RATE_LIMITED":
-        raise RateLimitError(message) from err
+        raise RateLimitError(message, retry_after=parse_retry_after(extensions.get("retryAfter"))) from err
     raise APIError(message) from err
 
+_REQUEST_LEVEL_CODES = {"UNAUTHENTICATED", "FORBIDDEN", "INSUFFICIENT_PERMISSIONS", "RATE_LIMITED"}
+
+def _is_partial_result(err: TransportQueryError) -> bool:
+    """True if a GraphQL error response still carries per-field data.
+
+    Errors that concern the whole request (auth, rate limits) never count.
+    """
+    if not isinstance(getattr(err, "data", None), dict):
+        return False
+    for error in getattr(err, "errors", None) or []:
+        code = ((error.get("extensions") or {}).get("code") or "").upper()
+        if code in _REQUEST_LEVEL_CODES:
+            return False
+    return True
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    key = api_key or os.getenv("ENDOC_API_KEY") or os.getenv("API_KEY")
+    if not key:
+        raise AuthenticationError("No API key provided. Set ENDOC_API_KEY or pass api_key=...")
+    return key
+
+def _resolve_graphql_url() -> str:
+    return (
+        os.getenv("ENDOC_GRAPHQL_URL")
+        or os.getenv("STAGING_GRAPHQL_URL")
+        or os.getenv("PROD_GRAPHQL_URL")
+        or "https://endoc.ethz.ch/graphql"
+    )
+
+def _build_headers(key: str, user_agent: Optional[str]) -> Dict[str, str]:
+    headers = {"x-api-key": key}
+    if user_agent:
+        headers["User-Agent"] = user_agent
+    return headers
+
+def _check_validation_result(data: Any) -> None:
+    """Raise if an authenticateKey result reports an auth failure."""
+    block = data.get("authenticateKey") if isinstance(data, dict) else None
+    if isinstance(block, dict):
+        message = (block.get("message") or "").strip()
+        if is_auth_error_message(message):
+            raise_for_domain_errors(block)
+
+def _raise_for_result_blocks(result: Any) -> None:
+    """Raise SDK errors for any operation block that reports a failure status."""
+    if isinstance(result, dict):
+        for _, block in result.items():
+            if isinstance(block, dict) and ("status" in block or "message" in block):
+                raise_for_domain_errors(block)
+
+class _KeyValidationCache:
+    """
+    Process-wide, thread-safe record of API key validation outcomes.
+
+    Entries are keyed by (sha256(api_key), endpoint) and expire after a TTL.
+    Successful validations and auth failures are cached; transient errors
+    (rate limits, server errors) are not, so the next call retries.
+
+    At most one check per key is in flight in the process, whether it comes
+    from an APIClient or an AsyncAPIClient: other callers for the same key,
+    sync or async, wait for it and then read the cached outcome.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[float, Optional[EndocError]]] = {}
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+
+    @staticmethod
+    def _make_key(api_key: str, url: str) -> Tuple[str, str]:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest(), url
+
+    def _lookup_locked(self, cache_key: Tuple[str, str]):
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[cache_key]
+            return None
+        return entry
+
+    def _claim(self, cache_key: Tuple[str, str]):
+        """(cached entry, None, False), (None, flight to wait on, False) or (None, own flight, True)."""
+        with self._lock:
+            entry = self._lookup_locked(cache_key)
+            if entry is not None:
+                return entry, None, False
+            flight = self._in_flight.get(cache_key)
+            if flight is not None:
+                return None, flight, False
+            flight = self._in_flight[cache_key] = Future()
+            return None, flight, True
+
+    def _land(self, cache_key: Tuple[str, str], flight: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(cache_key, None)
+        if not flight.done():
+            flight.set_result(None)
+
+    @staticmethod
+    def _replay(entry) -> None:
+        err = entry[1]
+        if err is not None:
+            raise type(err)(str(err))
+
+    def validate(self, api_key: str, url: str, ttl: float, check: Callable[[], None]) -> None:
+        """Run ``check`` unless a fresh outcome for (api_key, url) is cached."""
+        cache_key = self._make_key(api_key, url)
+        while True:
+            entry, flight, leader = self._claim(cache_key)
+            if entry is not None:
+                return self._replay(entry)
+            if not leader:
+                # Another caller is checking this key; if its check fails
+                # transiently nothing is cached and we try ourselves.
+                flight.result()
+                continue
+            try:
+                check()
+            except (AuthenticationError, PermissionError) as e:
+                self._store(cache_key, e, ttl)
+                raise
+            else:
+                self._store(cache_key, None, ttl)
+            finally:
+                self._land(cache_key, flight)
+            return None
+
+    async def validate_async(self, api_key: str, url: str, ttl: float, check) -> None:
+        """Coroutine variant of ``validate``; ``check`` is an async callable."""
+        cache_key = self._make_key(api_key, url)
+        while True:
+            entry, flight, leader = self._claim(cache_key)
+            if entry is not None:
+                return self._replay(entry)
+            if not leader:
+                # Waiting must not block the loop, and giving up must not
+                # cancel the shared flight.
+                await asyncio.shield(asyncio.wrap_future(flight))
+                continue
+            try:
+                await check()
+            except (AuthenticationError, PermissionError) as e:
+                self._store(cache_key, e, ttl)
+                raise
+            else:
+                self._store(cache_key, None, ttl)
+            finally:
+                self._land(cache_key, flight)
+            return None
+
+    def _store(self, cache_key, err: Optional[EndocError], ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + ttl, err)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_VALIDATION_CACHE = _KeyValidationCache()
+
+
+def clear_validation_cache() -> None:
+    """Forget all cached API key validation outcomes for this process."""
+    _VALIDATION_CACHE.clear()
+
+
 class APIClient:
-    """Low-level GraphQL client with automatic API key validation and consistent errors."""
+    """Low-level GraphQL client with automatic API key validation and consistent errors.
+
+    Requests go through a keep-alive connection pool. Pass ``session`` (see
+    ``endoc.transport.build_session``) to share one pool between clients;
+    otherwise the client creates and owns a pool sized by
+    ``pool_connections`` / ``pool_maxsize``.
+
+    ``validate_key`` controls the ``authenticateKey`` check:
+        "lazy" (default) – validate before the first real query
+        True             – validate in the constructor
+        False            – never validate
+    Outcomes are cached per (key, endpoint) for ``validation_ttl`` seconds,
+    so the check runs at most once per process within that window.
+    """
 
     def __init__(
         self,
@@ -84,24 +291,30 @@ class APIClient:
         *,
         timeout: int = DEFAULT_TIMEOUT,
         user_agent: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        validate_key: Union[bool, str] = "lazy",
+        validation_ttl: float = DEFAULT_VALIDATION_TTL,
+        retry: Union[RetryPolicy, bool] = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = True,
     ):
-        key = api_key or os.getenv("ENDOC_API_KEY") or os.getenv("API_KEY")
-        if not key:
-            raise AuthenticationError("No API key provided. Set ENDOC_API_KEY or pass api_key=...")
-
-        graphql_url = (
-            os.getenv("ENDOC_GRAPHQL_URL")
-            or os.getenv("STAGING_GRAPHQL_URL")
-            or os.getenv("PROD_GRAPHQL_URL")
-            or "https://endoc.ethz.ch/graphql"
-        )
+        if validate_key not in (True, False, "lazy"):
+            raise ValueError("validate_key must be True, False or 'lazy'.")
 
-        headers = {"x-api-key": key}
-        if user_agent:
-            headers["User-Agent"] = user_agent
+        key = _resolve_api_key(api_key)
+        graphql_url = _resolve_graphql_url()
+        headers = _build_headers(key, user_agent)
 
-        self.transport = RequestsHTTPTransport(
+        self._owns_session = session is None
+        if session is None:
+            session = build_session(pool_connections, pool_maxsize)
+
+        self.transport = PooledRequestsHTTPTransport(
             url=graphql_url,
+            session=session,
             headers=headers,
             use_json=True,
             timeout=timeout,
@@ -112,26 +325,39 @@ class APIClient:
             fetch_schema_from_transport=False,
         )
 
-        self._validate_api_key()
+        self._api_key = key
+        self._validate_mode = validate_key
+        self._validation_ttl = validation_ttl
+        self._key_validated = validate_key is False
+        self.retry = resolve_retry(retry)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        # Identical queries in flight at the same time share one request.
+        self._single_flight = SingleFlight() if coalesce else None
+
+        if validate_key is True:
+            self._validate_api_key()
 
     from .utils import raise_for_domain_errors, is_auth_error_message
 
     def _validate_api_key(self) -> None:
-        try:
-            data = self.client.execute(VALIDATE_QUERY)
-            block = data.get("authenticateKey") if isinstance(data, dict) else None
-
-            if isinstance(block, dict):
-                status = (block.get("status") or "").strip().lower()
-                message = (block.get("message") or "").strip()
-
-                if is_auth_error_message(message):
-                    raise_for_domain_errors(block)
-
-                return
+        _VALIDATION_CACHE.validate(
+            self._api_key,
+            self.transport.url,
+            self._validation_ttl,
+            self._check_api_key,
+        )
+        self._key_validated = True
 
-            return
+    def _check_api_key(self) -> None:
+        # The check is an ordinary request: it is retried, paced and guarded
+        # like any other, under the operation name "Validate".
+        self.retry.call(lambda: self._guarded(VALIDATE_QUERY, self._check_api_key_once), idempotent=True)
 
+    def _check_api_key_once(self) -> None:
+        try:
+            data = self.client.execute(VALIDATE_QUERY)
+            _check_validation_result(data)
         except (AuthenticationError, PermissionError, RateLimitError, APIError):
             raise
         except TransportServerError as e:
@@ -141,22 +367,103 @@ class APIClient:
         except Exception as e:
             raise APIError(str(e)) from e
 
+    @property
+    def session(self) -> requests.Session:
+        return self.transport.pooled_session
+
+    def close(self) -> None:
+        """Release pooled connections if this client created the session."""
+        if self._owns_session:
+            self.transport.shutdown()
+
+    def __enter__(self) -> "APIClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     def execute_query(self, query, variable_values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query, retrying transient failures according to ``self.retry``."""
+        return self._run(query, variable_values, partial=False)
+
+    def execute_query_partial(
+        self, query, variable_values: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Like ``execute_query`` but return ``(data, errors)`` instead of raising
+        for GraphQL errors that leave the rest of the data usable, and
+        without checking each block's status. Used for batched documents,
+        where one failing alias must not fail the others. Auth and rate
+        limit errors still raise.
+        """
+        return self._run(query, variable_values, partial=True)
+
+    def _run(self, query, variable_values, partial: bool):
+        if not self._key_validated:
+            self._validate_api_key()
+
+        def call():
+            return self.retry.call(
+                lambda: self._attempt(query, variable_values, partial),
+                idempotent=self.retry.is_idempotent(query),
+            )
+
+        if self._single_flight is None or operation_type(query) != "query":
+            return call()
+        return self._single_flight.do((flight_key(query, variable_values), partial), call)
+
+    def _attempt(self, query, variable_values: Optional[Dict[str, Any]], partial: bool = False):
+        return self._guarded(query, lambda: self._execute_once(query, variable_values, partial))
+
+    def _guarded(self, query, send: Callable[[], Any]):
+        """One request via ``send``, paced by the rate limiter and guarded by the circuit breaker."""
+        limiter, breaker = self.rate_limiter, self.circuit_breaker
+        if limiter is None and breaker is None:
+            return send()
+        name = operation_name(query)
+        if breaker is not None:
+            breaker.before_call()
+        started = time.monotonic()
+        try:
+            if limiter is not None:
+                limiter.acquire(name)
+                started = time.monotonic()
+            result = send()
+        except Exception as e:
+            if limiter is not None and isinstance(e, RateLimitError):
+                limiter.on_rate_limited(name, e.retry_after)
+            if breaker is not None:
+                breaker.record(time.monotonic() - started, e)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no outcome to record, but a half-open
+            # trial must be handed back or the circuit never closes again.
+            if breaker is not None:
+                breaker.release()
+            raise
+        if limiter is not None:
+            limiter.on_success(name)
+        if breaker is not None:
+            breaker.record(time.monotonic() - started)
+        return result
+
+    def _execute_once(self, query, variable_values: Optional[Dict[str, Any]] = None, partial: bool = False):
         try:
             result = self.client.execute(
                 query,
                 variable_values=variable_values or {},
             )
-            if isinstance(result, dict):
-                for _, block in result.items():
-                    if isinstance(block, dict) and ("status" in block or "message" in block):
-                        raise_for_domain_errors(block)
+            if partial:
+                return result, []
+            _raise_for_result_blocks(result)
             return result
         except (AuthenticationError, PermissionError, RateLimitError, APIError):
             raise
         except TransportServerError as e:
             _map_http_transport_error(e)
         except TransportQueryError as e:
+            if partial and _is_partial_result(e):
+                return e.data, list(e.errors or [])
             _map_graphql_error(e)
         except Exception as e:
             raise APIError(str(e)) from e
@@ -1,38 +1,191 @@
-import base64
+import functools
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
 
+import requests
+
+from .batching import DEFAULT_MAX_BATCH
+from .cache import ImportCache, ImportCheckpoint, ResponseCache, SearchCache, _key_namespace
+from .client import APIClient, DEFAULT_TIMEOUT, DEFAULT_VALIDATION_TTL
+from .circuit_breaker import CircuitBreaker
+from .projection import Projection, single_paper_query
+from .rate_limit import RateLimiter
+from .search import DEFAULT_PAGE_SIZE, iter_pages
+from .retry import RetryPolicy
+from .transport import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
 from .services.document_search import DocumentSearchService
-from .services.paginated_search import PaginatedSearchService
+from .services.paginated_search import DEFAULT_SEARCH_CONCURRENCY, PaginatedSearchService
 from .services.summarization import SummarizationService
 from .services.single_paper_search import SinglePaperSearchService
 from .services.get_note_library import GetNoteLibraryService
 from .services.title_search import TitleSearchService
 from .services.pdf_import import PDFImportService
+from .models.document_search import SearchStage
+from .models.paginated_search import PaginatedSearchData, PaginatedSearchResponseBody
 from .models.pdf_import import ImportResult, ImportedPaper
+from .import_pipeline import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PREFETCH_BATCHES,
+    ImportPipeline,
+    build_import,
+)
 
 
 class EndocClient:
-    def __init__(self, api_key: str):
-        self._summarization_service = SummarizationService(api_key)
-        self._document_search_service = DocumentSearchService(api_key)
-        self._paginated_search_service = PaginatedSearchService(api_key)
-        self._single_paper_service = SinglePaperSearchService(api_key)
-        self._get_note_library_service = GetNoteLibraryService(api_key)
-        self._title_search_service = TitleSearchService(api_key)
-        self._pdf_import_service = PDFImportService(api_key)
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        validate_key: Union[bool, str] = "lazy",
+        validation_ttl: float = DEFAULT_VALIDATION_TTL,
+        retry: Union[RetryPolicy, bool] = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = True,
+        import_cache: Optional[ImportCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        batch_window: Optional[float] = None,
+    ):
+        """Create a client whose services all share one pooled GraphQL transport.
+
+        Args:
+            timeout:          Per-request timeout in seconds.
+            session:          Optional ``requests.Session`` to share between
+                              several clients (see ``endoc.transport.build_session``).
+            pool_connections: Number of host pools kept by the created session.
+            pool_maxsize:     Keep-alive connections kept per host.
+            validate_key:     "lazy" (default) checks the key before the first
+                              query, True checks it immediately, False never.
+            validation_ttl:   Seconds a validation outcome is reused per process.
+            retry:            ``RetryPolicy`` for transient failures (rate
+                              limits, 5xx, timeouts); True for the default
+                              policy, False to never retry.
+            rate_limiter:     Optional ``RateLimiter`` pacing every request of
+                              this client (and of any client sharing it).
+            circuit_breaker:  Optional ``CircuitBreaker``; while it is open,
+                              calls raise CircuitOpenError without waiting.
+            coalesce:         Let concurrent identical queries share one
+                              request (default True).
+            import_cache:     Optional ``ImportCache``; PDFs already imported
+                              with this key are not uploaded again.
+            response_cache:   Optional ``ResponseCache`` answering repeated
+                              single_paper, summarize, title_search and
+                              document_search calls locally.
+            search_cache:     Optional ``SearchCache`` reusing document_search
+                              and paginated_search results for normalized
+                              queries (case, spacing and keyword order
+                              ignored) and already-fetched papers.
+            batch_window:     Seconds single_paper calls from different
+                              threads wait to be sent together as one
+                              aliased request (off by default).
+        """
+        self._api_client = APIClient(
+            api_key,
+            timeout=timeout,
+            session=session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            validate_key=validate_key,
+            validation_ttl=validation_ttl,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            coalesce=coalesce,
+        )
+        self._import_cache = import_cache
+        client = self._api_client
+        self._summarization_service = SummarizationService(api_key, client=client, cache=response_cache)
+        self._document_search_service = DocumentSearchService(
+            api_key, client=client, cache=response_cache, search_cache=search_cache
+        )
+        self._paginated_search_service = PaginatedSearchService(api_key, client=client, search_cache=search_cache)
+        self._single_paper_service = SinglePaperSearchService(
+            api_key, client=client, cache=response_cache, batch_window=batch_window
+        )
+        self._get_note_library_service = GetNoteLibraryService(api_key, client=client)
+        self._title_search_service = TitleSearchService(api_key, client=client, cache=response_cache)
+        self._pdf_import_service = PDFImportService(api_key, client=client)
         self._custom_services = {}
 
+    def close(self) -> None:
+        """Release the pooled HTTP connections held by this client."""
+        self._api_client.close()
+
+    def __enter__(self) -> "EndocClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     # ── Existing query methods ──────────────────────────────────────────
 
     def summarize(self, id_value: str):
         return self._summarization_service.summarize_paper(id_value)
 
-    def document_search(self, ranking_variable: str, keywords=None):
-        return self._document_search_service.search_documents(ranking_variable, keywords)
+    def document_search(
+        self,
+        ranking_variable: Optional[str] = None,
+        keywords=None,
+        compact: bool = False,
+        *,
+        paper_list=None,
+        ranking_collection: Optional[str] = None,
+        ranking_id_field: Optional[str] = None,
+        ranking_id_value: Optional[str] = None,
+        ranking_id_type: Optional[str] = None,
+        stages: Optional[Sequence[Union[SearchStage, dict]]] = None,
+    ):
+        """Search documents.
 
-    def paginated_search(self, paper_list, keywords=None):
-        return self._paginated_search_service.paginated_search(paper_list, keywords)
+        Args:
+            ranking_variable: Free-text query the hits are ranked by.
+            keywords:         Keyword filters, e.g. "AvailableField:Content.Fullbody_Parsed".
+            compact:          Return hits as SearchHits columns.
+            paper_list:       Restrict the search to these papers
+                              (PaperMetadata, dicts, Hits or a SearchHits).
+            ranking_collection, ranking_id_field, ranking_id_value, ranking_id_type:
+                              Rank by similarity to this reference paper.
+            stages:           ``SearchStage`` steps run after this search; each
+                              re-searches only the previous stage's ``top_k``
+                              hits on the server. The last stage's result is
+                              returned.
+        """
+        return self._document_search_service.search_documents(
+            ranking_variable,
+            keywords,
+            compact=compact,
+            paper_list=paper_list,
+            ranking_collection=ranking_collection,
+            ranking_id_field=ranking_id_field,
+            ranking_id_value=ranking_id_value,
+            ranking_id_type=ranking_id_type,
+            stages=stages,
+        )
+
+    def paginated_search(
+        self,
+        paper_list,
+        keywords=None,
+        *,
+        chunk_size: Optional[int] = None,
+        max_concurrency: int = DEFAULT_SEARCH_CONCURRENCY,
+    ):
+        """Fetch full data for ``paper_list``.
+
+        With ``chunk_size``, the list is sent as several requests of at most
+        that many papers, ``max_concurrency`` at a time, and the results are
+        merged in ``paper_list`` order. A chunk that fails is listed in
+        ``.failures`` (its start index, size and error) instead of failing
+        the whole call; if every chunk fails, the first error is raised.
+        """
+        return self._paginated_search_service.paginated_search(
+            paper_list, keywords, chunk_size=chunk_size, max_concurrency=max_concurrency
+        )
 
     def single_paper(
         self,
@@ -40,17 +193,94 @@ class EndocClient:
         collection: str = "S2AG",
         id_field: str = "id_int",
         id_type: str = "int",
+        projection: Optional[Projection] = None,
     ):
+        """Fetch one paper.
+
+        ``projection`` limits the fields requested: "metadata" (title,
+        authors, venue, date, DOI), "abstract" (metadata plus the abstract),
+        "full" (default) or a set of field names such as
+        ``{"Title", "Content.Abstract"}``. Projected results are
+        PartialSinglePaperData with unselected fields left as None.
+        """
         return self._single_paper_service.get_single_paper(
-            id_value, collection=collection, id_field=id_field, id_type=id_type
+            id_value, collection=collection, id_field=id_field, id_type=id_type, projection=projection
         )
 
+    def single_papers(
+        self,
+        id_values: Iterable[str],
+        collection: str = "S2AG",
+        id_field: str = "id_int",
+        id_type: str = "int",
+        max_batch: int = DEFAULT_MAX_BATCH,
+        projection: Optional[Projection] = None,
+    ):
+        """Fetch many papers with one aliased request per ``max_batch`` ids.
+
+        Returns one SinglePaperData per id, in order. A paper that could not
+        be fetched has ``status="error"`` and the reason in ``message``.
+        """
+        return self._single_paper_service.get_single_papers(
+            id_values, collection=collection, id_field=id_field, id_type=id_type,
+            max_batch=max_batch, projection=projection,
+        )
+
+    def summarize_many(self, id_values: Iterable[str], max_batch: int = DEFAULT_MAX_BATCH):
+        """Summarize many papers in batched requests; failures as in ``single_papers``."""
+        return self._summarization_service.summarize_papers(id_values, max_batch=max_batch)
+
     def get_note_library(self, doc_id: str):
         return self._get_note_library_service.get_note_library(doc_id)
 
     def title_search(self, titles):
         return self._title_search_service.title_search(titles)
 
+    # ── Search ──────────────────────────────────────────────────────────
+
+    def search_iter(
+        self,
+        ranking_variable: str,
+        keywords=None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[PaginatedSearchResponseBody]:
+        """Search and yield every hit with its full paginated_search data.
+
+        Runs ``document_search`` once, then fetches the hits ``page_size``
+        at a time with ``paginated_search`` as the loop reaches them. With
+        ``prefetch`` the next page is requested in the background while the
+        current one is consumed. ``limit`` caps the number of hits; breaking
+        out of the loop stops further requests.
+        """
+        for page in self.search_pages(
+            ranking_variable, keywords, page_size=page_size, limit=limit, prefetch=prefetch
+        ):
+            yield from page.response
+
+    def search_pages(
+        self,
+        ranking_variable: str,
+        keywords=None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[PaginatedSearchData]:
+        """Like ``search_iter``, but yield one PaginatedSearchData per page."""
+        search = self.document_search(ranking_variable, keywords, compact=True)
+        if search.response is None:
+            return
+        yield from iter_pages(
+            search.response.hits,
+            lambda page: self.paginated_search(page.paper_list(), keywords),
+            page_size=page_size,
+            limit=limit,
+            prefetch=prefetch,
+        )
+
     # ── PDF Import ──────────────────────────────────────────────────────
 
     def import_pdf(
@@ -63,7 +293,14 @@ class EndocClient:
         recursive: bool = False,
         max_file_mb: int = 50,
         batch_size: int = 10,
+        max_batch_mb: Optional[float] = None,
         include_references: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+        encode_workers: int = 1,
+        encode_in_processes: bool = False,
+        checkpoint: Optional[Union[str, Path, ImportCheckpoint]] = None,
+        projection: Optional[Projection] = None,
     ) -> ImportResult:
         """Upload PDFs to Endoc and return full paper data.
 
@@ -73,125 +310,137 @@ class EndocClient:
             folder       – a directory containing PDFs
             base64_list  – raw base64-encoded PDF strings
 
+        Encoding, uploading and fetching run as overlapping stages: the next
+        batch is encoded while the current one uploads, and uploaded papers
+        are fetched while later batches upload.
+
         Args:
             recursive:          Scan subfolders when using ``folder``.
             max_file_mb:        Skip files larger than this (MB).
             batch_size:         Upload in batches of this size.
+            max_batch_mb:       Also close a batch before its base64 payload
+                                exceeds this many MB. Peak memory is then
+                                about (prefetch_batches + 2) * max_batch_mb,
+                                whatever the folder size.
             include_references: If True, include reference papers matched
                                 by the NLP service. If False (default),
                                 only return the papers you uploaded
                                 (collection == "UserUploaded").
+            max_concurrency:    Number of papers fetched in parallel after
+                                upload. Use 1 to fetch one at a time.
+            prefetch_batches:   How many batches each stage may run ahead of
+                                the next one; bounds memory use.
+            encode_workers:     Read and base64-encode files on a pool of this
+                                many workers. Output order is unchanged.
+            encode_in_processes: Use processes instead of threads for the
+                                encode pool, to spread encoding over cores.
+            checkpoint:         Path of a checkpoint file (or an
+                                ``ImportCheckpoint``). Progress is saved per
+                                file after every batch; rerunning with the
+                                same checkpoint skips files already uploaded.
+            projection:         Fields fetched for each paper, as for
+                                ``single_paper`` (e.g. "metadata"). Fields
+                                not fetched stay empty in ImportedPaper.
 
         Returns:
-            ImportResult with .papers (list of ImportedPaper) containing
-            full paper data (title, authors, abstract, sections, etc.).
+            ImportResult with .papers (list of ImportedPaper, in upload order)
+            containing full paper data (title, authors, abstract, sections,
+            etc.) and .failures for papers whose data could not be fetched.
         """
-        # ── Validate input ──────────────────────────────────────────────
-        inputs = sum(x is not None for x in [path, paths, folder, base64_list])
-        if inputs == 0:
-            raise ValueError(
-                "Provide one of: path, paths, folder, or base64_list."
-            )
-        if inputs > 1:
-            raise ValueError(
-                "Provide only one of: path, paths, folder, or base64_list."
-            )
-
-        # ── Build base64 payloads ───────────────────────────────────────
-        if base64_list is not None:
-            encoded = base64_list
-        elif path is not None:
-            encoded = [self._encode_pdf(Path(path))]
-        elif paths is not None:
-            encoded = [self._encode_pdf(Path(p)) for p in paths]
-        else:
-            encoded = self._encode_folder(
-                Path(folder), recursive=recursive, max_file_mb=max_file_mb
-            )
-
-        if not encoded:
-            raise ValueError("No valid PDF files to upload.")
-
-        # ── Upload in batches ───────────────────────────────────────────
-        all_bookmarks = []
-        last_status = "success"
-        last_message = ""
-
-        for i in range(0, len(encoded), batch_size):
-            batch = encoded[i : i + batch_size]
-            result = self._pdf_import_service.import_pdf_with_api_key(batch)
-            last_status = result.status
-            last_message = result.message
-            if result.response:
-                all_bookmarks.extend(result.response)
-
-        # ── Filter ──────────────────────────────────────────────────────
-        if not include_references:
-            filtered = [
-                bk for bk in all_bookmarks
-                if bk.id_collection == "UserUploaded"
-            ]
-        else:
-            filtered = all_bookmarks
-
-        # ── Auto-fetch full paper data ──────────────────────────────────
-        papers = []
-        for bk in filtered:
-            try:
-                paper_data = self.single_paper(
-                    id_value=bk.id_value,
-                    collection=bk.id_collection,
-                    id_field=bk.id_field,
-                    id_type=bk.id_type,
-                )
-            except Exception:
-                paper_data = None
-
-            papers.append(
-                ImportedPaper.from_bookmark_and_paper(bk, paper_data)
-            )
+        pipeline, batches = self._build_import(
+            path, paths, folder, base64_list,
+            recursive=recursive,
+            max_file_mb=max_file_mb,
+            batch_size=batch_size,
+            max_batch_mb=max_batch_mb,
+            include_references=include_references,
+            max_concurrency=max_concurrency,
+            prefetch_batches=prefetch_batches,
+            encode_workers=encode_workers,
+            encode_in_processes=encode_in_processes,
+            checkpoint=checkpoint,
+            projection=projection,
+        )
+        papers = list(pipeline.run(batches, batch_size))
 
         return ImportResult(
-            status=last_status,
-            message=last_message,
+            status=pipeline.status,
+            message=pipeline.message,
             papers=papers,
-            bookmarks=all_bookmarks,
+            bookmarks=pipeline.bookmarks,
+            failures=pipeline.failures,
         )
 
-    # ── Private helpers ─────────────────────────────────────────────────
-
-    @staticmethod
-    def _encode_pdf(pdf_path: Path) -> str:
-        pdf_path = pdf_path.expanduser().resolve()
-        if not pdf_path.exists() or not pdf_path.is_file():
-            raise FileNotFoundError(f"PDF not found: {pdf_path}")
-        if pdf_path.suffix.lower() != ".pdf":
-            raise ValueError(f"Not a PDF file: {pdf_path}")
-        with pdf_path.open("rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-
-    @staticmethod
-    def _encode_folder(
-        folder: Path,
+    def iter_import_pdf(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        paths: Optional[List[Union[str, Path]]] = None,
+        folder: Optional[Union[str, Path]] = None,
+        base64_list: Optional[List[str]] = None,
+        *,
         recursive: bool = False,
         max_file_mb: int = 50,
-    ) -> List[str]:
-        folder = folder.expanduser().resolve()
-        if not folder.exists() or not folder.is_dir():
-            raise ValueError(f"Folder not found: {folder}")
-
-        pattern = "**/*.pdf" if recursive else "*.pdf"
-        pdf_paths = sorted(p for p in folder.glob(pattern) if p.is_file())
-        if not pdf_paths:
-            raise ValueError(f"No PDF files found in: {folder}")
-
-        encoded = []
-        for p in pdf_paths:
-            if p.stat().st_size / (1024 * 1024) > max_file_mb:
-                continue
-            with p.open("rb") as f:
-                encoded.append(base64.b64encode(f.read()).decode("utf-8"))
-        return encoded
+        batch_size: int = 10,
+        max_batch_mb: Optional[float] = None,
+        include_references: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+        encode_workers: int = 1,
+        encode_in_processes: bool = False,
+        checkpoint: Optional[Union[str, Path, ImportCheckpoint]] = None,
+        projection: Optional[Projection] = None,
+        ordered: bool = False,
+    ) -> Iterator[ImportedPaper]:
+        """Stream ``import_pdf``: yield each ImportedPaper as soon as it is ready.
+
+        Takes the same arguments as ``import_pdf``. Nothing is kept after a
+        paper is yielded, so memory stays flat however many files are
+        imported. Papers are yielded in completion order unless ``ordered``
+        is True. A paper whose full data could not be fetched carries the
+        reason in ``.error``. Breaking out of the loop stops further uploads.
+        With a ``checkpoint``, papers fetched by an earlier run are skipped.
+        """
+        pipeline, batches = self._build_import(
+            path, paths, folder, base64_list,
+            recursive=recursive,
+            max_file_mb=max_file_mb,
+            batch_size=batch_size,
+            max_batch_mb=max_batch_mb,
+            include_references=include_references,
+            max_concurrency=max_concurrency,
+            prefetch_batches=prefetch_batches,
+            encode_workers=encode_workers,
+            encode_in_processes=encode_in_processes,
+            checkpoint=checkpoint,
+            projection=projection,
+            collect_bookmarks=False,
+            skip_fetched=True,
+        )
+        return pipeline.run(batches, batch_size, ordered=ordered)
+
+    # ── Private helpers ─────────────────────────────────────────────────
+
+    def _build_import(self, *sources, projection=None, **options):
+        """Validate import inputs; return the pipeline and its batches."""
+        single_paper_query(projection)  # reject a bad projection before uploading
+        return build_import(
+            ImportPipeline,
+            *sources,
+            upload=self._pdf_import_service.import_pdf_with_api_key,
+            hydrate=functools.partial(self._fetch_bookmark, projection=projection),
+            cache=self._import_cache,
+            cache_namespace=_key_namespace(self._api_client._api_key),
+            **options,
+        )
+
+    def _fetch_bookmark(self, bk, projection=None):
+        return self.single_paper(
+            id_value=bk.id_value,
+            collection=bk.id_collection,
+            id_field=bk.id_field,
+            id_type=bk.id_type,
+            projection=projection,
+        )
 
     # ── Custom services ─────────────────────────────────────────────────
 
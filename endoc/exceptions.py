@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class EndocError(Exception):
     """Base error for all Endoc SDK exceptions."""
 
@@ -10,6 +13,22 @@ class PermissionError(EndocError):
 class RateLimitError(EndocError):
     """You are sending requests too quickly."""
 
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # seconds, from the Retry-After header
+
 class APIError(EndocError):
     """Non-auth server errors or malformed responses."""
-    
\ No newline at end of file
+
+    def __init__(
+        self,
+        message: str = "",
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class CircuitOpenError(APIError):
+    """The circuit breaker is open; the request was not sent."""
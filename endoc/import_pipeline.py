@@ -0,0 +1,717 @@
+import asyncio
+import base64
+import contextlib
+import hashlib
+import itertools
+import mmap
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .cache import ImportCheckpoint
+from .models.pdf_import import ImportFailure, ImportedBookmark, ImportedPaper
+
+DEFAULT_MAX_CONCURRENCY = 8  # parallel singlePaper fetches during import_pdf
+DEFAULT_PREFETCH_BATCHES = 2  # encoded batches buffered ahead of the upload
+
+_DONE = object()
+_POLL_INTERVAL = 0.1  # seconds between checks of the stop flag while blocked
+
+
+class _StageError:
+    """Carries an exception from a worker stage to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Entry:
+    """One source of a batch when the import cache is in use."""
+
+    __slots__ = ("digest", "payload", "bookmark")
+
+    def __init__(self, digest: str):
+        self.digest = digest
+        self.payload: Optional[str] = None
+        self.bookmark: Optional[ImportedBookmark] = None
+
+
+class _Finished:
+    """Sent by the upload stage once every paper has been submitted."""
+
+    def __init__(self, total: int):
+        self.total = total
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Blocking put that gives up once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Blocking get that returns _DONE once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _acquire(sem: threading.Semaphore, stop: threading.Event) -> bool:
+    """Blocking acquire that gives up once ``stop`` is set."""
+    while not stop.is_set():
+        if sem.acquire(timeout=_POLL_INTERVAL):
+            return True
+    return False
+
+
+class _PipelineBase:
+    """State and per-paper logic shared by the sync and async pipelines."""
+
+    def __init__(
+        self,
+        upload: Callable,
+        hydrate: Callable,
+        *,
+        encode: Optional[Callable[[Any], str]] = None,
+        include_references: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        prefetch_batches: int = DEFAULT_PREFETCH_BATCHES,
+        collect_bookmarks: bool = True,
+        encode_workers: int = 1,
+        encode_in_processes: bool = False,
+        cache=None,
+        checkpoint=None,
+        owns_checkpoint: bool = False,
+        digest: Optional[Callable[[Any], str]] = None,
+        cache_namespace: str = "",
+        skip_fetched: bool = False,
+    ):
+        if (cache is not None or checkpoint is not None) and digest is None:
+            raise ValueError("An import cache or checkpoint needs a digest function.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        if prefetch_batches < 1:
+            raise ValueError("prefetch_batches must be >= 1.")
+        if encode_workers < 1:
+            raise ValueError("encode_workers must be >= 1.")
+
+        self._upload = upload
+        self._hydrate = hydrate
+        self._encode = encode
+        self._include_references = include_references
+        self._max_concurrency = max_concurrency
+        self._prefetch_batches = prefetch_batches
+        self._collect_bookmarks = collect_bookmarks
+        self._encode_workers = encode_workers
+        self._encode_in_processes = encode_in_processes
+        self._encode_pool = None
+        # A checkpoint given as a path is opened when the run starts, so a
+        # pipeline that never runs holds no database connection.
+        self._checkpoint_source: Optional[Union[str, Path, ImportCheckpoint]] = checkpoint
+        self._checkpoint: Optional[ImportCheckpoint] = None
+        self._owns_checkpoint = owns_checkpoint
+        self._cache = cache
+        self._stores: List[Any] = []
+        self._digest = digest
+        self._cache_namespace = cache_namespace
+        self._skip_fetched = skip_fetched and checkpoint is not None
+        # Digests uploaded during this run, so repeated files upload once.
+        self._seen: Dict[str, ImportedBookmark] = {}
+        # Bookmark -> digest of the file it came from, until it is fetched.
+        self._sources: Dict[Tuple[str, str], str] = {}
+
+        self.status = "success"
+        self.message = ""
+        self.bookmarks: List[ImportedBookmark] = []
+        self.failures: List[ImportFailure] = []
+
+    def _open_encode_pool(self) -> None:
+        """Start the encode worker pool, if more than one worker is requested.
+
+        base64 encoding holds the GIL, so threads mainly overlap file I/O;
+        ``encode_in_processes`` spreads the CPU work over several cores at the
+        cost of sending each payload back to the parent process.
+        """
+        if self._encode is None or self._encode_workers == 1:
+            return
+        executor = ProcessPoolExecutor if self._encode_in_processes else ThreadPoolExecutor
+        self._encode_pool = executor(max_workers=self._encode_workers)
+
+    def _close_encode_pool(self) -> None:
+        if self._encode_pool is not None:
+            self._encode_pool.shutdown(wait=True)
+            self._encode_pool = None
+
+    def _open_stores(self) -> None:
+        checkpoint = self._checkpoint_source
+        if isinstance(checkpoint, (str, os.PathLike)):
+            checkpoint = ImportCheckpoint(checkpoint)
+            self._owns_checkpoint = True
+        self._checkpoint = checkpoint
+        self._stores = [store for store in (checkpoint, self._cache) if store is not None]
+
+    def _close_stores(self) -> None:
+        if self._owns_checkpoint and self._checkpoint is not None:
+            self._checkpoint.close()
+
+    def _map(self, fn: Callable, items: List[Any]) -> List[Any]:
+        if self._encode_pool is None:
+            return [fn(item) for item in items]
+        # map() keeps input order, so batches stay deterministic.
+        return list(self._encode_pool.map(fn, items))
+
+    def _encode_batch(self, batch: List[Any]) -> List[Any]:
+        if not self._stores:
+            return list(batch) if self._encode is None else self._map(self._encode, batch)
+
+        # Hash everything, but only encode the PDFs the stores do not know.
+        entries = [_Entry(d) for d in self._map(self._digest, batch)]
+        if self._skip_fetched:
+            kept = [
+                (entry, item) for entry, item in zip(entries, batch)
+                if self._checkpoint.state(entry.digest, self._cache_namespace) != "fetched"
+            ]
+            entries = [entry for entry, _ in kept]
+            batch = [item for _, item in kept]
+        misses = []
+        for entry, item in zip(entries, batch):
+            entry.bookmark = self._lookup(entry.digest)
+            if entry.bookmark is None:
+                misses.append((entry, item))
+        if misses:
+            items = [item for _, item in misses]
+            payloads = items if self._encode is None else self._map(self._encode, items)
+            for (entry, _), payload in zip(misses, payloads):
+                entry.payload = payload
+        return entries
+
+    def _lookup(self, digest: str) -> Optional[ImportedBookmark]:
+        for store in self._stores:
+            bookmark = store.get(digest, self._cache_namespace)
+            if bookmark is not None:
+                return bookmark
+        return None
+
+    def _pending(self, batch: List[Any]) -> Tuple[List[str], Optional[List[_Entry]]]:
+        """Return the payloads to upload and, with a cache, the entries they belong to."""
+        if not self._stores:
+            return batch, None
+        todo: Dict[str, _Entry] = {}
+        for entry in batch:
+            if entry.bookmark is None:
+                entry.bookmark = self._seen.get(entry.digest)
+            if entry.bookmark is None and entry.digest not in todo:
+                todo[entry.digest] = entry
+        uploaded = list(todo.values())
+        return [entry.payload for entry in uploaded], uploaded
+
+    def _record_upload(
+        self,
+        result,
+        batch: Optional[List[Any]] = None,
+        uploaded: Optional[List[_Entry]] = None,
+    ) -> List[ImportedBookmark]:
+        """Store the upload outcome and return the bookmarks to hydrate."""
+        received = []
+        if result is not None:
+            self.status = result.status
+            self.message = result.message
+            received = result.response or []
+
+        if uploaded is None:
+            if self._collect_bookmarks:
+                self.bookmarks.extend(received)
+            if self._include_references:
+                return received
+            return [bk for bk in received if bk.id_collection == "UserUploaded"]
+
+        own = [bk for bk in received if bk.id_collection == "UserUploaded"]
+        references = [bk for bk in received if bk.id_collection != "UserUploaded"]
+        cached = [entry.bookmark for entry in batch if entry.bookmark is not None]
+
+        # The server answers one UserUploaded bookmark per PDF, in upload
+        # order. If the counts disagree the mapping is unknown: skip caching.
+        if len(own) == len(uploaded):
+            for entry, bk in zip(uploaded, own):
+                self._seen[entry.digest] = bk
+                for store in self._stores:
+                    store.put(entry.digest, bk, self._cache_namespace)
+            for entry in batch:
+                if entry.bookmark is None:
+                    entry.bookmark = self._seen[entry.digest]
+            papers = [entry.bookmark for entry in batch]
+        else:
+            papers = cached + own
+
+        if self._checkpoint is not None:
+            for entry in batch:
+                if entry.bookmark is not None:
+                    self._sources[self._key(entry.bookmark)] = entry.digest
+
+        if self._collect_bookmarks:
+            self.bookmarks.extend(cached + received)
+        if self._include_references:
+            return papers + references
+        return papers
+
+    def _capacity(self, batch_size: int) -> int:
+        """Papers that may be submitted but not yet consumed."""
+        return max(batch_size * self._prefetch_batches, self._max_concurrency)
+
+    @staticmethod
+    def _key(bk: ImportedBookmark) -> Tuple[str, str]:
+        return bk.id_collection, bk.id_value
+
+    def _mark(self, bk: ImportedBookmark, state: str, error: Optional[str] = None) -> None:
+        """Record a fetch outcome in the checkpoint, for uploaded files only."""
+        digest = self._sources.pop(self._key(bk), None)
+        if digest is not None:
+            self._checkpoint.mark(digest, state, error, namespace=self._cache_namespace)
+
+    def _paper(self, bk: ImportedBookmark, paper_data=None, error: Optional[Exception] = None) -> ImportedPaper:
+        if error is None:
+            self._mark(bk, "fetched")
+            return ImportedPaper.from_bookmark_and_paper(bk, paper_data)
+        failure = ImportFailure.from_bookmark(bk, error)
+        self.failures.append(failure)
+        self._mark(bk, "failed", failure.error)
+        return ImportedPaper.from_bookmark_and_paper(bk, None, error=failure.error)
+
+
+class ImportPipeline(_PipelineBase):
+    """
+    Run the three import_pdf phases as overlapping stages:
+
+        encode (thread) ──► upload (thread) ──► hydrate (thread pool)
+
+    Batch N+1 is encoded while batch N uploads, and the bookmarks of batch N
+    are fetched while batch N+1 uploads. Bounded buffers between the stages
+    apply backpressure: the encoder stays at most ``prefetch_batches`` batches
+    ahead of the uploader, and the uploader pauses while that many batches of
+    papers are waiting to be consumed.
+
+    ``run`` yields ImportedPaper objects, in upload order or (``ordered=False``)
+    as soon as each one is ready; nothing is kept once a paper is yielded,
+    apart from the bookmark list when ``collect_bookmarks`` is set. After the
+    run, ``status``, ``message``, ``bookmarks`` and ``failures`` describe it.
+    An exception in the encode or upload stage stops the pipeline and is
+    re-raised in the consumer.
+
+    With a ``cache`` (see ``endoc.cache.ImportCache``) the encode stage
+    hashes each source with ``digest``; known PDFs skip encoding and upload
+    and their cached bookmark is hydrated directly. A ``checkpoint`` works
+    the same way and also records each fetch, so a rerun can resume;
+    ``skip_fetched`` drops files whose paper was already fetched. A
+    checkpoint given as a path is opened when ``run`` starts and closed
+    when it ends; pass ``owns_checkpoint`` to also close an
+    ImportCheckpoint object.
+    """
+
+    # ── Stages ──────────────────────────────────────────────────────────
+
+    def _encode_stage(self, batches, out_q: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    return
+                if not _put(out_q, self._encode_batch(batch), stop):
+                    return
+        except BaseException as e:
+            _put(out_q, _StageError(e), stop)
+            return
+        _put(out_q, _DONE, stop)
+
+    def _upload_stage(self, in_q, out_q, pool, outstanding, in_flight, ordered, stop) -> None:
+        total = 0
+        try:
+            while True:
+                batch = _get(in_q, stop)
+                if batch is _DONE:
+                    break
+                if isinstance(batch, _StageError):
+                    out_q.put(batch)
+                    return
+
+                payloads, uploaded = self._pending(batch)
+                result = self._upload(payloads) if payloads else None
+                for bk in self._record_upload(result, batch, uploaded):
+                    if not _acquire(outstanding, stop):
+                        return
+                    future = pool.submit(self._hydrate_one, bk)
+                    in_flight.add(future)
+                    future.add_done_callback(in_flight.discard)
+                    total += 1
+                    if ordered:
+                        out_q.put(future)
+                    else:
+                        future.add_done_callback(out_q.put)
+        except BaseException as e:
+            out_q.put(_StageError(e))
+            return
+        out_q.put(_Finished(total))
+
+    def _hydrate_one(self, bk: ImportedBookmark) -> ImportedPaper:
+        try:
+            paper_data = self._hydrate(bk)
+        except Exception as e:
+            return self._paper(bk, error=e)
+        return self._paper(bk, paper_data)
+
+    # ── Driver ──────────────────────────────────────────────────────────
+
+    def run(
+        self,
+        batches: Iterable[List[Any]],
+        batch_size: int,
+        *,
+        ordered: bool = True,
+    ) -> Iterator[ImportedPaper]:
+        """Process ``batches`` and yield each ImportedPaper."""
+        self._open_stores()
+        stop = threading.Event()
+        encoded_q: queue.Queue = queue.Queue(maxsize=self._prefetch_batches)
+        out_q: queue.Queue = queue.Queue()
+        outstanding = threading.Semaphore(self._capacity(batch_size))
+        in_flight = set()
+        pool = ThreadPoolExecutor(max_workers=self._max_concurrency)
+        self._open_encode_pool()
+
+        encoder = threading.Thread(
+            target=self._encode_stage, args=(batches, encoded_q, stop), daemon=True
+        )
+        uploader = threading.Thread(
+            target=self._upload_stage,
+            args=(encoded_q, out_q, pool, outstanding, in_flight, ordered, stop),
+            daemon=True,
+        )
+        encoder.start()
+        uploader.start()
+
+        try:
+            total = None
+            yielded = 0
+            while total is None or yielded < total:
+                item = out_q.get()
+                if isinstance(item, _Finished):
+                    total = item.total
+                    continue
+                if isinstance(item, _StageError):
+                    raise item.error
+                paper = item.result()
+                yielded += 1
+                outstanding.release()
+                yield paper
+        finally:
+            stop.set()
+            # Abandoned early: drop papers nobody will consume.
+            for future in list(in_flight):
+                future.cancel()
+            encoder.join()
+            uploader.join()
+            pool.shutdown(wait=True)
+            self._close_encode_pool()
+            self._close_stores()
+
+
+class AsyncImportPipeline(_PipelineBase):
+    """
+    Asyncio counterpart of ImportPipeline.
+
+    ``upload`` and ``hydrate`` are coroutine functions; ``encode`` is a plain
+    function run, together with pulling the next batch, on a reader thread
+    one batch ahead of the upload. At most ``max_concurrency`` hydrations
+    run at once. When the run ends or is abandoned, the reader thread and
+    encode pool are shut down off the event loop, and only then are the
+    stores closed.
+    """
+
+    async def _hydrate_one(self, bk: ImportedBookmark, semaphore: asyncio.Semaphore) -> ImportedPaper:
+        async with semaphore:
+            try:
+                paper_data = await self._hydrate(bk)
+            except Exception as e:
+                return self._paper(bk, error=e)
+        return self._paper(bk, paper_data)
+
+    async def _produce(self, batches, reader, out_q, outstanding, in_flight, ordered) -> None:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        total = 0
+
+        def encode_next(it):
+            # Pulling the next batch may list folders, so it runs off-loop too.
+            batch = next(it, None)
+            return None if batch is None else self._encode_batch(batch)
+
+        try:
+            it = iter(batches)
+            pending = asyncio.wrap_future(reader.submit(encode_next, it))
+            while True:
+                encoded = await pending
+                if encoded is None:
+                    break
+                pending = asyncio.wrap_future(reader.submit(encode_next, it))
+                payloads, uploaded = self._pending(encoded)
+                result = await self._upload(payloads) if payloads else None
+                for bk in self._record_upload(result, encoded, uploaded):
+                    await outstanding.acquire()
+                    task = asyncio.ensure_future(self._hydrate_one(bk, semaphore))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                    total += 1
+                    if ordered:
+                        out_q.put_nowait(task)
+                    else:
+                        task.add_done_callback(out_q.put_nowait)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            out_q.put_nowait(_StageError(e))
+            return
+        out_q.put_nowait(_Finished(total))
+
+    async def run(
+        self,
+        batches: Iterable[List[Any]],
+        batch_size: int,
+        *,
+        ordered: bool = True,
+    ) -> AsyncIterator[ImportedPaper]:
+        """Process ``batches`` and yield each ImportedPaper."""
+        self._open_stores()
+        out_q: asyncio.Queue = asyncio.Queue()
+        outstanding = asyncio.Semaphore(self._capacity(batch_size))
+        in_flight = set()
+        self._open_encode_pool()
+        reader = ThreadPoolExecutor(max_workers=1)
+        producer = asyncio.ensure_future(
+            self._produce(batches, reader, out_q, outstanding, in_flight, ordered)
+        )
+
+        try:
+            total = None
+            yielded = 0
+            while total is None or yielded < total:
+                item = await out_q.get()
+                if isinstance(item, _Finished):
+                    total = item.total
+                    continue
+                if isinstance(item, _StageError):
+                    raise item.error
+                paper = await item
+                yielded += 1
+                outstanding.release()
+                yield paper
+        finally:
+            producer.cancel()
+            tasks = list(in_flight)
+            for task in tasks:
+                task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # A batch may still be encoding on the reader thread; wait for it
+            # without blocking the loop before the stores it reads are closed.
+            await asyncio.get_running_loop().run_in_executor(None, self._shutdown_workers, reader)
+            self._close_stores()
+
+    def _shutdown_workers(self, reader: ThreadPoolExecutor) -> None:
+        reader.shutdown(wait=True)
+        self._close_encode_pool()
+
+
+# ── Sources ─────────────────────────────────────────────────────────────
+#
+# Setup shared by EndocClient and AsyncEndocClient: validate the import_pdf
+# inputs, list the sources, and build a pipeline over their batches.
+
+
+def build_import(
+    pipeline_cls,
+    path=None,
+    paths=None,
+    folder=None,
+    base64_list=None,
+    *,
+    upload: Callable,
+    hydrate: Callable,
+    recursive: bool = False,
+    max_file_mb: int = 50,
+    batch_size: int = 10,
+    max_batch_mb: Optional[float] = None,
+    **options,
+):
+    """
+    Validate the import_pdf inputs and return ``(pipeline, batches)``.
+
+    ``pipeline_cls`` is ImportPipeline or AsyncImportPipeline; ``options``
+    are passed on to it (include_references, checkpoint, cache, ...).
+    Sources are encoded with ``encode_source`` and keyed with
+    ``digest_source``. No file is read here.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1.")
+    if max_batch_mb is not None and max_batch_mb <= 0:
+        raise ValueError("max_batch_mb must be > 0.")
+    max_batch_bytes = int(max_batch_mb * 1024 * 1024) if max_batch_mb else None
+
+    sources = collect_sources(
+        path, paths, folder, base64_list,
+        recursive=recursive, max_file_mb=max_file_mb,
+    )
+    pipeline = pipeline_cls(
+        upload=upload,
+        hydrate=hydrate,
+        encode=encode_source,
+        digest=digest_source,
+        **options,
+    )
+    return pipeline, iter_batches(sources, batch_size, max_batch_bytes)
+
+
+def collect_sources(
+    path=None,
+    paths=None,
+    folder=None,
+    base64_list=None,
+    *,
+    recursive: bool = False,
+    max_file_mb: int = 50,
+) -> Iterable[Union[Path, str]]:
+    """Validate the import_pdf inputs without reading any file.
+
+    Returns resolved PDF paths, or the base64 strings as given. Folder
+    paths are listed up front, but no file is read until its batch is
+    encoded.
+    """
+    inputs = sum(x is not None for x in [path, paths, folder, base64_list])
+    if inputs == 0:
+        raise ValueError(
+            "Provide one of: path, paths, folder, or base64_list."
+        )
+    if inputs > 1:
+        raise ValueError(
+            "Provide only one of: path, paths, folder, or base64_list."
+        )
+
+    if base64_list is not None:
+        sources = list(base64_list)
+    elif path is not None:
+        sources = [resolve_pdf(Path(path))]
+    elif paths is not None:
+        sources = [resolve_pdf(Path(p)) for p in paths]
+    else:
+        found = iter_folder(Path(folder), recursive=recursive)
+        first = next(found, None)
+        if first is None:
+            raise ValueError(f"No PDF files found in: {Path(folder).expanduser().resolve()}")
+        sources = (
+            p for p in itertools.chain([first], found)
+            if p.stat().st_size / (1024 * 1024) <= max_file_mb
+        )
+
+    sources = iter(sources)
+    first = next(sources, None)
+    if first is None:
+        raise ValueError("No valid PDF files to upload.")
+    return itertools.chain([first], sources)
+
+
+def iter_batches(
+    sources: Iterable[Union[Path, str]],
+    batch_size: int,
+    max_batch_bytes: Optional[int] = None,
+) -> Iterator[List[Union[Path, str]]]:
+    """Group sources into upload batches.
+
+    A batch closes at ``batch_size`` items or, when ``max_batch_bytes``
+    is set, before its encoded size would exceed that budget. A single
+    source larger than the budget is sent on its own.
+    """
+    batch: List[Union[Path, str]] = []
+    batch_bytes = 0
+    for source in sources:
+        size = _encoded_size(source) if max_batch_bytes else 0
+        if batch and (
+            len(batch) >= batch_size
+            or (max_batch_bytes and batch_bytes + size > max_batch_bytes)
+        ):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(source)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def _encoded_size(source: Union[Path, str]) -> int:
+    """Size of the base64 payload for a source, without reading it."""
+    if isinstance(source, Path):
+        return 4 * ((source.stat().st_size + 2) // 3)
+    return len(source)
+
+
+def encode_source(source: Union[Path, str]) -> str:
+    if isinstance(source, Path):
+        return encode_pdf(source)
+    return source
+
+
+def digest_source(source: Union[Path, str]) -> str:
+    """SHA-256 of the PDF bytes behind a source, used as import cache key."""
+    if isinstance(source, str):
+        return hashlib.sha256(base64.b64decode(source)).hexdigest()
+    pdf_path = resolve_pdf(source)
+    digest = hashlib.sha256()
+    with pdf_path.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        except (ValueError, OSError):
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def resolve_pdf(pdf_path: Path) -> Path:
+    pdf_path = pdf_path.expanduser().resolve()
+    if not pdf_path.exists() or not pdf_path.is_file():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    if pdf_path.suffix.lower() != ".pdf":
+        raise ValueError(f"Not a PDF file: {pdf_path}")
+    return pdf_path
+
+
+def encode_pdf(pdf_path: Path) -> str:
+    pdf_path = resolve_pdf(pdf_path)
+    with pdf_path.open("rb") as f:
+        try:
+            # Encode straight from the page cache instead of copying the
+            # file into a bytes object first.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return base64.b64encode(mm).decode("ascii")
+        except (ValueError, OSError):
+            # Empty files and some file systems cannot be mapped.
+            return base64.b64encode(f.read()).decode("ascii")
+
+
+def iter_folder(folder: Path, recursive: bool = False) -> Iterator[Path]:
+    """Yield the PDFs in a folder in sorted path order.
+
+    Only paths are listed up front; files are read later, batch by batch.
+    """
+    folder = folder.expanduser().resolve()
+    if not folder.exists() or not folder.is_dir():
+        raise ValueError(f"Folder not found: {folder}")
+
+    pattern = "**/*.pdf" if recursive else "*.pdf"
+    return iter(sorted(p for p in folder.glob(pattern) if p.is_file()))
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+# orjson (``pip install 'endoc[fast]'``) decodes large singlePaper and
+# paginatedSearch responses several times faster than the stdlib and works on
+# bytes directly; without it everything falls back to ``json``.
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON. Key order follows the input (not sorted)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """``dumps`` as text, for APIs that want a str (gql's json_serialize)."""
+    return dumps(obj).decode("utf-8")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class DocumentSearchStats(BaseModel):
@@ -20,4 +20,17 @@ class DocumentSearchResponseBody(BaseModel):
 class DocumentSearchData(BaseModel):
     status: str
     message: str
-    response: Optional[DocumentSearchResponseBody] = None
\ No newline at end of file
+    response: Optional[DocumentSearchResponseBody] = None
+class SearchStage(BaseModel):
+    """
+    One narrowing step of a multi-stage document_search: the ``top_k`` best
+    hits of the previous stage are searched again, restricted to those
+    papers. Fields left None reuse the previous stage's values.
+    """
+    top_k: int = Field(ge=1)
+    ranking_variable: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    ranking_collection: Optional[str] = None
+    ranking_id_field: Optional[str] = None
+    ranking_id_value: Optional[str] = None
+    ranking_id_type: Optional[str] = None
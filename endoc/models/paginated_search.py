@@ -31,7 +31,15 @@ class PaginatedSearchResponseBody(BaseModel):
     id_int: int
     relevant_sentences: List[str]
 
+class PaginatedSearchFailure(BaseModel):
+    """A chunk of a chunked paginated_search whose request failed."""
+
+    start: int  # index in paper_list of the chunk's first paper
+    size: int
+    error: str
+
 class PaginatedSearchData(BaseModel):
     status: str
     message: str
-    response: List[PaginatedSearchResponseBody]
\ No newline at end of file
+    response: List[PaginatedSearchResponseBody]
+    failures: List[PaginatedSearchFailure] = []
\ No newline at end of file
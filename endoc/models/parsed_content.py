@@ -0,0 +1,127 @@
+from collections.abc import Sequence
+from typing import Any, Iterator, List, Optional, Union
+
+from pydantic import BaseModel
+from pydantic_core import core_schema
+
+from .. import json_codec
+
+
+class CiteSpan(BaseModel):
+    start: Optional[int] = None
+    end: Optional[int] = None
+    text: Optional[str] = None
+    ref_id: Optional[str] = None
+
+class Sentence(BaseModel):
+    sentence_id: Optional[str] = None
+    sentence_text: str = ""
+    sentence_similarity: Optional[float] = None
+    cite_spans: Optional[List[CiteSpan]] = None
+
+class Paragraph(BaseModel):
+    paragraph_id: Optional[str] = None
+    paragraph_text: List[Sentence] = []
+
+class Section(BaseModel):
+    section_id: Optional[str] = None
+    section_title: Optional[str] = None
+    section_text: List[Paragraph] = []
+
+
+class ParsedContent(Sequence):
+    """
+    Lazy view over parsed sections (``Abstract_Parsed``, ``Fullbody_Parsed``).
+
+    Model validation stores the decoded list as is, without walking it, and
+    raw JSON bytes are only decoded on first access. Indexing and iteration
+    give the plain section dicts, as before; ``iter_sections()`` and
+    ``iter_sentences()`` build typed Section / Sentence objects one at a
+    time, only for what is read.
+    """
+
+    __slots__ = ("_items", "_raw")
+
+    def __init__(self, items: Union[List[dict], bytes, str, None] = None):
+        if isinstance(items, (bytes, bytearray, str)):
+            self._items: Optional[List[dict]] = None
+            self._raw: Optional[Union[bytes, str]] = items
+        else:
+            self._items = items if isinstance(items, list) else list(items or ())
+            self._raw = None
+
+    @classmethod
+    def from_json(cls, raw: Union[bytes, str]) -> "ParsedContent":
+        """Wrap a JSON array of sections; it is decoded on first access."""
+        return cls(raw)
+
+    @property
+    def raw(self) -> List[dict]:
+        """The section dicts as returned by the API."""
+        if self._items is None:
+            self._items = json_codec.loads(self._raw) or []
+            self._raw = None
+        return self._items
+
+    def __getitem__(self, index):
+        return self.raw[index]
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ParsedContent):
+            return self.raw == other.raw
+        if isinstance(other, list):
+            return self.raw == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        if self._items is None:
+            return f"ParsedContent(<{len(self._raw)} bytes of JSON>)"
+        return f"ParsedContent(<{len(self._items)} sections>)"
+
+    def section(self, index: int) -> Section:
+        return Section.model_validate(self.raw[index])
+
+    def iter_sections(self) -> Iterator[Section]:
+        for item in self.raw:
+            yield Section.model_validate(item)
+
+    def iter_sentences(self) -> Iterator[Sentence]:
+        """Every sentence, in reading order, without building whole sections."""
+        for section in self.raw:
+            for paragraph in section.get("section_text") or []:
+                for sentence in paragraph.get("paragraph_text") or []:
+                    yield Sentence.model_validate(sentence)
+
+    def text(self, separator: str = " ") -> str:
+        return separator.join(
+            sentence.get("sentence_text") or ""
+            for section in self.raw
+            for paragraph in section.get("section_text") or []
+            for sentence in paragraph.get("paragraph_text") or []
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: value.raw),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        # Validation is a plain function, so describe the raw form: a list of section objects.
+        return handler(core_schema.list_schema(core_schema.dict_schema()))
+
+    @classmethod
+    def _validate(cls, value: Any) -> "ParsedContent":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, (list, tuple, bytes, bytearray, str)) or value is None:
+            return cls(value)
+        raise ValueError(f"Expected a list of sections, got {type(value).__name__}.")
@@ -1,10 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Union
 
+from .parsed_content import ParsedContent
 from .single_paper import (
     Author,
     PublicationDate,
     PaperReference,
+    PartialPaperReference,
     SinglePaperContent,
 )
 
@@ -38,17 +40,26 @@ class ImportedPaper(BaseModel):
     doi: str = ""
     abstract: str = ""
     fullbody: str = ""
-    sections: List[dict] = []
-    references: List[PaperReference] = []
+    sections: ParsedContent = ParsedContent()
+    references: List[Union[PaperReference, PartialPaperReference]] = []
+
+    # Set when the full paper data could not be fetched
+    error: Optional[str] = None
 
     @classmethod
-    def from_bookmark_and_paper(cls, bookmark: ImportedBookmark, paper_data=None):
+    def from_bookmark_and_paper(
+        cls,
+        bookmark: ImportedBookmark,
+        paper_data=None,
+        error: Optional[str] = None,
+    ):
         """Build an ImportedPaper from a bookmark and optional full paper data."""
         base = {
             "id_value": bookmark.id_value,
             "id_field": bookmark.id_field,
             "id_type": bookmark.id_type,
             "collection": bookmark.id_collection,
+            "error": error,
         }
 
         if paper_data and paper_data.response:
@@ -62,13 +73,34 @@ class ImportedPaper(BaseModel):
                 doi=r.DOI or "",
                 abstract=(content.Abstract or "") if content else "",
                 fullbody=(content.Fullbody or "") if content else "",
-                sections=(content.Fullbody_Parsed or []) if content else [],
+                # Shared, not copied: sections are decoded only when read.
+                sections=content.Fullbody_Parsed if content and content.Fullbody_Parsed is not None else ParsedContent(),
                 references=r.Reference or [],
             )
 
         return cls(**base)
 
 
+class ImportFailure(BaseModel):
+    """A paper whose full data could not be fetched after upload."""
+
+    id_value: str
+    id_field: str
+    id_type: str
+    collection: str
+    error: str
+
+    @classmethod
+    def from_bookmark(cls, bookmark: ImportedBookmark, error: Exception):
+        return cls(
+            id_value=bookmark.id_value,
+            id_field=bookmark.id_field,
+            id_type=bookmark.id_type,
+            collection=bookmark.id_collection,
+            error=f"{type(error).__name__}: {error}",
+        )
+
+
 class ImportResult(BaseModel):
     """Result of an import_pdf() call with full paper data."""
 
@@ -76,6 +108,7 @@ class ImportResult(BaseModel):
     message: str
     papers: List[ImportedPaper] = []
     bookmarks: List[ImportedBookmark] = []
+    failures: List[ImportFailure] = []
 
 
 # Keep for backward compatibility with PDFImportService internals
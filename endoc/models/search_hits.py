@@ -0,0 +1,299 @@
+import heapq
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from pydantic_core import core_schema
+
+from .document_search import DocumentSearchStats, PaperMetadata
+
+try:
+    import numpy as np
+except ImportError:  # optional: columns fall back to array('d')
+    np = None
+
+SCORE_COLUMNS = ("reranking", "prefetching")
+
+Scores = Any  # numpy.ndarray when NumPy is installed, else array('d')
+
+
+def _column(values: Iterable[Optional[float]], size: int) -> Scores:
+    """Float column of exactly ``size`` entries; missing scores are NaN."""
+    values = [math.nan if v is None else float(v) for v in values][:size]
+    values.extend([math.nan] * (size - len(values)))
+    return np.array(values, dtype=np.float64) if np is not None else array("d", values)
+
+
+def _take(column: Scores, indices: List[int]) -> Scores:
+    if np is not None:
+        return column[np.asarray(indices, dtype=np.intp)]
+    return array("d", (column[i] for i in indices))
+
+
+def _ranked(scores: Scores, k: Optional[int] = None) -> List[int]:
+    """Indices of the ``k`` highest scores (all if None), best first; NaN last."""
+    n = len(scores)
+    k = n if k is None else max(0, min(k, n))
+    if np is not None:
+        keys = np.where(np.isnan(scores), -np.inf, scores)
+        if k < n:
+            part = np.argpartition(-keys, k - 1)[:k] if k else np.empty(0, dtype=np.intp)
+            return part[np.argsort(-keys[part], kind="stable")].tolist()
+        return np.argsort(-keys, kind="stable").tolist()
+    keys = [-math.inf if math.isnan(s) else s for s in scores]
+    if k < n:
+        return heapq.nlargest(k, range(n), key=keys.__getitem__)
+    return sorted(range(n), key=keys.__getitem__, reverse=True)
+
+
+def _min_max(scores: Scores) -> Scores:
+    """Scale to [0, 1]; a constant column becomes all ones."""
+    if np is not None:
+        if not len(scores) or np.isnan(scores).all():
+            return scores.copy()
+        low, high = np.nanmin(scores), np.nanmax(scores)
+        if high == low:
+            return np.where(np.isnan(scores), np.nan, 1.0)
+        return (scores - low) / (high - low)
+    finite = [s for s in scores if not math.isnan(s)]
+    if not finite:
+        return array("d", scores)
+    low, high = min(finite), max(finite)
+    span = high - low
+    return array("d", (s if math.isnan(s) else (1.0 if not span else (s - low) / span) for s in scores))
+
+
+class Hit:
+    """One row of a SearchHits; reads the columns, holds no data of its own."""
+
+    __slots__ = ("_hits", "_index")
+
+    def __init__(self, hits: "SearchHits", index: int):
+        self._hits = hits
+        self._index = index
+
+    collection = property(lambda self: self._hits.collection[self._index])
+    id_field = property(lambda self: self._hits.id_field[self._index])
+    id_type = property(lambda self: self._hits.id_type[self._index])
+    id_value = property(lambda self: self._hits.id_value[self._index])
+    reranking_score = property(lambda self: float(self._hits.reranking_scores[self._index]))
+    prefetching_score = property(lambda self: float(self._hits.prefetching_scores[self._index]))
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        """Identity of the paper, as compared by PaperMetadata."""
+        hits, i = self._hits, self._index
+        return hits.collection[i], hits.id_field[i], hits.id_type[i], hits.id_value[i]
+
+    @property
+    def paper(self) -> PaperMetadata:
+        return PaperMetadata(**self.as_dict())
+
+    def as_dict(self) -> Dict[str, str]:
+        """The paper as a MetadataInput dict, e.g. for paginated_search."""
+        collection, id_field, id_type, id_value = self.key
+        return {"collection": collection, "id_field": id_field, "id_type": id_type, "id_value": id_value}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Hit):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"Hit({self.collection}/{self.id_value}, reranking={self.reranking_score:.4g})"
+
+
+class SearchHits(Sequence):
+    """
+    Column-oriented document_search hits.
+
+    Paper identifiers are kept as lists of interned strings (collection,
+    id_field and id_type repeat across hits, so each distinct value is stored
+    once) and scores as float columns: NumPy arrays when NumPy is installed,
+    ``array('d')`` otherwise. Missing scores are NaN. Indexing returns a
+    slotted Hit view; ``top_k``, ``above`` and ``fuse`` work on whole
+    columns and return new SearchHits or score columns.
+    """
+
+    __slots__ = ("collection", "id_field", "id_type", "id_value", "reranking_scores", "prefetching_scores")
+
+    def __init__(
+        self,
+        collection: List[str],
+        id_field: List[str],
+        id_type: List[str],
+        id_value: List[str],
+        reranking_scores: Iterable[Optional[float]] = (),
+        prefetching_scores: Iterable[Optional[float]] = (),
+    ):
+        size = len(id_value)
+        if not len(collection) == len(id_field) == len(id_type) == size:
+            raise ValueError("Identifier columns must have the same length.")
+        self.collection = collection
+        self.id_field = id_field
+        self.id_type = id_type
+        self.id_value = id_value
+        self.reranking_scores = _column(reranking_scores, size)
+        self.prefetching_scores = _column(prefetching_scores, size)
+
+    @classmethod
+    def from_papers(
+        cls,
+        papers: Iterable[Union[PaperMetadata, Dict[str, Any]]],
+        reranking_scores: Iterable[Optional[float]] = (),
+        prefetching_scores: Iterable[Optional[float]] = (),
+    ) -> "SearchHits":
+        intern = sys.intern
+        columns: Tuple[List[str], ...] = ([], [], [], [])
+        for paper in papers:
+            if not isinstance(paper, dict):
+                paper = paper.__dict__
+            columns[0].append(intern(paper["collection"]))
+            columns[1].append(intern(paper["id_field"]))
+            columns[2].append(intern(paper["id_type"]))
+            columns[3].append(str(paper["id_value"]))
+        return cls(*columns, reranking_scores, prefetching_scores)
+
+    @classmethod
+    def from_response(cls, body: Dict[str, Any]) -> "SearchHits":
+        """Build from a raw documentSearch ``response`` block."""
+        return cls.from_papers(
+            body.get("paper_list") or [],
+            body.get("reranking_scores") or [],
+            body.get("prefetching_scores") or [],
+        )
+
+    # ── Sequence ────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.id_value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SearchHits index out of range")
+        return Hit(self, index)
+
+    def __repr__(self) -> str:
+        return f"SearchHits(<{len(self)} hits>)"
+
+    # ── Columns ─────────────────────────────────────────────────────────
+
+    def scores(self, by: Union[str, Scores] = "reranking") -> Scores:
+        """A score column by name ("reranking" or "prefetching"), or ``by`` itself."""
+        if isinstance(by, str):
+            if by not in SCORE_COLUMNS:
+                raise ValueError(f"Unknown score column {by!r}; use one of {SCORE_COLUMNS}.")
+            return getattr(self, f"{by}_scores")
+        if len(by) != len(self):
+            raise ValueError("A score column needs one value per hit.")
+        return by
+
+    def keys(self) -> List[Tuple[str, str, str, str]]:
+        return list(zip(self.collection, self.id_field, self.id_type, self.id_value))
+
+    def paper_list(self) -> List[Dict[str, str]]:
+        """MetadataInput dicts for every hit, e.g. for paginated_search."""
+        return [
+            {"collection": c, "id_field": f, "id_type": t, "id_value": v}
+            for c, f, t, v in zip(self.collection, self.id_field, self.id_type, self.id_value)
+        ]
+
+    def take(self, indices: Iterable[int]) -> "SearchHits":
+        """The hits at ``indices``, in that order."""
+        indices = list(indices)
+        hits = SearchHits.__new__(SearchHits)
+        hits.collection = [self.collection[i] for i in indices]
+        hits.id_field = [self.id_field[i] for i in indices]
+        hits.id_type = [self.id_type[i] for i in indices]
+        hits.id_value = [self.id_value[i] for i in indices]
+        hits.reranking_scores = _take(self.reranking_scores, indices)
+        hits.prefetching_scores = _take(self.prefetching_scores, indices)
+        return hits
+
+    # ── Vectorized operations ───────────────────────────────────────────
+
+    def top_k(self, k: int, by: Union[str, Scores] = "reranking") -> "SearchHits":
+        """The ``k`` best hits by a score column, best first (NaN scores last)."""
+        return self.take(_ranked(self.scores(by), k))
+
+    def sorted(self, by: Union[str, Scores] = "reranking") -> "SearchHits":
+        return self.take(_ranked(self.scores(by)))
+
+    def above(self, threshold: float, by: Union[str, Scores] = "reranking") -> "SearchHits":
+        """Hits whose score is at least ``threshold``, in their current order."""
+        scores = self.scores(by)
+        if np is not None:
+            return self.take(np.flatnonzero(np.asarray(scores) >= threshold).tolist())
+        return self.take(i for i, s in enumerate(scores) if s >= threshold)
+
+    def fuse(self, weights: Optional[Dict[str, float]] = None, *, normalize: bool = True) -> Scores:
+        """
+        Weighted sum of score columns, e.g. ``{"reranking": 0.7, "prefetching": 0.3}``
+        (the default). With ``normalize``, each column is min-max scaled first
+        so the weights are comparable. A NaN score counts as 0.
+        """
+        weights = weights or {"reranking": 0.7, "prefetching": 0.3}
+        columns = [(_min_max(self.scores(name)) if normalize else self.scores(name), w) for name, w in weights.items()]
+        if np is not None:
+            fused = np.zeros(len(self), dtype=np.float64)
+            for column, weight in columns:
+                fused += weight * np.nan_to_num(column, nan=0.0)
+            return fused
+        return array("d", (
+            sum(w * (0.0 if math.isnan(column[i]) else column[i]) for column, w in columns)
+            for i in range(len(self))
+        ))
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda hits: {
+                    "paper_list": hits.paper_list(),
+                    "reranking_scores": [float(s) for s in hits.reranking_scores],
+                    "prefetching_scores": [float(s) for s in hits.prefetching_scores],
+                }
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        # Validation is a plain function, so describe the serialized form.
+        float_list = core_schema.list_schema(core_schema.float_schema())
+        return handler(core_schema.typed_dict_schema({
+            "paper_list": core_schema.typed_dict_field(core_schema.list_schema(core_schema.dict_schema())),
+            "reranking_scores": core_schema.typed_dict_field(float_list),
+            "prefetching_scores": core_schema.typed_dict_field(float_list),
+        }))
+
+    @classmethod
+    def _validate(cls, value: Any) -> "SearchHits":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls.from_response(value)
+        raise ValueError(f"Expected SearchHits or a documentSearch response, got {type(value).__name__}.")
+
+
+class CompactDocumentSearchBody(BaseModel):
+    search_stats: DocumentSearchStats
+    hits: SearchHits
+
+
+class CompactDocumentSearchData(BaseModel):
+    """document_search result with hits stored as columns (``compact=True``)."""
+
+    status: str
+    message: str
+    response: Optional[CompactDocumentSearchBody] = None
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, field_validator
 from typing import List, Optional
 
+from .parsed_content import ParsedContent
+
 class Author(BaseModel):
     FamilyName: str
     GivenName: str
@@ -33,8 +35,8 @@ class PaperReference(BaseModel):
 
 class SinglePaperContent(BaseModel):
     Abstract: str
-    Abstract_Parsed: List[dict]
-    Fullbody_Parsed: List[dict]
+    Abstract_Parsed: ParsedContent
+    Fullbody_Parsed: ParsedContent
     Fullbody: str
 
 class SinglePaperResponseBody(BaseModel):
@@ -51,4 +53,42 @@ class SinglePaperResponseBody(BaseModel):
 class SinglePaperData(BaseModel):
     status: str
     message: str
-    response: Optional[SinglePaperResponseBody] = None
\ No newline at end of file
+    response: Optional[SinglePaperResponseBody] = None
+
+# Returned when single_paper is called with a projection: only the selected
+# fields are filled in, everything else is None.
+
+# Aliases keep field names from shadowing the model classes in annotations.
+_OptionalAuthors = Optional[List[Author]]
+_OptionalDate = Optional[PublicationDate]
+_OptionalPaperID = Optional[PaperID]
+
+class PartialPaperReference(BaseModel):
+    Title: Optional[str] = None
+    Author: _OptionalAuthors = None
+    Venue: Optional[str] = None
+    PublicationDate: _OptionalDate = None
+    ReferenceText: Optional[str] = None
+    PaperID: _OptionalPaperID = None
+
+class PartialPaperContent(BaseModel):
+    Abstract: Optional[str] = None
+    Abstract_Parsed: Optional[ParsedContent] = None
+    Fullbody_Parsed: Optional[ParsedContent] = None
+    Fullbody: Optional[str] = None
+
+class PartialPaperResponseBody(BaseModel):
+    _id: str
+    id_int: Optional[int] = None
+    DOI: Optional[str] = None
+    Title: Optional[str] = None
+    Content: Optional[PartialPaperContent] = None
+    Author: _OptionalAuthors = None
+    Venue: Optional[str] = None
+    PublicationDate: _OptionalDate = None
+    Reference: Optional[List[PartialPaperReference]] = None
+
+class PartialSinglePaperData(BaseModel):
+    status: str
+    message: str
+    response: Optional[PartialPaperResponseBody] = None
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Union
+
+from gql import gql
+from graphql import FieldNode
+
+from .queries import SINGLE_PAPER_QUERY
+
+Projection = Union[str, Iterable[str]]
+
+FULL = "full"
+
+# Presets for single_paper; "full" keeps SINGLE_PAPER_QUERY unchanged.
+PRESETS: Dict[str, FrozenSet[str]] = {
+    "metadata": frozenset({"id_int", "DOI", "Title", "Author", "Venue", "PublicationDate"}),
+    "abstract": frozenset({
+        "id_int", "DOI", "Title", "Author", "Venue", "PublicationDate",
+        "Content.Abstract", "Content.Abstract_Parsed",
+    }),
+}
+
+# Small objects that are always selected whole.
+_WHOLE = frozenset({"Author", "PublicationDate", "PaperID"})
+
+
+def _tree(selection_set) -> Optional[dict]:
+    if selection_set is None:
+        return None
+    return {
+        node.name.value: _tree(node.selection_set)
+        for node in selection_set.selections
+        if isinstance(node, FieldNode)
+    }
+
+
+def _response_tree() -> dict:
+    document = getattr(SINGLE_PAPER_QUERY, "document", SINGLE_PAPER_QUERY)
+    field = document.definitions[0].selection_set.selections[0]
+    return _tree(field.selection_set)["response"]
+
+
+_RESPONSE_FIELDS = _response_tree()
+
+
+def normalize(projection: Optional[Projection]) -> Optional[FrozenSet[str]]:
+    """
+    Return the field paths selected by ``projection``, or None for the full
+    document. Paths are response fields, dotted to select part of an object
+    (``"Content.Abstract"``, ``"Reference.Title"``). Raises ValueError for an
+    unknown preset or field.
+    """
+    if projection is None or projection == FULL:
+        return None
+    if isinstance(projection, str):
+        try:
+            return PRESETS[projection]
+        except KeyError:
+            raise ValueError(
+                f"Unknown projection {projection!r}; use one of "
+                f"{sorted([FULL, *PRESETS])} or a set of field names."
+            ) from None
+
+    fields = frozenset(projection)
+    if not fields:
+        raise ValueError("A projection needs at least one field.")
+    for path in fields:
+        node: Optional[dict] = _RESPONSE_FIELDS
+        parts = path.split(".")
+        for depth, part in enumerate(parts):
+            if node is None or part not in node:
+                raise ValueError(f"Unknown single_paper field {path!r}.")
+            if part in _WHOLE and depth < len(parts) - 1:
+                raise ValueError(f"{part!r} is always selected whole; use {'.'.join(parts[:depth + 1])!r}.")
+            node = node[part]
+    return fields
+
+
+def _select(fields: FrozenSet[str]) -> dict:
+    """Subtree of the full response selection covering ``fields``."""
+    selected: dict = {"_id": None}
+    for path in sorted(fields):
+        parts = path.split(".")
+        if any(".".join(parts[:i]) in fields for i in range(1, len(parts))):
+            continue  # an enclosing object is selected whole
+        source, target = _RESPONSE_FIELDS, selected
+        for part in parts[:-1]:
+            source = source[part]
+            target = target.setdefault(part, {})
+        target[parts[-1]] = source[parts[-1]]
+    return selected
+
+
+def _render(tree: dict, indent: int) -> str:
+    pad = " " * indent
+    lines = []
+    for name, child in tree.items():
+        if child is None:
+            lines.append(f"{pad}{name}")
+        else:
+            lines.append(f"{pad}{name} {{\n{_render(child, indent + 4)}\n{pad}}}")
+    return "\n".join(lines)
+
+
+def _operation_name(fields: FrozenSet[str]) -> str:
+    # utils.base_operation_name maps these names back to singlePaper for
+    # per-operation rate limits; keep the two in step.
+    for name, preset in PRESETS.items():
+        if fields == preset:
+            return "singlePaper" + name.capitalize()
+    digest = hashlib.sha256("\n".join(sorted(fields)).encode()).hexdigest()[:8]
+    return f"singlePaper_{digest}"
+
+
+_QUERIES: Dict[FrozenSet[str], object] = {}
+_QUERIES_LOCK = threading.Lock()
+
+
+def single_paper_query(projection: Optional[Projection] = None):
+    """
+    The singlePaper query selecting only ``projection``. Documents are built
+    once per field set and reused; each gets its own operation name (e.g.
+    ``singlePaperMetadata``), so response caches keep projections apart.
+    """
+    fields = normalize(projection)
+    if fields is None:
+        return SINGLE_PAPER_QUERY
+    with _QUERIES_LOCK:
+        query = _QUERIES.get(fields)
+        if query is None:
+            # The response object is rebuilt with only the selected fields,
+            # expanding dotted paths and whole objects from the full query.
+            body = _render(_select(fields), 12)
+            query = _QUERIES[fields] = gql(
+                f"query {_operation_name(fields)}($paper_id: MetadataInput!) {{\n"
+                f"    singlePaper(paper_id: $paper_id) {{\n"
+                f"        status\n"
+                f"        message\n"
+                f"        response {{\n{body}\n        }}\n"
+                f"    }}\n"
+                f"}}"
+            )
+        return query
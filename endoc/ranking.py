@@ -0,0 +1,222 @@
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .models.document_search import DocumentSearchData
+from .models.search_hits import CompactDocumentSearchData, SearchHits, Scores, _column, _min_max, _ranked, np
+
+DEFAULT_RRF_K = 60  # rank offset of reciprocal-rank fusion (Cormack et al.)
+
+NORMALIZATIONS = ("minmax", "zscore", "rank", "none")
+
+SearchResult = Union[SearchHits, DocumentSearchData, CompactDocumentSearchData, Dict[str, Any]]
+
+
+def as_hits(result: SearchResult) -> SearchHits:
+    """SearchHits for a document_search result (full, compact, raw or already hits)."""
+    if isinstance(result, SearchHits):
+        return result
+    if isinstance(result, CompactDocumentSearchData):
+        return result.response.hits if result.response is not None else SearchHits([], [], [], [])
+    if isinstance(result, DocumentSearchData):
+        body = result.response
+        if body is None:
+            return SearchHits([], [], [], [])
+        return SearchHits.from_papers(body.paper_list, body.reranking_scores, body.prefetching_scores)
+    if isinstance(result, dict):
+        return SearchHits.from_response(result.get("response", result) or {})
+    raise TypeError(f"Expected a document_search result or SearchHits, got {type(result).__name__}.")
+
+
+def normalize(scores: Scores, method: str = "minmax") -> Scores:
+    """
+    Rescale a score column so columns from different queries are comparable.
+
+    "minmax" maps to [0, 1], "zscore" to zero mean and unit variance, "rank"
+    to 1 for the best hit down to 1/n for the worst, "none" leaves the
+    scores as they are. NaN stays NaN.
+    """
+    if method == "minmax":
+        return _min_max(scores)
+    if method == "zscore":
+        return _z_score(scores)
+    if method == "rank":
+        return _rank_scores(scores)
+    if method == "none":
+        return scores
+    raise ValueError(f"Unknown normalization {method!r}; use one of {NORMALIZATIONS}.")
+
+
+def _z_score(scores: Scores) -> Scores:
+    if np is not None:
+        if not len(scores) or np.isnan(scores).all():
+            return scores.copy()
+        std = np.nanstd(scores)
+        centred = scores - np.nanmean(scores)
+        return centred / std if std else np.where(np.isnan(scores), np.nan, 0.0)
+    finite = [s for s in scores if not math.isnan(s)]
+    if not finite:
+        return array("d", scores)
+    mean = sum(finite) / len(finite)
+    std = math.sqrt(sum((s - mean) ** 2 for s in finite) / len(finite))
+    return array("d", (s if math.isnan(s) else ((s - mean) / std if std else 0.0) for s in scores))
+
+
+def _ranks(scores: Scores) -> Scores:
+    """1-based rank of every hit by ``scores`` (best is 1; NaN ranks last)."""
+    order = _ranked(scores)
+    if np is not None:
+        ranks = np.empty(len(order), dtype=np.float64)
+        ranks[np.asarray(order, dtype=np.intp)] = np.arange(1, len(order) + 1)
+        return ranks
+    ranks = array("d", bytes(8 * len(order)))
+    for position, index in enumerate(order, 1):
+        ranks[index] = position
+    return ranks
+
+
+def _rank_scores(scores: Scores) -> Scores:
+    ranks = _ranks(scores)
+    if np is not None:
+        return np.where(np.isnan(scores), np.nan, 1.0 / ranks) if len(ranks) else ranks
+    return array("d", (math.nan if math.isnan(s) else 1.0 / r for s, r in zip(scores, ranks)))
+
+
+def _union(hits_list: Sequence[SearchHits]) -> Tuple[SearchHits, List[List[int]], List[List[int]]]:
+    """
+    Merge hits by PaperMetadata identity. Returns the merged hits (each
+    paper once, first occurrence kept) and, per input, the rows that are
+    kept and the merged row each of them lands on. Later duplicates within
+    one input are dropped, so each input counts a paper once.
+    """
+    positions: Dict[Tuple[str, str, str, str], int] = {}
+    sources: List[Tuple[int, int]] = []
+    rows: List[List[int]] = []
+    targets: List[List[int]] = []
+    for which, hits in enumerate(hits_list):
+        kept, landed, seen = [], [], set()
+        for row, key in enumerate(hits.keys()):
+            if key in seen:
+                continue
+            seen.add(key)
+            if key not in positions:
+                positions[key] = len(sources)
+                sources.append((which, row))
+            kept.append(row)
+            landed.append(positions[key])
+        rows.append(kept)
+        targets.append(landed)
+
+    merged = SearchHits([], [], [], [])
+    prefetching = []
+    for which, row in sources:
+        hits = hits_list[which]
+        merged.collection.append(hits.collection[row])
+        merged.id_field.append(hits.id_field[row])
+        merged.id_type.append(hits.id_type[row])
+        merged.id_value.append(hits.id_value[row])
+        prefetching.append(hits.prefetching_scores[row])
+    merged.prefetching_scores = _column(prefetching, len(sources))
+    return merged, rows, targets
+
+
+def _accumulate(size: int, parts: List[Tuple[Scores, List[int], List[int], float]]) -> Scores:
+    """Sum ``weight * column[rows]`` into the merged rows ``targets``; NaN counts as 0."""
+    if np is not None:
+        fused = np.zeros(size, dtype=np.float64)
+        for column, rows, targets, weight in parts:
+            if rows:
+                values = np.asarray(column, dtype=np.float64)[np.asarray(rows, dtype=np.intp)]
+                fused[np.asarray(targets, dtype=np.intp)] += weight * np.nan_to_num(values, nan=0.0)
+        return fused
+    fused = array("d", bytes(8 * size))
+    for column, rows, targets, weight in parts:
+        for row, target in zip(rows, targets):
+            value = column[row]
+            if not math.isnan(value):
+                fused[target] += weight * value
+    return fused
+
+
+def _weights(weights: Optional[Sequence[float]], count: int) -> List[float]:
+    if weights is None:
+        return [1.0] * count
+    if len(weights) != count:
+        raise ValueError("Pass one weight per result.")
+    return [float(w) for w in weights]
+
+
+def _scored(hits: SearchHits, by: str) -> SearchHits:
+    """``hits`` without the rows whose ``by`` score is NaN."""
+    scores = hits.scores(by)
+    if np is not None:
+        return hits.take(np.flatnonzero(~np.isnan(scores)).tolist())
+    return hits.take(i for i, s in enumerate(scores) if not math.isnan(s))
+
+
+def _finish(merged: SearchHits, fused: Scores, top_k: Optional[int]) -> SearchHits:
+    merged.reranking_scores = fused
+    return merged.take(_ranked(merged.reranking_scores, top_k))
+
+
+def weighted_fusion(
+    results: Sequence[SearchResult],
+    weights: Optional[Sequence[float]] = None,
+    *,
+    by: str = "reranking",
+    method: str = "minmax",
+    top_k: Optional[int] = None,
+) -> SearchHits:
+    """
+    Merge several document_search results by a weighted sum of their scores.
+
+    Each result's ``by`` column is normalized with ``method`` first, so
+    queries with different score ranges can be combined. A paper found by
+    several queries is listed once and sums its weighted scores; a query
+    that did not find it adds 0. Returns the ``top_k`` merged hits (all if
+    None), best first, with the fused score in ``reranking_scores``.
+    """
+    hits_list = [as_hits(result) for result in results]
+    weights = _weights(weights, len(hits_list))
+    merged, rows, targets = _union(hits_list)
+    parts = [
+        (normalize(hits.scores(by), method), kept, landed, weight)
+        for hits, kept, landed, weight in zip(hits_list, rows, targets, weights)
+    ]
+    return _finish(merged, _accumulate(len(merged), parts), top_k)
+
+
+def reciprocal_rank_fusion(
+    results: Sequence[SearchResult],
+    weights: Optional[Sequence[float]] = None,
+    *,
+    k: int = DEFAULT_RRF_K,
+    by: str = "reranking",
+    top_k: Optional[int] = None,
+) -> SearchHits:
+    """
+    Merge several document_search results by reciprocal-rank fusion.
+
+    A paper scores ``weight / (k + rank)`` for every result it appears in,
+    where rank is its 1-based position by the ``by`` column. Hits with a NaN
+    score are left out of their result. Only ranks are used, so the score
+    scales of the queries do not matter. Returns the
+    ``top_k`` merged hits (all if None), best first, with the fused score in
+    ``reranking_scores``.
+    """
+    if k < 0:
+        raise ValueError("k must be >= 0.")
+    # An unscored hit has no rank in its list, so it must not take one.
+    hits_list = [_scored(as_hits(result), by) for result in results]
+    weights = _weights(weights, len(hits_list))
+    merged, rows, targets = _union(hits_list)
+    parts = []
+    for hits, kept, landed, weight in zip(hits_list, rows, targets, weights):
+        # Rank among the rows kept, so a dropped duplicate does not push others down.
+        ranks = _ranks(hits.take(kept).scores(by))
+        if np is not None:
+            column = 1.0 / (k + ranks)
+        else:
+            column = array("d", (1.0 / (k + r) for r in ranks))
+        parts.append((column, list(range(len(kept))), landed, weight))
+    return _finish(merged, _accumulate(len(merged), parts), top_k)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from .utils import base_operation_name
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of ``burst``.
+
+    Callers reserve a token and then wait until it is due, so concurrent
+    callers are served in arrival order without holding the lock while
+    sleeping. Works from any number of threads and event loops at once.
+
+    With ``adaptive`` set, the rate is halved on every rate-limit rejection
+    (down to ``min_rate``) and grows back by a twentieth of the configured
+    rate per accepted request (additive increase, multiplicative decrease).
+    A ``Retry-After`` pauses the bucket for that long.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        *,
+        adaptive: bool = True,
+        min_rate: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be > 0.")
+        self.max_rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, float(rate))
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1.")
+        self.adaptive = adaptive
+        self.min_rate = min_rate if min_rate is not None else self.max_rate / 16
+
+        self._rate = self.max_rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second, after any adaptation."""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` now and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.adaptive:
+                self._rate = max(self.min_rate, self._rate / 2)
+            # Drop the saved-up burst: the server just said we are too fast.
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def on_success(self) -> None:
+        if not self.adaptive or self._rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(self.max_rate, self._rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    """
+    Client-side request budget, shared by everything that uses one APIClient.
+
+    ``rate`` (requests per second) applies to all operations together;
+    ``per_operation`` adds stricter budgets by GraphQL operation name, which a
+    request must satisfy as well::
+
+        limiter = RateLimiter(rate=20, per_operation={"importPDFWithAPIKey": 1})
+        client = EndocClient(api_key="...", rate_limiter=limiter)
+
+    Values in ``per_operation`` are rates or ready-made TokenBucket objects.
+    Aliased batches (``singlePaperBatch8``) and projected queries
+    (``singlePaperMetadata``) draw on the budget of the operation they were
+    built from, one token per request.
+    Pass the same limiter to several clients to share one budget between them.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        *,
+        per_operation: Optional[Dict[str, Union[float, TokenBucket]]] = None,
+        adaptive: bool = True,
+    ):
+        self.bucket = TokenBucket(rate, burst, adaptive=adaptive)
+        self.operations: Dict[str, TokenBucket] = {
+            name: limit if isinstance(limit, TokenBucket) else TokenBucket(limit, adaptive=adaptive)
+            for name, limit in (per_operation or {}).items()
+        }
+
+    def _buckets(self, operation: str) -> List[TokenBucket]:
+        specific = self.operations.get(operation)
+        if specific is None:
+            specific = self.operations.get(base_operation_name(operation))
+        return [self.bucket] if specific is None else [self.bucket, specific]
+
+    def _wait(self, operation: str) -> float:
+        return max(bucket.reserve() for bucket in self._buckets(operation))
+
+    def acquire(self, operation: str = "") -> None:
+        """Block until a request for ``operation`` may be sent."""
+        wait = self._wait(operation)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, operation: str = "") -> None:
+        """Wait, without blocking the event loop, until ``operation`` may be sent."""
+        wait = self._wait(operation)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_rate_limited(self, operation: str = "", retry_after: Optional[float] = None) -> None:
+        for bucket in self._buckets(operation):
+            bucket.on_rate_limited(retry_after)
+
+    def on_success(self, operation: str = "") -> None:
+        for bucket in self._buckets(operation):
+            bucket.on_success()
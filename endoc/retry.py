@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from .exceptions import APIError, RateLimitError
+from .utils import operation_name, operation_type
+
+try:
+    import aiohttp
+except ImportError:  # the async extra is optional
+    aiohttp = None
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.5  # seconds; first backoff is drawn from [0, base]
+DEFAULT_MAX_DELAY = 30.0  # cap on a single backoff
+DEFAULT_DEADLINE = 120.0  # total seconds spent on one call, retries included
+
+
+def parse_retry_after(value: Union[str, float, None]) -> Optional[float]:
+    """
+    Parse a Retry-After value (delta-seconds or HTTP date, as a string or a
+    number) into seconds.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return max(0.0, float(value))
+    if not isinstance(value, str) or not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_from(err: BaseException) -> Optional[float]:
+    """Read Retry-After from the HTTP response behind a transport error."""
+    for cause in _causes(err):
+        response = getattr(cause, "response", None)
+        headers = getattr(response, "headers", None) or getattr(cause, "headers", None)
+        if headers:
+            return parse_retry_after(headers.get("Retry-After"))
+    return None
+
+
+def _causes(err: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    while err is not None and id(err) not in seen:
+        seen.add(id(err))
+        yield err
+        err = err.__cause__ or err.__context__
+
+
+def _connect_failed(err: BaseException) -> bool:
+    """True if the request never reached the server (nothing was processed)."""
+    for cause in _causes(err):
+        if isinstance(cause, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(cause, requests.exceptions.ConnectionError):
+            reason = getattr(cause.args[0], "reason", None) if cause.args else None
+            if isinstance(reason, NewConnectionError):  # includes NameResolutionError
+                return True
+        if aiohttp is not None and isinstance(cause, aiohttp.ClientConnectorError):
+            return True
+    return False
+
+
+def _network_error(err: BaseException) -> bool:
+    """True for timeouts and dropped connections, before or after sending."""
+    transient = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                 asyncio.TimeoutError, ConnectionError)
+    if aiohttp is not None:
+        transient += (aiohttp.ClientConnectionError,)
+    return any(isinstance(cause, transient) for cause in _causes(err))
+
+
+class RetryPolicy:
+    """
+    When and how long APIClient waits before repeating a failed request.
+
+    Retries use exponential backoff with full jitter: before retry ``n`` the
+    client sleeps a random time in ``[0, min(max_delay, base_delay * 2**n)]``,
+    so many clients throttled at once do not come back in lockstep. A
+    ``Retry-After`` sent by the server is honoured as a lower bound. Nothing
+    is retried past ``deadline`` seconds from the first attempt.
+
+    What is retried depends on the operation:
+
+    - queries (idempotent) are retried on rate limits (HTTP 429,
+      RATE_LIMITED), 5xx responses, timeouts and dropped connections;
+    - mutations such as ``importPDFWithAPIKey`` are only retried when the
+      server cannot have processed the request: a rate limit rejection or a
+      connection that was never opened. Mutations named in
+      ``idempotent_mutations`` are treated like queries.
+
+    Authentication, permission and GraphQL errors are never retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        deadline: Optional[float] = DEFAULT_DEADLINE,
+        retry_server_errors: bool = True,
+        idempotent_mutations: Iterable[str] = (),
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1.")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("base_delay and max_delay must be >= 0.")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_server_errors = retry_server_errors
+        self.idempotent_mutations = frozenset(idempotent_mutations)
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """A policy that never retries."""
+        return cls(max_attempts=1)
+
+    def is_idempotent(self, query: Any) -> bool:
+        if operation_type(query) != "mutation":
+            return True
+        return operation_name(query) in self.idempotent_mutations
+
+    def should_retry(self, error: BaseException, idempotent: bool) -> bool:
+        if isinstance(error, RateLimitError):
+            return True
+        if not isinstance(error, APIError):
+            return False
+        if _connect_failed(error):
+            return True
+        if not idempotent:
+            return False
+        status = error.status_code
+        if status is not None:
+            return self.retry_server_errors and 500 <= status < 600
+        return _network_error(error)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _delay(self, error: BaseException, attempt: int, started: float, idempotent: bool) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt + 1 >= self.max_attempts or not self.should_retry(error, idempotent):
+            return None
+        delay = self.backoff(attempt)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+    def call(self, fn: Callable[[], T], *, idempotent: bool = True) -> T:
+        """Run ``fn`` until it succeeds or the policy gives up."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except (RateLimitError, APIError) as e:
+                delay = self._delay(e, attempt, started, idempotent)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]], *, idempotent: bool = True) -> T:
+        """Coroutine version of ``call``; sleeps without blocking the loop."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except (RateLimitError, APIError) as e:
+                delay = self._delay(e, attempt, started, idempotent)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def resolve_retry(retry: Union[RetryPolicy, bool, None]) -> RetryPolicy:
+    """Turn the ``retry`` argument of the clients into a RetryPolicy."""
+    if isinstance(retry, RetryPolicy):
+        return retry
+    return RetryPolicy() if retry else RetryPolicy.disabled()
@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional
+
+from .models.paginated_search import PaginatedSearchData
+from .models.search_hits import SearchHits
+
+DEFAULT_PAGE_SIZE = 20  # papers per paginatedSearch request in search_iter
+
+
+def _pages(hits: SearchHits, page_size: int, limit: Optional[int]) -> List[SearchHits]:
+    if page_size < 1:
+        raise ValueError("page_size must be >= 1.")
+    if limit is not None:
+        hits = hits[:limit]
+    return [hits[start:start + page_size] for start in range(0, len(hits), page_size)]
+
+
+def iter_pages(
+    hits: SearchHits,
+    fetch: Callable[[SearchHits], PaginatedSearchData],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    limit: Optional[int] = None,
+    prefetch: bool = True,
+) -> Iterator[PaginatedSearchData]:
+    """
+    Yield ``fetch(page)`` for consecutive pages of ``hits``.
+
+    With ``prefetch``, the next page is requested on a background thread
+    while the caller works through the current one. Closing the generator
+    (e.g. breaking out of the loop) cancels the prefetch if it has not
+    started; one that is already in flight finishes in the background and
+    its result is dropped.
+    """
+    pages = _pages(hits, page_size, limit)
+    if not pages:
+        return
+    if not prefetch:
+        for page in pages:
+            yield fetch(page)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="endoc-search")
+    pending = pool.submit(fetch, pages[0])
+    try:
+        for index in range(len(pages)):
+            current = pending
+            if index + 1 < len(pages):
+                pending = pool.submit(fetch, pages[index + 1])
+            yield current.result()
+    finally:
+        pending.cancel()
+        pool.shutdown(wait=False)
+
+
+async def iter_pages_async(
+    hits: SearchHits,
+    fetch: Callable[[SearchHits], Awaitable[PaginatedSearchData]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    limit: Optional[int] = None,
+    prefetch: bool = True,
+) -> AsyncIterator[PaginatedSearchData]:
+    """Async-iterator version of ``iter_pages``; the prefetch is a task."""
+    pages = _pages(hits, page_size, limit)
+    if not pages:
+        return
+    if not prefetch:
+        for page in pages:
+            yield await fetch(page)
+        return
+
+    pending = asyncio.ensure_future(fetch(pages[0]))
+    try:
+        for index in range(len(pages)):
+            current = pending
+            if index + 1 < len(pages):
+                pending = asyncio.ensure_future(fetch(pages[index + 1]))
+            yield await current
+    finally:
+        if not pending.done():
+            pending.cancel()
+        elif not pending.cancelled():
+            pending.exception()  # mark retrieved; the caller has moved on
@@ -1,18 +1,143 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..cache import ResponseCache, SearchCache, _key_namespace, cached_query, cached_query_async
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import DOCUMENT_SEARCH_QUERY
-from ..models.document_search import DocumentSearchData
+from ..models.document_search import DocumentSearchData, SearchStage
+from ..models.search_hits import CompactDocumentSearchData, SearchHits
+
+RANKING_PAPER_FIELDS = ("ranking_collection", "ranking_id_field", "ranking_id_value", "ranking_id_type")
 
 class DocumentSearchService:
-    def __init__(self, api_key: str):
-        self.client = APIClient(api_key)
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[AnyAPIClient] = None,
+        cache: Optional[ResponseCache] = None,
+        search_cache: Optional[SearchCache] = None,
+    ):
+        self.client = client or APIClient(api_key)
+        self.cache = cache
+        self.search_cache = search_cache
+
+    def search_documents(self, ranking_variable=None, keywords=None, compact=False, *, stages=None, **scope):
+        variable_values = self._variables(ranking_variable, keywords, **scope)
+        raw_result = self._search(variable_values)
+        for stage in self._stages(stages):
+            variable_values = self._narrow(variable_values, raw_result, stage)
+            if variable_values is None:
+                break
+            raw_result = self._search(variable_values)
+        return self._parse(raw_result, compact)
+
+    async def search_documents_async(self, ranking_variable=None, keywords=None, compact=False, *, stages=None, **scope):
+        variable_values = self._variables(ranking_variable, keywords, **scope)
+        raw_result = await self._search_async(variable_values)
+        for stage in self._stages(stages):
+            variable_values = self._narrow(variable_values, raw_result, stage)
+            if variable_values is None:
+                break
+            raw_result = await self._search_async(variable_values)
+        return self._parse(raw_result, compact)
+
+    def _search(self, variable_values):
+        raw_result = self._cached_search(variable_values)
+        if raw_result is None:
+            raw_result = cached_query(self.client, self.cache, DOCUMENT_SEARCH_QUERY, variable_values)
+            self._store_search(variable_values, raw_result)
+        return raw_result
+
+    async def _search_async(self, variable_values):
+        raw_result = self._cached_search(variable_values)
+        if raw_result is None:
+            raw_result = await cached_query_async(self.client, self.cache, DOCUMENT_SEARCH_QUERY, variable_values)
+            self._store_search(variable_values, raw_result)
+        return raw_result
+
+    def _cached_search(self, variable_values):
+        if self.search_cache is None:
+            return None
+        return self.search_cache.get_search(variable_values, _key_namespace(getattr(self.client, "_api_key", "")))
 
-    def search_documents(self, ranking_variable, keywords=None):
+    def _store_search(self, variable_values, raw_result):
+        if self.search_cache is not None:
+            self.search_cache.set_search(variable_values, raw_result, _key_namespace(getattr(self.client, "_api_key", "")))
+
+    @staticmethod
+    def _stages(stages) -> List[SearchStage]:
+        return [stage if isinstance(stage, SearchStage) else SearchStage(**stage) for stage in stages or ()]
+
+    @staticmethod
+    def _narrow(previous: Dict[str, Any], raw_result, stage: SearchStage) -> Optional[Dict[str, Any]]:
+        """
+        Variables for re-searching the previous stage's top hits, or None
+        when it found nothing (an empty paper_list would not restrict the
+        search at all).
+        """
+        body = (raw_result.get("documentSearch") or {}).get("response")
+        if not body:
+            return None
+        top = SearchHits.from_response(body).top_k(stage.top_k)
+        if not len(top):
+            return None
+        variable_values = dict(previous)
+        for name, value in stage.model_dump(exclude={"top_k"}, exclude_none=True).items():
+            variable_values[name] = value
+        variable_values["paper_list"] = top.paper_list()
+        return variable_values
+
+    @staticmethod
+    def _paper_list(papers) -> List[Dict[str, str]]:
+        """MetadataInput dicts from PaperMetadata models, Hits, dicts or a SearchHits."""
+        if isinstance(papers, SearchHits):
+            return papers.paper_list()
+        result = []
+        for paper in papers:
+            if hasattr(paper, "as_dict"):
+                paper = paper.as_dict()
+            elif not isinstance(paper, dict):
+                paper = paper.model_dump()
+            result.append({name: str(paper[name]) for name in ("collection", "id_field", "id_type", "id_value")})
+        return result
+
+    @staticmethod
+    def _variables(
+        ranking_variable,
+        keywords,
+        paper_list: Optional[Sequence] = None,
+        ranking_collection: Optional[str] = None,
+        ranking_id_field: Optional[str] = None,
+        ranking_id_value: Optional[str] = None,
+        ranking_id_type: Optional[str] = None,
+    ):
         variable_values = {
             "ranking_variable": ranking_variable,
             "keywords": keywords or []
         }
-        raw_result = self.client.execute_query(DOCUMENT_SEARCH_QUERY, variable_values)
+        if paper_list is not None:
+            variable_values["paper_list"] = DocumentSearchService._paper_list(paper_list)
+        ranking_paper = zip(RANKING_PAPER_FIELDS, (ranking_collection, ranking_id_field, ranking_id_value, ranking_id_type))
+        variable_values.update({name: value for name, value in ranking_paper if value is not None})
+        return variable_values
+
+    @staticmethod
+    def _parse(raw_result, compact=False):
         doc_search_data = raw_result.get("documentSearch")
         if not doc_search_data:
             raise ValueError("No 'documentSearch' key found in response.")
-        return DocumentSearchData(**doc_search_data)
\ No newline at end of file
+        if compact:
+            return DocumentSearchService._parse_compact(doc_search_data)
+        return DocumentSearchData(**doc_search_data)
+
+    @staticmethod
+    def _parse_compact(doc_search_data):
+        """Columns are filled straight from the raw hits; no model per paper."""
+        body = doc_search_data.get("response")
+        if body is not None:
+            body = {"search_stats": body.get("search_stats"), "hits": SearchHits.from_response(body)}
+        return CompactDocumentSearchData(
+            status=doc_search_data.get("status"),
+            message=doc_search_data.get("message"),
+            response=body,
+        )
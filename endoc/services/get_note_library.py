@@ -1,15 +1,27 @@
+from typing import Optional
+
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import GET_NOTE_LIBRARY_QUERY
 from ..models.note_library import GetNoteLibraryResponse
 
 class GetNoteLibraryService:
-    def __init__(self, api_key: str):
-        self.client = APIClient(api_key)
+    def __init__(self, api_key: str, client: Optional[AnyAPIClient] = None):
+        self.client = client or APIClient(api_key)
 
     def get_note_library(self, doc_id: str):
         variable_values = {"doc_id": doc_id}
         raw_result = self.client.execute_query(GET_NOTE_LIBRARY_QUERY, variable_values)
+        return self._parse(raw_result)
+
+    async def get_note_library_async(self, doc_id: str):
+        variable_values = {"doc_id": doc_id}
+        raw_result = await self.client.execute_query(GET_NOTE_LIBRARY_QUERY, variable_values)
+        return self._parse(raw_result)
+
+    @staticmethod
+    def _parse(raw_result):
         data = raw_result.get("getNoteLibrary")
         if not data:
             raise ValueError("No 'getNoteLibrary' key found in response.")
-        return GetNoteLibraryResponse(**data)
\ No newline at end of file
+        return GetNoteLibraryResponse(**data)
@@ -1,18 +1,178 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..cache import SearchCache, _key_namespace
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import PAGINATED_SEARCH_QUERY
-from ..models.paginated_search import PaginatedSearchData
+from ..models.paginated_search import PaginatedSearchData, PaginatedSearchFailure
+
+DEFAULT_SEARCH_CONCURRENCY = 4  # parallel paginatedSearch chunk requests
 
 class PaginatedSearchService:
-    def __init__(self, api_key):
-        self.client = APIClient(api_key)
+    def __init__(self, api_key, client: Optional[AnyAPIClient] = None, search_cache: Optional[SearchCache] = None):
+        self.client = client or APIClient(api_key)
+        self.search_cache = search_cache
+
+    def paginated_search(self, paper_list, keywords=None, chunk_size=None, max_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        cached, missing = self._lookup(paper_list, keywords)
+        if not missing:
+            return self._from_cache(cached)
+        chunks = self._chunks(missing, chunk_size)
+        if len(chunks) == 1:
+            outcomes = [self._fetch(chunks[0][1], keywords)]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as pool:
+                futures = [pool.submit(self._fetch, chunk, keywords) for _, chunk in chunks]
+                outcomes = []
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append(e)
+        return self._merge(paper_list, keywords, cached, missing, chunks, outcomes)
+
+    async def paginated_search_async(self, paper_list, keywords=None, chunk_size=None, max_concurrency=DEFAULT_SEARCH_CONCURRENCY):
+        cached, missing = self._lookup(paper_list, keywords)
+        if not missing:
+            return self._from_cache(cached)
+        chunks = self._chunks(missing, chunk_size)
+        if len(chunks) == 1:
+            outcomes = [await self._fetch_async(chunks[0][1], keywords)]
+        else:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch(chunk):
+                async with semaphore:
+                    return await self._fetch_async(chunk, keywords)
+
+            outcomes = await asyncio.gather(*(fetch(chunk) for _, chunk in chunks), return_exceptions=True)
+        return self._merge(paper_list, keywords, cached, missing, chunks, outcomes)
+
+    def _fetch(self, paper_list, keywords):
+        variable_values = self._variables(paper_list, keywords)
+        raw_result = self.client.execute_query(PAGINATED_SEARCH_QUERY, variable_values)
+        return self._block(raw_result)
+
+    async def _fetch_async(self, paper_list, keywords):
+        variable_values = self._variables(paper_list, keywords)
+        raw_result = await self.client.execute_query(PAGINATED_SEARCH_QUERY, variable_values)
+        return self._block(raw_result)
+
+    # ── Search cache ────────────────────────────────────────────────────
+
+    def _namespace(self) -> str:
+        return _key_namespace(getattr(self.client, "_api_key", ""))
+
+    def _lookup(self, paper_list, keywords) -> Tuple[List[Optional[dict]], List[Tuple[int, Any]]]:
+        """Cached items aligned with paper_list, and the (index, paper) pairs to fetch."""
+        paper_list = list(paper_list)
+        if self.search_cache is None:
+            return [None] * len(paper_list), list(enumerate(paper_list))
+        cached = self.search_cache.get_papers(paper_list, keywords, self._namespace())
+        return cached, [(i, paper) for i, paper in enumerate(paper_list) if cached[i] is None]
 
-    def paginated_search(self, paper_list, keywords=None):
-        variable_values = {
+    @staticmethod
+    def _from_cache(cached) -> PaginatedSearchData:
+        return PaginatedSearchData(status="SUCCESS", message="Served from the search cache.", response=cached)
+
+    @staticmethod
+    def _attribute(papers, items) -> List[Optional[dict]]:
+        """
+        Match returned items to requested papers: by the paper's id_field
+        when the item carries it (e.g. id_int), else by position when the
+        counts agree. Unmatched papers get None.
+        """
+        by_identity = {}
+        for item in items:
+            for field in ("id_int", "DOI", "_id"):
+                if item.get(field) is not None:
+                    by_identity[(field, str(item[field]))] = item
+        matched = [by_identity.get((paper.get("id_field"), str(paper.get("id_value")))) for paper in papers]
+        if any(m is None for m in matched) and len(items) == len(papers):
+            return list(items)
+        return matched
+
+    # ── Chunks ──────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _chunks(indexed, chunk_size) -> List[Tuple[int, list]]:
+        """(start index, papers) pairs over the papers to fetch; one chunk when chunk_size is None."""
+        if chunk_size is None:
+            return [(0, [paper for _, paper in indexed])]
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1.")
+        return [
+            (start, [paper for _, paper in indexed[start:start + chunk_size]])
+            for start in range(0, len(indexed), chunk_size)
+        ]
+
+    def _merge(self, paper_list, keywords, cached, missing, chunks, outcomes) -> PaginatedSearchData:
+        """
+        Combine cached items and chunk results in paper_list order; failed
+        chunks become failures. A lone failing request raises as before.
+        """
+        if len(chunks) == 1 and not any(cached) and not isinstance(outcomes[0], BaseException):
+            block = outcomes[0]
+            if self.search_cache is not None:
+                self._store(chunks[0][1], keywords, block)
+            return self._parse_block(block)
+
+        slots: List[Optional[List[dict]]] = [[item] if item is not None else None for item in cached]
+        failures, first = [], None
+        for (start, chunk), outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                failures.append(PaginatedSearchFailure(
+                    start=missing[start][0], size=len(chunk), error=f"{type(outcome).__name__}: {outcome}"
+                ))
+                continue
+            first = first or outcome
+            items = outcome.get("response") or []
+            if self.search_cache is not None:
+                self._store(chunk, keywords, outcome)
+            matched = self._attribute(chunk, items)
+            if sum(m is not None for m in matched) < len(items):
+                # Items that could not be placed go after the chunk's first paper.
+                matched = [list(items)] + [[] for _ in chunk[1:]]
+            else:
+                matched = [[m] if m is not None else [] for m in matched]
+            for offset, placed in enumerate(matched):
+                slots[missing[start + offset][0]] = placed
+        if first is None and not any(cached):
+            raise next(o for o in outcomes if isinstance(o, Exception))
+
+        response = [item for slot in slots if slot for item in slot]
+        status = first.get("status") if first else "SUCCESS"
+        message = first.get("message") if first else "Served from the search cache."
+        if failures:
+            message = f"{len(failures)} of {len(chunks)} chunks failed; see failures."
+        return PaginatedSearchData(status=status, message=message, response=response, failures=failures)
+
+    def _store(self, papers, keywords, block) -> None:
+        items = block.get("response") or []
+        self.search_cache.set_papers(papers, keywords, self._attribute(papers, items), self._namespace())
+
+    @staticmethod
+    def _variables(paper_list, keywords):
+        return {
             "paper_list": paper_list,
             "keywords": keywords or [],
         }
-        raw_result = self.client.execute_query(PAGINATED_SEARCH_QUERY, variable_values)
+
+    @staticmethod
+    def _block(raw_result) -> Dict[str, Any]:
         data = raw_result.get("paginatedSearch")
         if not data:
             raise ValueError("No 'paginatedSearch' key found in response.")
-        return PaginatedSearchData(**data)
\ No newline at end of file
+        return data
+
+    @staticmethod
+    def _parse_block(data) -> PaginatedSearchData:
+        return PaginatedSearchData(**data)
+
+    @classmethod
+    def _parse(cls, raw_result):
+        return cls._parse_block(cls._block(raw_result))
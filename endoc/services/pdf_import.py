@@ -1,18 +1,33 @@
+from typing import Optional
+
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import IMPORT_PDF_WITH_API_KEY_MUTATION
 from ..models.pdf_import import ImportPDFData
 
 
 class PDFImportService:
-    def __init__(self, api_key: str):
-        self.client = APIClient(api_key)
+    def __init__(self, api_key: str, client: Optional[AnyAPIClient] = None):
+        self.client = client or APIClient(api_key)
 
     def import_pdf_with_api_key(self, base64list):
+        variables = self._variables(base64list)
+        raw_result = self.client.execute_query(IMPORT_PDF_WITH_API_KEY_MUTATION, variables)
+        return self._parse(raw_result)
+
+    async def import_pdf_with_api_key_async(self, base64list):
+        variables = self._variables(base64list)
+        raw_result = await self.client.execute_query(IMPORT_PDF_WITH_API_KEY_MUTATION, variables)
+        return self._parse(raw_result)
+
+    @staticmethod
+    def _variables(base64list):
         if not isinstance(base64list, list) or not base64list:
             raise ValueError("base64list must be a non-empty list of base64 strings.")
+        return {"base64list": base64list}
 
-        variables = {"base64list": base64list}
-        raw_result = self.client.execute_query(IMPORT_PDF_WITH_API_KEY_MUTATION, variables)
+    @staticmethod
+    def _parse(raw_result):
         data = raw_result.get("importPDFWithAPIKey")
         if not data:
             raise ValueError("No 'importPDFWithAPIKey' key found in response.")
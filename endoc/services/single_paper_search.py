@@ -1,10 +1,46 @@
+from typing import Dict, Iterable, List, Optional
+
+from ..batching import (
+    DEFAULT_MAX_BATCH,
+    AsyncAutoBatcher,
+    AutoBatcher,
+    BatchedOperation,
+    error_message,
+    execute_batched,
+    execute_batched_async,
+)
+from ..cache import ResponseCache, cached_query, cached_query_async
+from ..async_client import AnyAPIClient
 from ..client import APIClient
+from ..projection import Projection, single_paper_query
 from ..queries import SINGLE_PAPER_QUERY
-from ..models.single_paper import SinglePaperData
+from ..models.single_paper import PartialSinglePaperData, SinglePaperData
+
+_BATCHED: Dict[int, BatchedOperation] = {}
+
+
+def _batched(query) -> BatchedOperation:
+    operation = _BATCHED.get(id(query))
+    if operation is None:
+        operation = _BATCHED.setdefault(id(query), BatchedOperation(query))
+    return operation
+
 
 class SinglePaperSearchService:
-    def __init__(self, api_key):
-        self.client = APIClient(api_key)
+    def __init__(
+        self,
+        api_key,
+        client: Optional[AnyAPIClient] = None,
+        cache: Optional[ResponseCache] = None,
+        batch_window: Optional[float] = None,
+    ):
+        self.client = client or APIClient(api_key)
+        self.cache = cache
+        # With a batch window, concurrent get_single_paper calls are sent
+        # together as one aliased request.
+        self.batch_window = batch_window
+        self._batchers: Dict[int, AutoBatcher] = {}
+        self._async_batchers: Dict[int, AsyncAutoBatcher] = {}
 
     def get_single_paper(
         self,
@@ -12,8 +48,78 @@ class SinglePaperSearchService:
         collection="S2AG",
         id_field="id_int",
         id_type="int",
+        projection: Optional[Projection] = None,
     ):
-        variable_values = {
+        query = single_paper_query(projection)
+        variable_values = self._variables(id_value, collection, id_field, id_type)
+        if self.batch_window is not None:
+            batcher = self._batchers.get(id(query))
+            if batcher is None:
+                operation = _batched(query)
+                batcher = self._batchers.setdefault(id(query), AutoBatcher(
+                    lambda items: execute_batched(self.client, operation, items, cache=self.cache),
+                    window=self.batch_window,
+                ))
+            return self._parse(batcher.load(variable_values), query)
+        raw_result = cached_query(self.client, self.cache, query, variable_values)
+        return self._parse(raw_result, query)
+
+    async def get_single_paper_async(
+        self,
+        id_value,
+        collection="S2AG",
+        id_field="id_int",
+        id_type="int",
+        projection: Optional[Projection] = None,
+    ):
+        query = single_paper_query(projection)
+        variable_values = self._variables(id_value, collection, id_field, id_type)
+        if self.batch_window is not None:
+            batcher = self._async_batchers.get(id(query))
+            if batcher is None:
+                operation = _batched(query)
+
+                async def dispatch(items):
+                    return await execute_batched_async(self.client, operation, items, cache=self.cache)
+
+                batcher = self._async_batchers[id(query)] = AsyncAutoBatcher(dispatch, window=self.batch_window)
+            return self._parse(await batcher.load(variable_values), query)
+        raw_result = await cached_query_async(self.client, self.cache, query, variable_values)
+        return self._parse(raw_result, query)
+
+    def get_single_papers(
+        self,
+        id_values: Iterable[str],
+        collection="S2AG",
+        id_field="id_int",
+        id_type="int",
+        max_batch: int = DEFAULT_MAX_BATCH,
+        projection: Optional[Projection] = None,
+    ) -> List[SinglePaperData]:
+        query = single_paper_query(projection)
+        items = [self._variables(v, collection, id_field, id_type) for v in id_values]
+        outcomes = execute_batched(self.client, _batched(query), items, cache=self.cache, max_batch=max_batch)
+        return [self._parse_outcome(outcome, query) for outcome in outcomes]
+
+    async def get_single_papers_async(
+        self,
+        id_values: Iterable[str],
+        collection="S2AG",
+        id_field="id_int",
+        id_type="int",
+        max_batch: int = DEFAULT_MAX_BATCH,
+        projection: Optional[Projection] = None,
+    ) -> List[SinglePaperData]:
+        query = single_paper_query(projection)
+        items = [self._variables(v, collection, id_field, id_type) for v in id_values]
+        outcomes = await execute_batched_async(
+            self.client, _batched(query), items, cache=self.cache, max_batch=max_batch
+        )
+        return [self._parse_outcome(outcome, query) for outcome in outcomes]
+
+    @staticmethod
+    def _variables(id_value, collection, id_field, id_type):
+        return {
             "paper_id": {
                 "collection": collection,
                 "id_field": id_field,
@@ -21,8 +127,20 @@ class SinglePaperSearchService:
                 "id_value": id_value,
             }
         }
-        raw_result = self.client.execute_query(SINGLE_PAPER_QUERY, variable_values)
+
+    @classmethod
+    def _parse_outcome(cls, outcome, query=SINGLE_PAPER_QUERY):
+        """Parse a batched item; a failed item becomes a status="error" result."""
+        if isinstance(outcome, Exception):
+            model = SinglePaperData if query is SINGLE_PAPER_QUERY else PartialSinglePaperData
+            return model(status="error", message=error_message(outcome), response=None)
+        return cls._parse(outcome, query)
+
+    @staticmethod
+    def _parse(raw_result, query=SINGLE_PAPER_QUERY):
         data = raw_result.get("singlePaper")
         if not data:
             raise ValueError("No 'singlePaper' key found in response.")
-        return SinglePaperData(**data)
\ No newline at end of file
+        if query is not SINGLE_PAPER_QUERY:
+            return PartialSinglePaperData(**data)
+        return SinglePaperData(**data)
@@ -1,13 +1,52 @@
+from typing import Iterable, List, Optional
+
+from ..batching import (
+    DEFAULT_MAX_BATCH,
+    BatchedOperation,
+    error_message,
+    execute_batched,
+    execute_batched_async,
+)
+from ..cache import ResponseCache, cached_query, cached_query_async
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import SUMMARIZE_PAPER_QUERY
 from ..models.summarization import SummarizationResponseData
 
+_BATCHED = BatchedOperation(SUMMARIZE_PAPER_QUERY)
+
 class SummarizationService:
-    def __init__(self, api_key):
-        self.client = APIClient(api_key)
+    def __init__(self, api_key, client: Optional[AnyAPIClient] = None, cache: Optional[ResponseCache] = None):
+        self.client = client or APIClient(api_key)
+        self.cache = cache
 
     def summarize_paper(self, id_value):
-        variable_values = {
+        raw_result = cached_query(self.client, self.cache, SUMMARIZE_PAPER_QUERY, self._variables(id_value))
+        return self._parse(raw_result)
+
+    async def summarize_paper_async(self, id_value):
+        raw_result = await cached_query_async(self.client, self.cache, SUMMARIZE_PAPER_QUERY, self._variables(id_value))
+        return self._parse(raw_result)
+
+    def summarize_papers(
+        self, id_values: Iterable[str], max_batch: int = DEFAULT_MAX_BATCH
+    ) -> List[SummarizationResponseData]:
+        items = [self._variables(v) for v in id_values]
+        outcomes = execute_batched(self.client, _BATCHED, items, cache=self.cache, max_batch=max_batch)
+        return [self._parse_outcome(outcome) for outcome in outcomes]
+
+    async def summarize_papers_async(
+        self, id_values: Iterable[str], max_batch: int = DEFAULT_MAX_BATCH
+    ) -> List[SummarizationResponseData]:
+        items = [self._variables(v) for v in id_values]
+        outcomes = await execute_batched_async(
+            self.client, _BATCHED, items, cache=self.cache, max_batch=max_batch
+        )
+        return [self._parse_outcome(outcome) for outcome in outcomes]
+
+    @staticmethod
+    def _variables(id_value):
+        return {
             "paper_id": {
                 "collection": "S2AG",
                 "id_field": "id_int",
@@ -15,8 +54,17 @@ class SummarizationService:
                 "id_value": id_value
             }
         }
-        raw_result = self.client.execute_query(SUMMARIZE_PAPER_QUERY, variable_values)
+
+    @classmethod
+    def _parse_outcome(cls, outcome):
+        """Parse a batched item; a failed item becomes a status="error" result."""
+        if isinstance(outcome, Exception):
+            return SummarizationResponseData(status="error", message=error_message(outcome), response=[])
+        return cls._parse(outcome)
+
+    @staticmethod
+    def _parse(raw_result):
         data = raw_result.get("summarizePaper")
         if not data:
             raise ValueError("No 'summarizePaper' key found in response.")
-        return SummarizationResponseData(**data)
\ No newline at end of file
+        return SummarizationResponseData(**data)
@@ -1,21 +1,37 @@
+from ..cache import ResponseCache, cached_query, cached_query_async
+from ..async_client import AnyAPIClient
 from ..client import APIClient
 from ..queries import TITLE_SEARCH_QUERY
 from ..models.title_search import TitleSearchData
-from typing import Iterable, Union
+from typing import Iterable, Optional, Union
 
 class TitleSearchService:
-    def __init__(self, api_key: str):
-        self.client = APIClient(api_key)
+    def __init__(self, api_key: str, client: Optional[AnyAPIClient] = None, cache: Optional[ResponseCache] = None):
+        self.client = client or APIClient(api_key)
+        self.cache = cache
 
     def title_search(self, titles: Union[str, Iterable[str]]):
+        variables = self._variables(titles)
+        raw = cached_query(self.client, self.cache, TITLE_SEARCH_QUERY, variables)
+        return self._parse(raw)
+
+    async def title_search_async(self, titles: Union[str, Iterable[str]]):
+        variables = self._variables(titles)
+        raw = await cached_query_async(self.client, self.cache, TITLE_SEARCH_QUERY, variables)
+        return self._parse(raw)
+
+    @staticmethod
+    def _variables(titles):
         if isinstance(titles, str):
             titles = [titles]
         titles = [t for t in titles if isinstance(t, str) and t.strip()]
         if not titles:
             raise ValueError("titles must be a non-empty string or list of strings.")
-        variables = {"titles": titles}
-        raw = self.client.execute_query(TITLE_SEARCH_QUERY, variables)
+        return {"titles": titles}
+
+    @staticmethod
+    def _parse(raw):
         data = raw.get("titleSearch")
         if not data:
             raise ValueError("No 'titleSearch' key found in response.")
-        return TitleSearchData(**data)
\ No newline at end of file
+        return TitleSearchData(**data)
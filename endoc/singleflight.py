@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from .cache import _variables_digest
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first thread to call ``do(key, fn)`` runs ``fn``; threads arriving
+    with the same key while it runs wait and receive the same result (or
+    exception). Once the call finishes the key is forgotten, so later calls
+    run again. Results are shared, not copied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared call whose leader was cancelled; waiters start over."""
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines running on one event loop.
+
+    Cancelling a waiter only affects that waiter. Cancelling the leader
+    does not cancel the waiters: one of them runs the call again and the
+    rest wait for that one.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                # A waiter giving up must not cancel the shared call.
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._calls.pop(key, None)
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # mark retrieved: there may be no waiters
+            raise
+        except BaseException as e:
+            self._calls.pop(key, None)
+            future.set_exception(e)
+            future.exception()  # mark retrieved: there may be no waiters
+            raise
+        self._calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+def flight_key(query: Any, variable_values: Any) -> Hashable:
+    """Key identifying a (query document, variables) pair."""
+    return id(query), _variables_digest(variable_values)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from gql.transport.requests import RequestsHTTPTransport
+
+from . import json_codec
+
+DEFAULT_POOL_CONNECTIONS = 10  # distinct hosts kept in the pool
+DEFAULT_POOL_MAXSIZE = 10  # keep-alive connections per host
+
+
+def build_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> requests.Session:
+    """
+    Create a requests.Session backed by a keep-alive connection pool.
+
+    The session can be passed to several APIClient / EndocClient instances
+    so that they all reuse the same sockets and TLS connections.
+    """
+    if pool_connections < 1 or pool_maxsize < 1:
+        raise ValueError("pool_connections and pool_maxsize must be >= 1.")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class PooledRequestsHTTPTransport(RequestsHTTPTransport):
+    """
+    RequestsHTTPTransport that keeps a single pooled session open.
+
+    gql connects and closes the transport around every ``Client.execute``,
+    which with the stock transport means a fresh session (and TCP/TLS
+    handshake) per request. Here connect/close only attach/detach the
+    long-lived session, so connections stay in the pool between calls.
+    """
+
+    def __init__(self, url: str, *, session: requests.Session, **kwargs: Any):
+        kwargs.setdefault("json_serialize", json_codec.dumps_str)
+        kwargs.setdefault("json_deserialize", json_codec.loads)
+        super().__init__(url, **kwargs)
+        self._pooled_session = session
+
+    # Bodies are encoded and decoded with json_codec (orjson when installed)
+    # straight from and to bytes, skipping requests' stdlib json and its
+    # bytes-to-str decoding of the response. _prepare_request,
+    # _get_json_result and _raise_response_error are private gql 4.x hooks;
+    # pyproject pins gql to 4.x and test_transport checks they still exist.
+
+    def _prepare_request(self, *args: Any, **kwargs: Any) -> Any:
+        post_args = super()._prepare_request(*args, **kwargs)
+        if "json" in post_args:
+            post_args["data"] = json_codec.dumps(post_args.pop("json"))
+            post_args["headers"] = {**(post_args.get("headers") or {}), "Content-Type": "application/json"}
+        return post_args
+
+    def _get_json_result(self, response: requests.Response) -> Any:
+        self.response_headers = response.headers
+        try:
+            return self.json_deserialize(response.content)
+        except Exception:
+            self._raise_response_error(response, "Not a JSON answer")
+
+    def connect(self) -> None:
+        self.session = self._pooled_session
+
+    def close(self) -> None:
+        # The pooled session outlives individual executions; see shutdown().
+        pass
+
+    def shutdown(self) -> None:
+        """Close the underlying session and drop its pooled connections."""
+        self._pooled_session.close()
+        self.session = None
+
+    @property
+    def pooled_session(self) -> Optional[requests.Session]:
+        return self._pooled_session
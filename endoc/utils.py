@@ -1,3 +1,5 @@
+import re
+
 from .exceptions import AuthenticationError, APIError
 
 _OK_STATUSES = {"ok", "success", "successful", "done"}
@@ -38,3 +40,48 @@ def raise_for_domain_errors(block: dict) -> None:
 
     if status or message:
         raise APIError(message or f"Operation failed with status='{status}'.")
+
+
+def operation_name(query) -> str:
+    """
+    Return the name of the first operation in a gql query, or "" if unnamed.
+    Accepts both DocumentNode (gql 3) and GraphQLRequest (gql 4) objects.
+    """
+    document = getattr(query, "document", query)
+    for definition in getattr(document, "definitions", None) or []:
+        name = getattr(definition, "name", None)
+        if name is not None:
+            return name.value
+    return ""
+
+
+_BATCH_SUFFIX = re.compile(r"Batch\d+$")
+
+
+# Names given to projected singlePaper queries (see projection._operation_name).
+_PROJECTED_SINGLE_PAPER = re.compile(r"singlePaper(?:[A-Z][A-Za-z]*|_[0-9a-f]{8})")
+
+
+def base_operation_name(name: str) -> str:
+    """
+    The operation a batched or projected query was built from:
+    "singlePaperBatch8", "singlePaperMetadata" and "singlePaper_7e8cd205"
+    all give "singlePaper". Other names are returned unchanged.
+    """
+    name = _BATCH_SUFFIX.sub("", name)
+    if _PROJECTED_SINGLE_PAPER.fullmatch(name):
+        return "singlePaper"
+    return name
+
+
+def operation_type(query) -> str:
+    """
+    Return "query", "mutation" or "subscription" for the first operation in a
+    gql query. Anything that cannot be inspected counts as a query.
+    """
+    document = getattr(query, "document", query)
+    for definition in getattr(document, "definitions", None) or []:
+        operation = getattr(definition, "operation", None)
+        if operation is not None:
+            return operation.value
+    return "query"
@@ -2,7 +2,7 @@ import pytest
 import requests_mock
 from gql import Client
 from gql.transport.requests import RequestsHTTPTransport
-from endoc.client import APIClient
+from endoc.client import APIClient, clear_validation_cache
 
 @pytest.fixture
 def mock_api_client():
@@ -342,5 +342,14 @@ def mock_api_client():
             json=introspection_response
         )
         
+        # Match the lazy API key check (authenticateKey)
+        m.register_uri(
+            "POST",
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "authenticateKey" in req.text,
+            json={"data": {"authenticateKey": {"status": "success", "message": "This user is authorized"}}}
+        )
+
+        clear_validation_cache()
         api_client = APIClient(api_key="fake-api-key")
         yield api_client, m
\ No newline at end of file
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from endoc import AsyncEndocClient, ImportResult
+from endoc.models.single_paper import SinglePaperData
+from endoc.models.summarization import SummarizationResponseData
+from endoc.utils import operation_name
+
+
+class FakeAsyncAPIClient:
+    """Stands in for AsyncAPIClient; answers from canned GraphQL payloads."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def execute_query(self, query, variable_values=None):
+        name = operation_name(query)
+        self.calls.append((name, variable_values))
+        await asyncio.sleep(0)
+        return {name: self.responses[name]}
+
+    async def close(self):
+        pass
+
+
+def _client_with(responses):
+    client = AsyncEndocClient(api_key="fake-api-key")
+    fake = FakeAsyncAPIClient(responses)
+    for service in (
+        client._summarization_service,
+        client._single_paper_service,
+        client._pdf_import_service,
+    ):
+        service.client = fake
+    return client, fake
+
+
+def test_async_summarize(mock_summarization_response):
+    client, _ = _client_with({"summarizePaper": mock_summarization_response["data"]["summarizePaper"]})
+
+    result = asyncio.run(client.summarize("221802394"))
+
+    assert isinstance(result, SummarizationResponseData)
+    assert result.response[0].sentence_text == "This is a summarized sentence."
+
+
+def test_async_single_paper_concurrent(mock_single_paper_response):
+    client, fake = _client_with({"singlePaper": mock_single_paper_response["data"]["singlePaper"]})
+
+    async def run():
+        return await asyncio.gather(*(client.single_paper(str(i)) for i in range(20)))
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, SinglePaperData) for r in results)
+    assert [c[1]["paper_id"]["id_value"] for c in fake.calls] == [str(i) for i in range(20)]
+
+
+def test_async_import_pdf(mock_single_paper_response):
+    client, _ = _client_with({
+        "importPDFWithAPIKey": {
+            "status": "success",
+            "message": "PDFs imported",
+            "response": [{
+                "_id": "bookmark_1",
+                "id_value": "1001",
+                "id_field": "id_int",
+                "id_type": "int",
+                "id_collection": "UserUploaded",
+            }],
+        },
+        "singlePaper": mock_single_paper_response["data"]["singlePaper"],
+    })
+
+    result = asyncio.run(client.import_pdf(base64_list=["JVBERi0xLjcK"]))
+
+    assert isinstance(result, ImportResult)
+    assert result.papers[0].id_value == "1001"
+    assert result.papers[0].title == "Sample Paper"
+
+
+def test_async_import_pdf_requires_input():
+    client, _ = _client_with({})
+    with pytest.raises(ValueError, match="Provide one of"):
+        asyncio.run(client.import_pdf())
+
+
+def test_async_iter_import_pdf(mock_single_paper_response):
+    client, _ = _client_with({
+        "importPDFWithAPIKey": {
+            "status": "success",
+            "message": "PDFs imported",
+            "response": [{
+                "_id": "bookmark_1",
+                "id_value": "1001",
+                "id_field": "id_int",
+                "id_type": "int",
+                "id_collection": "UserUploaded",
+            }],
+        },
+        "singlePaper": mock_single_paper_response["data"]["singlePaper"],
+    })
+
+    async def run():
+        return [p async for p in client.iter_import_pdf(base64_list=["a", "b"], batch_size=1)]
+
+    papers = asyncio.run(run())
+
+    assert [p.id_value for p in papers] == ["1001", "1001"]
+    assert all(p.title == "Sample Paper" for p in papers)
+
+
+def test_async_search_iter(mock_paginated_search_response):
+    search = {
+        "status": "SUCCESS",
+        "message": "Search completed",
+        "response": {
+            "search_stats": {"DurationTotalSearch": 0.1, "nMatchingDocuments": "5"},
+            "paper_list": [
+                {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(i)}
+                for i in range(5)
+            ],
+            "reranking_scores": [0.9] * 5,
+            "prefetching_scores": [0.5] * 5,
+        },
+    }
+    client, fake = _client_with({
+        "documentSearch": search,
+        "paginatedSearch": mock_paginated_search_response["data"]["paginatedSearch"],
+    })
+    client._document_search_service.client = fake
+    client._paginated_search_service.client = fake
+
+    async def run():
+        return [paper async for paper in client.search_iter("BERT", page_size=2)]
+
+    papers = asyncio.run(run())
+
+    assert len(papers) == 3  # the stub answers every page with one paper
+    pages = [c[1]["paper_list"] for c in fake.calls if c[0] == "paginatedSearch"]
+    assert [[p["id_value"] for p in page] for page in pages] == [["0", "1"], ["2", "3"], ["4"]]
@@ -3,6 +3,7 @@ from gql.transport.exceptions import TransportServerError, TransportQueryError
 
 from endoc.client import APIClient
 from endoc.exceptions import AuthenticationError
+from endoc.queries import DOCUMENT_SEARCH_QUERY
 
 class DummyTransportServer401(TransportServerError):
     def __init__(self):
@@ -36,3 +37,108 @@ def test_graphql_unauthenticated_maps_to_authentication_error(monkeypatch):
     monkeypatch.setattr(client, "execute_query", boom)
     with pytest.raises(AuthenticationError):
         client.execute_query("query { me { id } }")
+
+
+def _validation_calls(mocker):
+    return [r for r in mocker.request_history if "authenticateKey" in r.text]
+
+def test_lazy_validation_runs_once_per_key(mock_document_search_response):
+    import requests_mock
+    from endoc.client import clear_validation_cache
+
+    clear_validation_cache()
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "authenticateKey" in req.text,
+            json={"data": {"authenticateKey": {"status": "success", "message": "ok"}}},
+        )
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "documentSearch" in req.text,
+            json=mock_document_search_response,
+        )
+
+        clients = [APIClient("lazy-key") for _ in range(3)]
+        assert m.call_count == 0
+
+        for c in clients:
+            c.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+        assert len(_validation_calls(m)) == 1
+
+def test_eager_validation_failure_is_cached():
+    import requests_mock
+    from endoc.client import clear_validation_cache
+
+    clear_validation_cache()
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            json={"data": {"authenticateKey": {"status": "error", "message": "Invalid API key"}}},
+        )
+        for _ in range(2):
+            with pytest.raises(AuthenticationError):
+                APIClient("revoked-key", validate_key=True)
+
+        assert len(_validation_calls(m)) == 1
+
+
+def test_validation_is_single_flight_across_sync_and_async_callers():
+    import asyncio
+    import threading
+    import time
+
+    from endoc.client import _VALIDATION_CACHE, clear_validation_cache
+
+    clear_validation_cache()
+    calls = []
+
+    def slow_check():
+        calls.append("sync")
+        time.sleep(0.05)
+
+    async def async_check():
+        calls.append("async")
+
+    thread = threading.Thread(
+        target=_VALIDATION_CACHE.validate, args=("shared-key", "https://endoc.test", 60, slow_check)
+    )
+    thread.start()
+    time.sleep(0.01)
+
+    async def several():
+        await asyncio.gather(*(
+            _VALIDATION_CACHE.validate_async("shared-key", "https://endoc.test", 60, async_check)
+            for _ in range(3)
+        ))
+
+    asyncio.run(several())
+    thread.join()
+    assert calls == ["sync"]
+
+
+def test_validation_goes_through_the_rate_limiter():
+    import requests_mock
+    from endoc.client import clear_validation_cache
+    from endoc.rate_limit import RateLimiter
+
+    class RecordingLimiter(RateLimiter):
+        def __init__(self):
+            super().__init__(rate=100)
+            self.names = []
+
+        def acquire(self, operation=""):
+            self.names.append(operation)
+            return super().acquire(operation)
+
+    clear_validation_cache()
+    limiter = RecordingLimiter()
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            json={"data": {"authenticateKey": {"status": "success", "message": "ok"}}},
+        )
+        APIClient("paced-key", validate_key=True, rate_limiter=limiter)
+
+    assert limiter.names == ["Validate"]
@@ -0,0 +1,69 @@
+import json
+import threading
+
+from endoc import EndocClient
+from endoc.batching import AutoBatcher, BatchedOperation
+from endoc.queries import SINGLE_PAPER_QUERY
+
+
+def _paper_id(value):
+    return {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": value}
+
+
+def test_batched_operation_aliases_each_item():
+    operation = BatchedOperation(SINGLE_PAPER_QUERY)
+    source = operation._source(2)
+
+    assert source.startswith(
+        "query singlePaperBatch2($paper_id_0: MetadataInput!, $paper_id_1: MetadataInput!)"
+    )
+    assert "p0: singlePaper(paper_id: $paper_id_0)" in source
+    assert "p1: singlePaper(paper_id: $paper_id_1)" in source
+    assert operation.document(2) is operation.document(2)
+    assert operation.variables([{"paper_id": 1}, {"paper_id": 2}]) == {"paper_id_0": 1, "paper_id_1": 2}
+
+
+def test_single_papers_reports_errors_per_item(mock_api_client, mock_single_paper_response):
+    _, mocker = mock_api_client
+    paper = mock_single_paper_response["data"]["singlePaper"]
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaperBatch" in req.text,
+        json={
+            "data": {"p0": paper, "p1": None, "p2": paper},
+            "errors": [{"message": "Paper not found", "path": ["p1"]}],
+        },
+    )
+    client = EndocClient(api_key="fake-api-key")
+
+    results = client.single_papers(["1", "2", "3"])
+
+    assert [r.status for r in results] == ["SUCCESS", "error", "SUCCESS"]
+    assert results[0].response.Title == "Sample Paper"
+    assert results[1].message == "APIError: Paper not found"
+    batched = [r for r in mocker.request_history if "singlePaperBatch" in r.text]
+    assert len(batched) == 1
+    assert json.loads(batched[0].text)["variables"]["paper_id_2"]["id_value"] == "3"
+
+
+def test_auto_batcher_groups_concurrent_loads():
+    batches = []
+
+    def dispatch(items):
+        batches.append(items)
+        return [{"echo": item["paper_id"]["id_value"]} for item in items]
+
+    batcher = AutoBatcher(dispatch, window=0.05)
+    results = {}
+
+    def load(value):
+        results[value] = batcher.load({"paper_id": _paper_id(value)})
+
+    threads = [threading.Thread(target=load, args=(str(i),)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(batches) == 1
+    assert results == {str(i): {"echo": str(i)} for i in range(5)}
@@ -0,0 +1,170 @@
+from endoc.cache import ImportCache, ImportCheckpoint
+from endoc.models.pdf_import import ImportedBookmark
+
+
+def _bookmark(value):
+    return ImportedBookmark(
+        _id=f"bk_{value}",
+        id_value=value,
+        id_field="id_int",
+        id_type="int",
+        id_collection="UserUploaded",
+    )
+
+
+def test_import_cache_persists_between_instances(tmp_path):
+    db = tmp_path / "imports.sqlite"
+    cache = ImportCache(db)
+    cache.put("abc", _bookmark("1"), namespace="user")
+    cache.close()
+
+    reopened = ImportCache(db)
+    assert reopened.get("abc", namespace="user").mongo_id == "bk_1"
+    assert reopened.get("abc", namespace="other") is None
+    assert reopened.stats().model_dump() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 1, "bytes": 0}
+
+
+def test_import_cache_evicts_least_recently_used():
+    cache = ImportCache(max_entries=2)
+    cache.put("a", _bookmark("a"))
+    cache.put("b", _bookmark("b"))
+    cache.get("a")  # "b" is now the oldest
+    cache.put("c", _bookmark("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats().evictions == 1
+    assert len(cache) == 2
+
+
+def test_import_checkpoint_progress_is_scoped_by_namespace(tmp_path):
+    checkpoint = ImportCheckpoint(tmp_path / "job.ckpt")
+    checkpoint.put("a", _bookmark("a"), namespace="user")
+    checkpoint.put("b", _bookmark("b"), namespace="user")
+    checkpoint.mark("a", "fetched", namespace="user")
+    checkpoint.put("c", _bookmark("c"), namespace="other")
+
+    assert checkpoint.progress("user").model_dump() == {"uploaded": 2, "fetched": 1, "failed": 0}
+    assert checkpoint.progress("other").pending == 1
+    assert checkpoint.progress("unknown").uploaded == 0
+    assert checkpoint.progress().uploaded == 3
+
+
+def test_response_cache_backends_must_implement_storage():
+    import pytest
+
+    from endoc.cache import ResponseCache
+
+    class NoDelete(ResponseCache):
+        def stats(self):
+            return None
+
+        def _get(self, key):
+            return None
+
+        def _set(self, key, data, expires):
+            pass
+
+    with pytest.raises(TypeError):
+        ResponseCache()
+    with pytest.raises(TypeError):
+        NoDelete()
+
+
+def test_memory_response_cache_limits_bytes_and_expires(monkeypatch):
+    from endoc.cache import MemoryResponseCache
+
+    cache = MemoryResponseCache(max_bytes=60, ttl=10)
+    cache.set("singlePaper", {"id": 1}, {"singlePaper": {"title": "a" * 20}})
+    cache.set("singlePaper", {"id": 2}, {"singlePaper": {"title": "b" * 20}})
+
+    assert cache.get("singlePaper", {"id": 1}) is None  # evicted by size
+    assert cache.get("singlePaper", {"id": 2}) == {"singlePaper": {"title": "b" * 20}}
+    assert cache.stats().evictions == 1
+
+    monkeypatch.setattr("endoc.cache.time.time", lambda: 10**12)
+    assert cache.get("singlePaper", {"id": 2}) is None
+
+
+def test_sqlite_response_cache_persists_and_invalidates(tmp_path):
+    from endoc.cache import SQLiteResponseCache
+
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite")
+    cache.set("singlePaper", {"id": 1}, {"singlePaper": {"title": "x" * 1000}}, namespace="k")
+    cache.set("titleSearch", {"titles": ["t"]}, {"titleSearch": {}}, namespace="k")
+    assert cache.stats().bytes < 1000  # compressed
+    cache.close()
+
+    reopened = SQLiteResponseCache(tmp_path / "responses.sqlite")
+    assert reopened.get("singlePaper", {"id": 1}, namespace="k")["singlePaper"]["title"] == "x" * 1000
+    reopened.invalidate("singlePaper")
+    assert reopened.get("singlePaper", {"id": 1}, namespace="k") is None
+    assert reopened.stats().entries == 1
+
+
+def test_client_serves_repeated_single_paper_from_cache(mock_api_client, mock_single_paper_response):
+    from endoc import EndocClient
+    from endoc.cache import MemoryResponseCache
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text,
+        json=mock_single_paper_response,
+    )
+    cache = MemoryResponseCache()
+    client = EndocClient(api_key="fake-api-key", response_cache=cache)
+
+    first = client.single_paper("1001")
+    second = client.single_paper("1001")
+    client.single_paper("1002")
+
+    assert first == second
+    assert len([r for r in mocker.request_history if "singlePaper" in r.text]) == 2
+    assert (cache.stats().hits, cache.stats().misses) == (1, 2)
+
+
+def test_search_cache_normalizes_queries_and_caches_papers(
+    mock_api_client, mock_document_search_response, mock_paginated_search_response
+):
+    import json
+
+    from endoc import EndocClient, SearchCache
+
+    body = mock_paginated_search_response["data"]["paginatedSearch"]["response"][0]
+
+    def respond(request, context):
+        ids = [p["id_value"] for p in json.loads(request.text)["variables"]["paper_list"]]
+        papers = [dict(body, id_int=int(i)) for i in reversed(ids)]  # order not guaranteed
+        return {"data": {"paginatedSearch": {"status": "SUCCESS", "message": "ok", "response": papers}}}
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        json=mock_document_search_response,
+    )
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "paginatedSearch" in req.text,
+        json=respond,
+    )
+    client = EndocClient(api_key="fake-api-key", search_cache=SearchCache())
+
+    first = client.document_search("BERT ", ["nlp", "Transformers"])
+    second = client.document_search("bert", ["transformers", "nlp", "NLP"])
+    assert first == second
+    assert len([r for r in mocker.request_history if "documentSearch" in r.text]) == 1
+
+    papers = [{"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(i)} for i in range(4)]
+    client.paginated_search(papers[:2], ["NLP"])
+    result = client.paginated_search(papers, ["nlp"])
+
+    pages = [json.loads(r.text)["variables"]["paper_list"] for r in mocker.request_history if "paginatedSearch" in r.text]
+    assert [[p["id_value"] for p in page] for page in pages] == [["0", "1"], ["2", "3"]]
+    assert [p.id_int for p in result.response] == [0, 1, 2, 3]
+
+    cached = client.paginated_search(papers[1:3], ["nlp"])
+    assert cached.message == "Served from the search cache."
+    assert [p.id_int for p in cached.response] == [1, 2]
+    assert len(pages) == 2
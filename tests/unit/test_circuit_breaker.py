@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from endoc.circuit_breaker import CircuitBreaker
+from endoc.client import APIClient
+from endoc.exceptions import APIError, CircuitOpenError
+from endoc.queries import DOCUMENT_SEARCH_QUERY
+
+URL = "https://endoc.ethz.ch/graphql"
+
+
+def _search_calls(mocker):
+    return [r for r in mocker.request_history if "documentSearch" in r.text]
+
+
+def test_circuit_opens_on_failures_and_fails_fast(mock_api_client, mock_document_search_response):
+    _, mocker = mock_api_client
+    mocker.post(URL, additional_matcher=lambda req: "documentSearch" in req.text, status_code=503)
+    breaker = CircuitBreaker(window_size=4, min_calls=4, open_duration=0.05)
+    client = APIClient("fake-api-key", retry=False, circuit_breaker=breaker, validate_key=False)
+
+    def search():
+        return client.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+    for _ in range(4):
+        with pytest.raises(APIError):
+            search()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        search()
+    assert len(_search_calls(mocker)) == 4
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    mocker.post(URL, additional_matcher=lambda req: "documentSearch" in req.text,
+                json=mock_document_search_response)
+    search()
+    assert breaker.stats().state == "closed"
+
+
+def test_slow_calls_open_the_circuit_and_failed_trial_reopens_it():
+    breaker = CircuitBreaker(slow_call_duration=1.0, window_size=5, min_calls=5, open_duration=0.02)
+    for duration in (2.0, 2.0, 2.0, 2.0, 0.1):
+        breaker.before_call()
+        breaker.record(duration)
+    stats = breaker.stats()
+    assert (stats.state, stats.slow_call_rate, stats.failure_rate) == ("open", 0.8, 0.0)
+
+    time.sleep(0.03)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial call at a time
+    breaker.record(0.1, APIError("down", status_code=502))
+    assert breaker.state == "open"
+    assert not CircuitBreaker.is_failure(APIError("bad input"))
+
+
+def test_cancelled_half_open_trial_is_released():
+    import asyncio
+
+    from endoc.async_client import AsyncAPIClient
+
+    breaker = CircuitBreaker(window_size=1, min_calls=1, open_duration=0.01)
+    breaker.before_call()
+    breaker.record(0.1, APIError("down", status_code=503))
+    time.sleep(0.02)
+    client = AsyncAPIClient("fake-api-key", retry=False, circuit_breaker=breaker, validate_key=False)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client._guarded(DOCUMENT_SEARCH_QUERY, hang), 0.01)
+        assert breaker.state == "half_open"
+        return await client._guarded(DOCUMENT_SEARCH_QUERY, ok)
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == "closed"
+
+    breaker.before_call()
+    breaker.record(0.1, APIError("down", status_code=503))
+    time.sleep(0.02)
+    sync_client = APIClient("fake-api-key", retry=False, circuit_breaker=breaker, validate_key=False)
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        sync_client._guarded(DOCUMENT_SEARCH_QUERY, interrupt)
+    assert sync_client._guarded(DOCUMENT_SEARCH_QUERY, lambda: "ok") == "ok"
+    assert breaker.state == "closed"
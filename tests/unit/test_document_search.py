@@ -32,4 +32,101 @@ def test_document_search_empty(mock_api_client, mock_document_search_empty_respo
     assert isinstance(result, DocumentSearchData)
     assert result.status == "SUCCESS"
     assert result.message == "No matching documents"
-    assert result.response is None
\ No newline at end of file
+    assert result.response is None
+
+
+def test_document_search_compact_columns(mock_api_client, mock_document_search_response):
+    from endoc.models.search_hits import CompactDocumentSearchData, SearchHits
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        json=mock_document_search_response
+    )
+
+    service = DocumentSearchService(api_key="fake-api-key")
+    result = service.search_documents(ranking_variable="BERT", compact=True)
+
+    assert isinstance(result, CompactDocumentSearchData)
+    hits = result.response.hits
+    assert isinstance(hits, SearchHits)
+    assert len(hits) == 1  # extra scores beyond paper_list are dropped
+    assert hits[0].id_value == "221802394"
+    assert hits[0].reranking_score == 0.95
+    assert hits[0].paper.collection == "S2AG"
+    assert hits.paper_list() == [
+        {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": "221802394"}
+    ]
+    assert "hits" in CompactDocumentSearchData.model_json_schema()["$defs"]["CompactDocumentSearchBody"]["properties"]
+
+
+def test_search_hits_top_k_threshold_and_fusion():
+    import math
+    from endoc.models.search_hits import SearchHits
+
+    papers = [{"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(i)} for i in range(5)]
+    hits = SearchHits.from_papers(papers, [0.2, 0.9, None, 0.5, 0.7], [1.0, 0.0, 0.5, 0.5, 0.5])
+
+    assert math.isnan(hits.reranking_scores[2])
+    assert [h.id_value for h in hits.top_k(3)] == ["1", "4", "3"]
+    assert [h.id_value for h in hits.sorted()][-1] == "2"  # NaN last
+    assert [h.id_value for h in hits.above(0.5)] == ["1", "3", "4"]
+    assert hits[0].collection is hits[4].collection  # interned
+
+    fused = hits.fuse({"reranking": 1.0, "prefetching": 1.0})
+    assert [round(s, 4) for s in fused] == [1.0, 1.0, 0.5, round(3 / 7 + 0.5, 4), round(5 / 7 + 0.5, 4)]
+    assert [h.id_value for h in hits.top_k(1, by=fused)] == ["4"]
+
+
+def test_document_search_stages_narrow_to_top_k(mock_api_client):
+    """Each stage re-searches only the previous stage's top_k papers."""
+    import json
+
+    from endoc import EndocClient, SearchStage
+
+    def respond(request, context):
+        variables = json.loads(request.text)["variables"]
+        ids = [p["id_value"] for p in variables.get("paper_list") or []] or [str(i) for i in range(10)]
+        papers = [{"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": i} for i in ids]
+        return {"data": {"documentSearch": {
+            "status": "SUCCESS",
+            "message": "ok",
+            "response": {
+                "search_stats": {"DurationTotalSearch": 0.1, "nMatchingDocuments": str(len(ids))},
+                "paper_list": papers,
+                "reranking_scores": [int(i) / 10 for i in ids],  # higher id ranks higher
+                "prefetching_scores": [0.5] * len(ids),
+            },
+        }}}
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        json=respond,
+    )
+    client = EndocClient(api_key="fake-api-key")
+
+    result = client.document_search(
+        "BERT",
+        ["nlp"],
+        stages=[
+            SearchStage(
+                top_k=4,
+                ranking_collection="S2AG",
+                ranking_id_field="id_int",
+                ranking_id_value="7",
+                ranking_id_type="int",
+            ),
+            {"top_k": 2, "keywords": ["nlp", "transformers"]},
+        ],
+    )
+
+    sent = [json.loads(r.text)["variables"] for r in mocker.request_history if "documentSearch" in r.text]
+    assert "paper_list" not in sent[0] and "ranking_id_value" not in sent[0]
+    assert [p["id_value"] for p in sent[1]["paper_list"]] == ["9", "8", "7", "6"]
+    assert sent[1]["ranking_id_value"] == "7" and sent[1]["ranking_variable"] == "BERT"
+    assert [p["id_value"] for p in sent[2]["paper_list"]] == ["9", "8"]
+    assert sent[2]["keywords"] == ["nlp", "transformers"] and sent[2]["ranking_id_value"] == "7"
+    assert [p.id_value for p in result.response.paper_list] == ["9", "8"]
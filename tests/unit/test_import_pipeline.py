@@ -0,0 +1,296 @@
+import time
+
+import pytest
+
+from endoc.import_pipeline import ImportPipeline
+from endoc.models.pdf_import import ImportPDFData
+from endoc.models.single_paper import SinglePaperData
+
+
+def _upload_returning_ids(events=None, delay=0.0):
+    def upload(batch):
+        if events is not None:
+            events.append(("upload", tuple(batch)))
+        time.sleep(delay)
+        return ImportPDFData(
+            status="success",
+            message=f"imported {len(batch)}",
+            response=[
+                {
+                    "_id": f"bk_{item}",
+                    "id_value": item,
+                    "id_field": "id_int",
+                    "id_type": "int",
+                    "id_collection": "UserUploaded",
+                }
+                for item in batch
+            ],
+        )
+    return upload
+
+
+def _hydrate_ok(bk):
+    return SinglePaperData(status="SUCCESS", message="ok", response=None)
+
+
+def _batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def test_pipeline_yields_papers_in_upload_order():
+    items = [str(i) for i in range(10)]
+
+    def hydrate(bk):
+        # Later papers finish first; order must still follow the upload.
+        time.sleep(0.001 * (10 - int(bk.id_value)))
+        return _hydrate_ok(bk)
+
+    pipeline = ImportPipeline(_upload_returning_ids(), hydrate, max_concurrency=4)
+    papers = list(pipeline.run(_batches(items, 3), batch_size=3))
+
+    assert [p.id_value for p in papers] == items
+    assert len(pipeline.bookmarks) == 10
+    assert pipeline.message == "imported 1"
+
+
+def test_pipeline_encodes_next_batch_during_upload():
+    events = []
+
+    def encode(item):
+        events.append(("encode", item))
+        return item
+
+    def upload(batch):
+        result = _upload_returning_ids(events, delay=0.05)(batch)
+        events.append(("uploaded", tuple(batch)))
+        return result
+
+    pipeline = ImportPipeline(upload, _hydrate_ok, encode=encode)
+    list(pipeline.run(_batches(["a", "b", "c", "d"], 2), batch_size=2))
+
+    assert events.index(("encode", "c")) < events.index(("uploaded", ("a", "b")))
+
+
+def test_pipeline_records_hydration_failures():
+    def hydrate(bk):
+        if bk.id_value == "2":
+            raise RuntimeError("boom")
+        return _hydrate_ok(bk)
+
+    pipeline = ImportPipeline(_upload_returning_ids(), hydrate)
+    papers = list(pipeline.run(_batches(["1", "2", "3"], 10), batch_size=10))
+
+    assert [p.id_value for p in papers] == ["1", "2", "3"]
+    assert [f.id_value for f in pipeline.failures] == ["2"]
+
+
+def test_pipeline_reraises_upload_errors():
+    def upload(batch):
+        if "3" in batch:
+            raise ValueError("upload failed")
+        return _upload_returning_ids()(batch)
+
+    pipeline = ImportPipeline(upload, _hydrate_ok)
+    seen = []
+    with pytest.raises(ValueError, match="upload failed"):
+        for paper in pipeline.run(_batches(["1", "2", "3", "4"], 2), batch_size=2):
+            seen.append(paper.id_value)
+
+    assert seen == ["1", "2"]
+
+
+def test_pipeline_stops_when_consumer_breaks_early():
+    uploads = []
+
+    def upload(batch):
+        uploads.append(batch)
+        return _upload_returning_ids()(batch)
+
+    items = [str(i) for i in range(100)]
+    pipeline = ImportPipeline(upload, _hydrate_ok, prefetch_batches=1)
+    gen = pipeline.run(_batches(items, 1), batch_size=1)
+    next(gen)
+    gen.close()
+
+    assert len(uploads) < len(items)
+
+
+def test_pipeline_unordered_yields_ready_papers_first():
+    def hydrate(bk):
+        if bk.id_value == "slow":
+            time.sleep(0.2)
+        return _hydrate_ok(bk)
+
+    pipeline = ImportPipeline(_upload_returning_ids(), hydrate, collect_bookmarks=False)
+    papers = list(pipeline.run(_batches(["slow", "a", "b"], 3), batch_size=3, ordered=False))
+
+    assert papers[-1].id_value == "slow"
+    assert pipeline.bookmarks == []
+
+
+def test_async_pipeline_streams_papers_and_errors():
+    import asyncio
+
+    from endoc.import_pipeline import AsyncImportPipeline
+
+    sync_upload = _upload_returning_ids()
+
+    async def upload(batch):
+        return sync_upload(batch)
+
+    async def hydrate(bk):
+        if bk.id_value == "2":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0)
+        return _hydrate_ok(bk)
+
+    async def run():
+        pipeline = AsyncImportPipeline(upload, hydrate, max_concurrency=2)
+        papers = [p async for p in pipeline.run(_batches(["1", "2", "3", "4"], 2), batch_size=2)]
+        return pipeline, papers
+
+    pipeline, papers = asyncio.run(run())
+
+    assert [p.id_value for p in papers] == ["1", "2", "3", "4"]
+    assert papers[1].error == "RuntimeError: boom"
+    assert [f.id_value for f in pipeline.failures] == ["2"]
+
+
+def test_async_pipeline_closes_stores_after_pending_encode():
+    import asyncio
+
+    from endoc.import_pipeline import AsyncImportPipeline
+
+    events = []
+
+    class Checkpoint:
+        def get(self, digest, namespace=""):
+            events.append(("get", digest))
+            return None
+
+        def put(self, digest, bookmark, namespace=""):
+            pass
+
+        def mark(self, digest, state, error=None, namespace=""):
+            pass
+
+        def close(self):
+            events.append("close")
+
+    def digest(source):
+        if source == "c":
+            time.sleep(0.05)  # still encoding when the consumer gives up
+        return source
+
+    sync_upload = _upload_returning_ids()
+
+    async def upload(batch):
+        return sync_upload(batch)
+
+    async def hydrate(bk):
+        return _hydrate_ok(bk)
+
+    async def run():
+        pipeline = AsyncImportPipeline(
+            upload, hydrate, checkpoint=Checkpoint(), owns_checkpoint=True, digest=digest
+        )
+        papers = pipeline.run(_batches(["a", "b", "c", "d"], 2), batch_size=2)
+        first = await papers.__anext__()
+        await papers.aclose()
+        return first
+
+    assert asyncio.run(run()).id_value == "a"
+    assert events[-1] == "close"
+    assert ("get", "c") in events
+
+
+@pytest.mark.parametrize("in_processes", [False, True])
+def test_pipeline_parallel_encoding_keeps_order(tmp_path, in_processes):
+    import base64
+
+    from endoc.import_pipeline import encode_source
+
+    paths = []
+    for i in range(6):
+        p = tmp_path / f"{i}.pdf"
+        p.write_bytes(b"%PDF-" + bytes([i]) * (i * 100))
+        paths.append(p)
+
+    uploaded = []
+
+    def upload(batch):
+        uploaded.extend(batch)
+        return ImportPDFData(status="success", message="ok", response=[])
+
+    pipeline = ImportPipeline(
+        upload,
+        _hydrate_ok,
+        encode=encode_source,
+        encode_workers=3,
+        encode_in_processes=in_processes,
+    )
+    list(pipeline.run(_batches(paths, 4), batch_size=4))
+
+    assert uploaded == [base64.b64encode(p.read_bytes()).decode("ascii") for p in paths]
+
+
+def test_pipeline_cache_skips_known_and_repeated_pdfs():
+    from endoc.cache import ImportCache
+
+    uploads = []
+
+    def upload(batch):
+        uploads.append(list(batch))
+        return _upload_returning_ids()(batch)
+
+    def run(cache, items):
+        pipeline = ImportPipeline(
+            upload, _hydrate_ok, encode=str.upper, cache=cache, digest=lambda s: s
+        )
+        return [p.id_value for p in pipeline.run(_batches(items, 2), batch_size=2)]
+
+    cache = ImportCache()
+    assert run(cache, ["a", "b", "a", "c"]) == ["A", "B", "A", "C"]
+    assert uploads == [["A", "B"], ["C"]]
+
+    uploads.clear()
+    hits = cache.stats().hits
+    assert run(cache, ["c", "d"]) == ["C", "D"]
+    assert uploads == [["D"]]
+    assert cache.stats().hits == hits + 1
+
+
+def test_pipeline_checkpoint_resumes_after_failure(tmp_path):
+    from endoc.cache import ImportCheckpoint
+
+    uploads = []
+    fail_on = {"c"}
+
+    def upload(batch):
+        if fail_on & set(batch):
+            raise RuntimeError("rate limited")
+        uploads.append(list(batch))
+        return _upload_returning_ids()(batch)
+
+    def run(items, **kwargs):
+        checkpoint = ImportCheckpoint(tmp_path / "job.ckpt")
+        pipeline = ImportPipeline(
+            upload, _hydrate_ok, checkpoint=checkpoint, owns_checkpoint=True,
+            digest=lambda s: s, **kwargs
+        )
+        return [p.id_value for p in pipeline.run(_batches(items, 2), batch_size=2)]
+
+    items = ["a", "b", "c", "d"]
+    with pytest.raises(RuntimeError):
+        run(items)
+    progress = ImportCheckpoint(tmp_path / "job.ckpt").progress()
+    assert (progress.uploaded, progress.fetched) == (2, 2)
+
+    fail_on.clear()
+    uploads.clear()
+    assert run(items) == items
+    assert uploads == [["c", "d"]]
+
+    assert run(items, skip_fetched=True) == []
+    assert ImportCheckpoint(tmp_path / "job.ckpt").progress().pending == 0
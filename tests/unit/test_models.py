@@ -12,4 +12,43 @@ def test_document_search_model_empty(mock_document_search_empty_response):
     result = DocumentSearchData(**data)
     assert result.status == "SUCCESS"
     assert result.message == "No matching documents"
-    assert result.response is None
\ No newline at end of file
+    assert result.response is None
+
+
+def test_single_paper_parsed_content_is_lazy(mock_single_paper_response):
+    from endoc.models.parsed_content import ParsedContent, Section
+    from endoc.models.pdf_import import ImportedBookmark, ImportedPaper
+    from endoc.models.single_paper import SinglePaperData
+
+    data = mock_single_paper_response["data"]["singlePaper"]
+    result = SinglePaperData(**data)
+    parsed = result.response.Content.Abstract_Parsed
+
+    assert isinstance(parsed, ParsedContent)
+    assert parsed.raw is data["response"]["Content"]["Abstract_Parsed"]  # stored, not copied
+    assert parsed[0]["section_title"] == "Abstract"
+    assert isinstance(next(parsed.iter_sections()), Section)
+    assert [s.sentence_text for s in parsed.iter_sentences()] == ["This is a sample sentence."]
+    assert result.model_dump()["response"]["Content"]["Fullbody_Parsed"] == []
+
+    bookmark = ImportedBookmark(_id="bk", id_value="1", id_field="id_int", id_type="int", id_collection="UserUploaded")
+    paper = ImportedPaper.from_bookmark_and_paper(bookmark, result)
+    assert paper.sections is result.response.Content.Fullbody_Parsed
+
+
+def test_parsed_content_decodes_json_on_first_access():
+    from endoc.models.parsed_content import ParsedContent
+
+    content = ParsedContent.from_json(b'[{"section_title": "Intro", "section_text": []}]')
+    assert "bytes of JSON" in repr(content)
+    assert content.section(0).section_title == "Intro"
+    assert content == [{"section_title": "Intro", "section_text": []}]
+
+
+def test_models_with_parsed_content_generate_json_schema():
+    from endoc.models.pdf_import import ImportedPaper
+    from endoc.models.single_paper import SinglePaperData
+
+    sections = ImportedPaper.model_json_schema()["properties"]["sections"]
+    assert sections["type"] == "array" and sections["items"]["type"] == "object"
+    assert "SinglePaperData" in SinglePaperData.model_json_schema()["title"]
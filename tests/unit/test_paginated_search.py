@@ -60,4 +60,38 @@ def test_paginated_search_invalid_response(mock_api_client):
         {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": "221802394"}
     ]
     with pytest.raises(ValueError, match="No 'paginatedSearch' key found in response."):
-        service.paginated_search(paper_list=paper_list)
\ No newline at end of file
+        service.paginated_search(paper_list=paper_list)
+
+
+def test_paginated_search_chunks_merge_in_order(mock_api_client, mock_paginated_search_response):
+    """Chunks are fetched concurrently, merged in order, and fail independently."""
+    import json
+
+    body = mock_paginated_search_response["data"]["paginatedSearch"]["response"][0]
+
+    def respond(request, context):
+        ids = [p["id_value"] for p in json.loads(request.text)["variables"]["paper_list"]]
+        if "4" in ids:
+            context.status_code = 500
+            return {"errors": [{"message": "boom"}]}
+        papers = [dict(body, id_int=int(i)) for i in ids]
+        return {"data": {"paginatedSearch": {"status": "SUCCESS", "message": "ok", "response": papers}}}
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "paginatedSearch" in req.text,
+        json=respond,
+    )
+    from endoc.client import APIClient
+
+    service = PaginatedSearchService(api_key="fake-api-key", client=APIClient("fake-api-key", retry=False))
+    paper_list = [
+        {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(i)} for i in range(7)
+    ]
+    result = service.paginated_search(paper_list, chunk_size=2, max_concurrency=3)
+
+    assert [p.id_int for p in result.response] == [0, 1, 2, 3, 6]
+    assert [(f.start, f.size) for f in result.failures] == [(4, 2)]
+    assert result.failures[0].error.startswith("APIError")
+    assert result.message == "1 of 4 chunks failed; see failures."
@@ -1,4 +1,5 @@
 from endoc.endoc_client import EndocClient
+from endoc.import_pipeline import collect_sources, encode_pdf, iter_batches
 from endoc.models.pdf_import import ImportPDFData
 from endoc.services.pdf_import import PDFImportService
 
@@ -92,3 +93,135 @@ def test_import_pdfs_from_folder_batches(tmp_path, mock_api_client):
 
     assert len(responses) == 2
     assert all(isinstance(item, ImportPDFData) for item in responses)
+
+
+def _bookmark(id_value):
+    return {
+        "_id": f"bookmark_{id_value}",
+        "id_value": id_value,
+        "id_field": "id_int",
+        "id_type": "int",
+        "id_collection": "UserUploaded",
+    }
+
+
+def test_import_pdf_hydrates_concurrently_in_order(mock_api_client, mock_single_paper_response):
+    _, mocker = mock_api_client
+    ids = [str(1000 + i) for i in range(6)]
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "importPDFWithAPIKey" in req.text,
+        json={"data": {"importPDFWithAPIKey": {
+            "status": "success",
+            "message": "PDFs imported",
+            "response": [_bookmark(i) for i in ids],
+        }}},
+    )
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text and '"1003"' not in req.text,
+        json=mock_single_paper_response,
+    )
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text and '"1003"' in req.text,
+        status_code=500,
+    )
+
+    client = EndocClient(api_key="fake-api-key", retry=False)
+    result = client.import_pdf(base64_list=["JVBERi0xLjcK"], max_concurrency=3)
+
+    assert [p.id_value for p in result.papers] == ids
+    assert result.papers[0].title == "Sample Paper"
+    assert result.papers[3].title == ""
+    assert len(result.failures) == 1
+    assert result.failures[0].id_value == "1003"
+    assert result.failures[0].error == "APIError: Server error (HTTP 500)."
+
+
+def test_import_pdf_folder_uploads_each_batch(tmp_path, mock_api_client, mock_single_paper_response):
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "importPDFWithAPIKey" in req.text,
+        json={"data": {"importPDFWithAPIKey": {
+            "status": "success",
+            "message": "PDFs imported",
+            "response": [_bookmark("1001")],
+        }}},
+    )
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text,
+        json=mock_single_paper_response,
+    )
+
+    (tmp_path / "a.pdf").write_bytes(b"%PDF-1.4 fake a")
+    (tmp_path / "b.pdf").write_bytes(b"%PDF-1.4 fake b")
+    (tmp_path / "c.pdf").write_bytes(b"%PDF-1.4 fake c")
+
+    client = EndocClient(api_key="fake-api-key")
+    result = client.import_pdf(folder=str(tmp_path), batch_size=2)
+
+    uploads = [r for r in mocker.request_history if "importPDFWithAPIKey" in r.text]
+    assert len(uploads) == 2
+    assert len(result.bookmarks) == 2
+    assert len(result.papers) == 2
+
+
+def test_iter_batches_respects_byte_budget(tmp_path):
+    sizes = {"a.pdf": 300, "b.pdf": 300, "c.pdf": 900, "d.pdf": 30}
+    for name, size in sizes.items():
+        (tmp_path / name).write_bytes(b"x" * size)
+
+    sources = collect_sources(folder=tmp_path)
+    batches = list(iter_batches(sources, batch_size=10, max_batch_bytes=900))
+
+    # base64 of 300 bytes is 400 chars; the 900-byte file (1200 chars) goes alone
+    assert [[p.name for p in b] for b in batches] == [["a.pdf", "b.pdf"], ["c.pdf"], ["d.pdf"]]
+
+
+def test_collect_sources_lists_folder_lazily(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "b.pdf").write_bytes(b"%PDF b")
+    (tmp_path / "a.pdf").write_bytes(b"%PDF a")
+    (tmp_path / "sub" / "c.pdf").write_bytes(b"%PDF c")
+    (tmp_path / "notes.txt").write_text("skip me")
+
+    sources = collect_sources(folder=tmp_path, recursive=True)
+
+    assert not isinstance(sources, list)
+    assert [p.name for p in sources] == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_collect_sources_keeps_sorted_glob_order(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "z.pdf").write_bytes(b"%PDF az")
+    (tmp_path / "b.pdf").write_bytes(b"%PDF b")
+    (tmp_path / "C.PDF").write_bytes(b"%PDF C")  # *.pdf is matched as before
+
+    sources = collect_sources(folder=tmp_path, recursive=True)
+
+    assert [p.relative_to(tmp_path).as_posix() for p in sources] == ["a/z.pdf", "b.pdf"]
+
+
+def test_encode_pdf_matches_plain_base64(tmp_path):
+    import base64
+
+    full = tmp_path / "full.pdf"
+    full.write_bytes(b"%PDF-1.4 " + bytes(range(256)) * 10)
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+
+    assert encode_pdf(full) == base64.b64encode(full.read_bytes()).decode("ascii")
+    assert encode_pdf(empty) == ""
+
+
+def test_iter_import_pdf_opens_checkpoint_only_when_iterated(mock_api_client, tmp_path):
+    client = EndocClient(api_key="fake-api-key")
+    checkpoint = tmp_path / "job.ckpt"
+
+    papers = client.iter_import_pdf(base64_list=["JVBERi0="], checkpoint=checkpoint)
+    del papers
+
+    assert not checkpoint.exists()
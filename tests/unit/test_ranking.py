@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from endoc import ranking
+from endoc.models import search_hits
+from endoc.models.search_hits import SearchHits
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run each test with NumPy columns and with the array('d') fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(search_hits, "np", None)
+        monkeypatch.setattr(ranking, "np", None)
+    return request.param
+
+
+def _hits(ids, scores):
+    papers = [{"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(i)} for i in ids]
+    return SearchHits.from_papers(papers, scores, [0.5] * len(ids))
+
+
+def test_reciprocal_rank_fusion_dedups_and_merges(backend):
+    first = _hits([1, 2, 3], [0.9, 0.8, 0.1])
+    second = _hits([3, 1, 4, 3], [30.0, 20.0, 10.0, 5.0])  # a duplicate row is ignored
+
+    fused = ranking.reciprocal_rank_fusion([first, second], k=0)
+
+    assert fused.id_value == ["1", "3", "2", "4"]
+    assert [round(float(s), 4) for s in fused.reranking_scores] == [1.5, 1.3333, 0.5, 0.3333]
+    assert ranking.reciprocal_rank_fusion([first, second], k=0, top_k=2).id_value == ["1", "3"]
+
+
+def test_reciprocal_rank_fusion_skips_unscored_hits(backend):
+    first = _hits([1, 2, 3], [None, 0.8, 0.1])
+    second = _hits([3, 5], [1.0, None])
+
+    fused = ranking.reciprocal_rank_fusion([first, second], k=0)
+
+    assert fused.id_value == ["3", "2"]  # 1 and 5 have no score anywhere
+    assert [round(float(s), 4) for s in fused.reranking_scores] == [1.5, 1.0]
+
+
+def test_weighted_fusion_normalizes_each_result(backend, mock_document_search_response):
+    first = _hits([1, 2], [0.2, 0.4])
+    second = _hits([1, 3], [100.0, 50.0])
+
+    fused = ranking.weighted_fusion([first, second], weights=[1.0, 2.0])
+    assert fused.id_value == ["1", "2", "3"]
+    assert [float(s) for s in fused.reranking_scores] == [2.0, 1.0, 0.0]
+
+    raw = mock_document_search_response["data"]["documentSearch"]
+    assert ranking.weighted_fusion([raw], method="none").id_value == ["221802394"]
+
+
+def test_normalize_methods(backend):
+    scores = _hits([1, 2, 3, 4], [1.0, 3.0, None, 2.0]).reranking_scores
+
+    assert [round(s, 3) for s in ranking.normalize(scores)][:2] == [0.0, 1.0]
+    z = ranking.normalize(scores, "zscore")
+    assert math.isclose(z[0] + z[1] + z[3], 0.0, abs_tol=1e-9) and math.isnan(z[2])
+    assert [round(s, 3) for s in ranking.normalize(scores, "rank") if not math.isnan(s)] == [0.333, 1.0, 0.5]
+    with pytest.raises(ValueError, match="Unknown normalization"):
+        ranking.normalize(scores, "softmax")
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from endoc.client import APIClient
+from endoc.exceptions import RateLimitError
+from endoc.queries import DOCUMENT_SEARCH_QUERY
+from endoc.rate_limit import RateLimiter, TokenBucket
+
+
+def test_bucket_paces_requests_after_burst():
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+    # 2 free tokens, then 5 more at 50/s.
+    assert time.monotonic() - start >= 0.09
+
+
+def test_bucket_backs_off_on_rate_limit_and_recovers():
+    bucket = TokenBucket(rate=16)
+    bucket.on_rate_limited()
+    bucket.on_rate_limited()
+    assert bucket.rate == 4
+
+    for _ in range(30):
+        bucket.on_success()
+    assert bucket.rate == 16
+
+    bucket.on_rate_limited(retry_after=0.5)
+    assert bucket.reserve() >= 0.4
+
+
+def test_per_operation_budget_is_stricter_and_async_aware():
+    limiter = RateLimiter(rate=1000, per_operation={"importPDFWithAPIKey": 20})
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async("importPDFWithAPIKey") for _ in range(21)))
+        slow = time.monotonic() - start
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async("singlePaper") for _ in range(21)))
+        return slow, time.monotonic() - start
+
+    slow, fast = asyncio.run(run())
+    assert slow >= 0.04
+    assert fast < slow
+
+
+def test_api_client_feeds_429s_back_to_the_limiter(mock_api_client):
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        status_code=429,
+    )
+    limiter = RateLimiter(rate=100)
+
+    client = APIClient("fake-api-key", retry=False, rate_limiter=limiter)
+    with pytest.raises(RateLimitError):
+        client.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+    assert limiter.bucket.rate == 50
+
+
+def test_batched_requests_use_the_budget_of_their_base_operation():
+    limiter = RateLimiter(rate=1000, per_operation={"singlePaper": 5})
+
+    assert limiter._buckets("singlePaperBatch8") == [limiter.bucket, limiter.operations["singlePaper"]]
+    assert limiter._buckets("singlePaperSearch") == [limiter.bucket, limiter.operations["singlePaper"]]
+    assert limiter._buckets("documentSearch") == [limiter.bucket]
+
+
+def test_projected_and_batched_single_paper_use_the_single_paper_budget():
+    from endoc.batching import BatchedOperation
+    from endoc.projection import single_paper_query
+    from endoc.utils import operation_name
+
+    limiter = RateLimiter(rate=1000, per_operation={"singlePaper": 5})
+    budget = [limiter.bucket, limiter.operations["singlePaper"]]
+
+    for projection in ("metadata", {"Title", "DOI"}):
+        query = single_paper_query(projection)
+        batched = BatchedOperation(query).document(3)
+        assert limiter._buckets(operation_name(query)) == budget
+        assert limiter._buckets(operation_name(batched)) == budget
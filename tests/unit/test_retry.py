@@ -0,0 +1,103 @@
+import pytest
+
+from endoc.client import APIClient
+from endoc.exceptions import APIError, RateLimitError
+from endoc.queries import DOCUMENT_SEARCH_QUERY, IMPORT_PDF_WITH_API_KEY_MUTATION
+from endoc.retry import RetryPolicy, parse_retry_after
+
+URL = "https://endoc.ethz.ch/graphql"
+FAST = RetryPolicy(base_delay=0.001, max_delay=0.01)
+
+
+def _calls(mocker, name):
+    return [r for r in mocker.request_history if name in r.text]
+
+
+def test_query_is_retried_on_server_errors(mock_api_client, mock_document_search_response):
+    _, mocker = mock_api_client
+    mocker.post(
+        URL,
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        response_list=[{"status_code": 503}, {"status_code": 502}, {"json": mock_document_search_response}],
+    )
+
+    client = APIClient("fake-api-key", retry=FAST)
+    result = client.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+    assert result["documentSearch"]["status"] == "SUCCESS"
+    assert len(_calls(mocker, "documentSearch")) == 3
+
+
+def test_mutation_is_only_retried_when_rejected_before_processing(mock_api_client):
+    _, mocker = mock_api_client
+    mocker.post(
+        URL,
+        additional_matcher=lambda req: "importPDFWithAPIKey" in req.text,
+        response_list=[
+            {"status_code": 429, "headers": {"Retry-After": "0"}},
+            {"status_code": 500},
+        ],
+    )
+
+    client = APIClient("fake-api-key", retry=FAST)
+    with pytest.raises(APIError, match="HTTP 500") as excinfo:
+        client.execute_query(IMPORT_PDF_WITH_API_KEY_MUTATION, {"pdfs": ["JVBERi0="]})
+
+    assert excinfo.value.status_code == 500
+    assert len(_calls(mocker, "importPDFWithAPIKey")) == 2
+
+
+def test_retry_after_header_is_exposed_and_honoured(mock_api_client):
+    _, mocker = mock_api_client
+    mocker.post(
+        URL,
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        status_code=429,
+        headers={"Retry-After": "5"},
+    )
+
+    # Waiting 5s would blow the 1s deadline, so the client gives up at once.
+    client = APIClient("fake-api-key", retry=RetryPolicy(deadline=1.0))
+    with pytest.raises(RateLimitError) as excinfo:
+        client.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+    assert excinfo.value.retry_after == 5.0
+    assert len(_calls(mocker, "documentSearch")) == 1
+
+
+def test_backoff_uses_full_jitter_within_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(50)]
+
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert max(delays) > 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_graphql_retry_after_string_is_honoured(mock_api_client, mock_document_search_response):
+    _, mocker = mock_api_client
+    rate_limited = {"errors": [{"message": "slow down", "extensions": {"code": "RATE_LIMITED", "retryAfter": "0.01"}}]}
+    mocker.post(
+        URL,
+        additional_matcher=lambda req: "documentSearch" in req.text,
+        response_list=[{"json": rate_limited}, {"json": mock_document_search_response}],
+    )
+
+    client = APIClient("fake-api-key", retry=FAST)
+    result = client.execute_query(DOCUMENT_SEARCH_QUERY, {"ranking_variable": "BERT"})
+
+    assert result["documentSearch"]["status"] == "SUCCESS"
+    assert len(_calls(mocker, "documentSearch")) == 2
+    assert parse_retry_after(3) == 3.0
+
+
+def test_dns_failure_counts_as_never_sent():
+    import requests
+    from urllib3.exceptions import MaxRetryError, NameResolutionError
+
+    from endoc.retry import _connect_failed
+
+    reason = NameResolutionError("endoc.ethz.ch", None, OSError("no such host"))
+    error = requests.exceptions.ConnectionError(MaxRetryError(None, URL, reason))
+
+    assert _connect_failed(error)
@@ -0,0 +1,72 @@
+import json
+
+from endoc import EndocClient
+
+URL = "https://endoc.ethz.ch/graphql"
+
+
+def _paper(id_value):
+    return {"collection": "S2AG", "id_field": "id_int", "id_type": "int", "id_value": str(id_value)}
+
+
+def _search_response(n):
+    return {"data": {"documentSearch": {
+        "status": "SUCCESS",
+        "message": "Search completed",
+        "response": {
+            "search_stats": {"DurationTotalSearch": 0.1, "nMatchingDocuments": str(n)},
+            "paper_list": [_paper(i) for i in range(n)],
+            "reranking_scores": [1 - i / n for i in range(n)],
+            "prefetching_scores": [0.5] * n,
+        },
+    }}}
+
+
+def _page_response(template):
+    """paginatedSearch stub returning one paper per requested id."""
+    body = template["data"]["paginatedSearch"]["response"][0]
+
+    def respond(request, context):
+        ids = [p["id_value"] for p in json.loads(request.text)["variables"]["paper_list"]]
+        papers = [dict(body, id_int=int(i), Title=f"Paper {i}") for i in ids]
+        return {"data": {"paginatedSearch": {"status": "SUCCESS", "message": "ok", "response": papers}}}
+
+    return respond
+
+
+def _mock(mocker, mock_paginated_search_response, n):
+    mocker.post(URL, additional_matcher=lambda req: "documentSearch" in req.text, json=_search_response(n))
+    mocker.post(
+        URL,
+        additional_matcher=lambda req: "paginatedSearch" in req.text,
+        json=_page_response(mock_paginated_search_response),
+    )
+
+
+def _page_requests(mocker):
+    return [r for r in mocker.request_history if "paginatedSearch" in r.text]
+
+
+def test_search_iter_pages_through_hits(mock_api_client, mock_paginated_search_response):
+    _, mocker = mock_api_client
+    _mock(mocker, mock_paginated_search_response, 5)
+    client = EndocClient(api_key="fake-api-key")
+
+    titles = [paper.Title for paper in client.search_iter("BERT", ["test"], page_size=2)]
+
+    assert titles == [f"Paper {i}" for i in range(5)]
+    assert len(_page_requests(mocker)) == 3
+
+
+def test_search_iter_stops_when_caller_breaks(mock_api_client, mock_paginated_search_response):
+    _, mocker = mock_api_client
+    _mock(mocker, mock_paginated_search_response, 10)
+    client = EndocClient(api_key="fake-api-key")
+
+    results = client.search_iter("BERT", page_size=2, prefetch=False)
+    first = next(results)
+    results.close()
+
+    assert first.id_int == 0
+    assert len(_page_requests(mocker)) == 1
+
@@ -51,4 +51,50 @@ def test_single_paper_invalid_response(mock_api_client):
     
     service = SinglePaperSearchService(api_key="fake-api-key")
     with pytest.raises(ValueError, match="No 'singlePaper' key found in response."):
-        service.get_single_paper(id_value="221802394")
\ No newline at end of file
+        service.get_single_paper(id_value="221802394")
+
+
+def test_single_paper_metadata_projection(mock_api_client):
+    """A projection requests only the selected fields and returns a partial model."""
+    import json
+    from endoc.models.single_paper import PartialSinglePaperData
+
+    _, mocker = mock_api_client
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text,
+        json={"data": {"singlePaper": {
+            "status": "SUCCESS",
+            "message": "Paper retrieved",
+            "response": {
+                "_id": "paper_123",
+                "Title": "Sample Paper",
+                "Author": [{"FamilyName": "Doe", "GivenName": "John"}],
+                "PublicationDate": {"Year": 2020},
+            },
+        }}},
+    )
+
+    service = SinglePaperSearchService(api_key="fake-api-key")
+    result = service.get_single_paper(id_value="221802394", projection="metadata")
+
+    sent = json.loads(mocker.request_history[-1].text)["query"]
+    assert "query singlePaperMetadata" in sent
+    assert "Fullbody" not in sent and "Reference" not in sent and "Abstract" not in sent
+    assert isinstance(result, PartialSinglePaperData)
+    assert result.response.Title == "Sample Paper"
+    assert result.response.PublicationDate.Year == 2020
+    assert result.response.Content is None
+
+
+def test_single_paper_projection_rejects_unknown_fields():
+    from endoc.projection import single_paper_query
+
+    assert single_paper_query("full") is SINGLE_PAPER_QUERY
+    assert single_paper_query({"Title", "Content.Abstract"}) is single_paper_query(["Content.Abstract", "Title"])
+    with pytest.raises(ValueError, match="Unknown projection"):
+        single_paper_query("tiny")
+    with pytest.raises(ValueError, match="Unknown single_paper field"):
+        single_paper_query({"Content.Nope"})
+    with pytest.raises(ValueError, match="always selected whole"):
+        single_paper_query({"Author.FamilyName"})
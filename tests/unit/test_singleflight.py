@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from endoc import EndocClient
+from endoc.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_identical_queries_share_one_request(mock_api_client, mock_single_paper_response):
+    _, mocker = mock_api_client
+
+    def slow_response(request, context):
+        time.sleep(0.1)
+        return mock_single_paper_response
+
+    mocker.post(
+        "https://endoc.ethz.ch/graphql",
+        additional_matcher=lambda req: "singlePaper" in req.text,
+        json=slow_response,
+    )
+    client = EndocClient(api_key="fake-api-key", validate_key=False)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client.single_paper("1001"), range(8)))
+
+    assert all(r == results[0] for r in results)
+    assert len([r for r in mocker.request_history if "singlePaper" in r.text]) == 1
+
+
+def test_single_flight_shares_errors_and_forgets_finished_keys():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        release.wait()
+        raise ValueError("down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "k", failing) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+    assert flight.do("k", lambda: 42) == 42
+
+
+def test_async_single_flight_coalesces_coroutines():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def run():
+        flight = AsyncSingleFlight()
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(20)))
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [{"ok": True}] * 20
+    assert in_flight == 0
+
+
+def test_async_single_flight_waiters_survive_a_cancelled_leader():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    async def run():
+        flight = AsyncSingleFlight()
+        leader = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(flight.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        return leader.cancelled(), results, flight.in_flight()
+
+    leader_cancelled, results, in_flight = asyncio.run(run())
+    assert leader_cancelled
+    assert results == [2, 2, 2]  # one waiter ran the call again for all three
+    assert len(calls) == 2
+    assert in_flight == 0
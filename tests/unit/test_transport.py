@@ -0,0 +1,94 @@
+import requests_mock
+
+from endoc import EndocClient
+from endoc.client import APIClient
+from endoc.transport import build_session
+
+VALIDATE_RESPONSE = {
+    "data": {"authenticateKey": {"status": "success", "message": "This user is authorized"}}
+}
+
+
+def test_endoc_client_services_share_one_api_client():
+    with requests_mock.Mocker() as m:
+        m.post("https://endoc.ethz.ch/graphql", json=VALIDATE_RESPONSE)
+        client = EndocClient(api_key="fake-api-key")
+
+    services = [
+        client._summarization_service,
+        client._document_search_service,
+        client._paginated_search_service,
+        client._single_paper_service,
+        client._get_note_library_service,
+        client._title_search_service,
+        client._pdf_import_service,
+    ]
+    assert all(s.client is client._api_client for s in services)
+
+
+def test_session_survives_between_queries(mock_document_search_response):
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "authenticateKey" in req.text,
+            json=VALIDATE_RESPONSE,
+        )
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "documentSearch" in req.text,
+            json=mock_document_search_response,
+        )
+
+        client = EndocClient(api_key="fake-api-key")
+        session = client._api_client.session
+        client.document_search("BERT")
+        client.document_search("BERT")
+
+    assert client._api_client.transport.session is session
+
+
+def test_shared_session_is_not_closed_by_client():
+    session = build_session(pool_connections=2, pool_maxsize=4)
+    with requests_mock.Mocker() as m:
+        m.post("https://endoc.ethz.ch/graphql", json=VALIDATE_RESPONSE)
+        a = APIClient("fake-api-key", session=session)
+        b = APIClient("fake-api-key", session=session)
+
+    assert a.session is b.session is session
+    a.close()
+    assert b.transport.pooled_session is session
+    assert session.get_adapter("https://endoc.ethz.ch").poolmanager is not None
+
+
+def test_bodies_go_through_json_codec(monkeypatch, mock_document_search_response):
+    from endoc import json_codec
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://endoc.ethz.ch/graphql",
+            additional_matcher=lambda req: "documentSearch" in req.text,
+            json=mock_document_search_response,
+        )
+        client = EndocClient(api_key="fake-api-key", validate_key=False)
+        client.document_search("BERT")
+
+        # The stdlib fallback produces the same results when orjson is missing.
+        monkeypatch.setattr(json_codec, "orjson", None)
+        result = client.document_search("BERT")
+
+    sent = m.request_history[0]
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json_codec.loads(sent.body)["variables"]["ranking_variable"] == "BERT"
+    assert result.status == "SUCCESS"
+
+
+def test_gql_transport_hooks_still_exist():
+    import inspect
+
+    from gql.transport.requests import RequestsHTTPTransport
+
+    prepare = inspect.signature(RequestsHTTPTransport._prepare_request)
+    assert list(prepare.parameters)[:2] == ["self", "request"]
+    assert list(inspect.signature(RequestsHTTPTransport._get_json_result).parameters) == ["self", "response"]
+    assert callable(RequestsHTTPTransport._raise_response_error)
+    assert {"json_serialize", "json_deserialize"} <= set(inspect.signature(RequestsHTTPTransport).parameters)